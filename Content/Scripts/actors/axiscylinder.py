@@ -1,9 +1,9 @@
 import unreal_engine as ue
 from unreal_engine import FVector, FRotator
-from unreal_engine.classes import Material
 from actors.base_mesh import BaseMesh
 from actors.object import Object
 from actors.parameters import AxisCylinderParams, ObjectParams
+from tools import assets
 from tools.utils import as_dict
 from tools.materials import get_random_material
 import random
@@ -26,7 +26,7 @@ class Axiscylinder(BaseMesh):
 
 	def __init__(self, world, params=AxisCylinderParams()):
 		super().__init__(
-            world.actor_spawn(ue.load_class('/Game/AxisCylinder.AxisCylinder_C')))
+            world.actor_spawn(assets.load_class('/Game/AxisCylinder.AxisCylinder_C')))
 		self.get_parameters(params)
 		self.set_parameters()
 
@@ -41,7 +41,7 @@ class Axiscylinder(BaseMesh):
 			params.warning,
 			self.length[params.mesh]
 		)
-		self.material = ue.load_object(Material, params.material)
+		self.material = assets.load_material(params.material)
 		self.is_long = params.is_long
 		self.down = params.down
 		self.moves = params.moves
@@ -18,8 +18,21 @@ class BaseActor:
         self.actor = actor
 
         # this flag becomes False when something illegal occurs to
-        # that actor (e.g. an overlap)
+        # that actor (e.g. an overlap), the reason being detailed by
+        # invalidate()
         self.is_valid = True
+        self.invalid_reason = None
+
+        # the events bound to the actor, they are bound only once because an
+        # actor reused from the pool keeps its bindings. Only the active ones
+        # are forwarded to their callback, they are deactivated when the
+        # actor is parked.
+        self._bound_events = set()
+        self._active_events = set()
+
+        # the status of the actor, cached by get_frame_status and cleared by
+        # the setters of its constant entries
+        self._status = None
 
     def actor_destroy(self):
         """Destroys the actor"""
@@ -55,9 +68,35 @@ class BaseActor:
 
         # manage OnActorBeginOverlap events
         if self.warning and self.overlap:
-            self.actor.bind_event('OnActorBeginOverlap', self.on_actor_overlap)
+            self.bind_event('OnActorBeginOverlap', self.on_actor_overlap)
         elif self.warning and not self.overlap:
-            self.actor.bind_event('OnActorHit', self.on_actor_hit)
+            self.bind_event('OnActorHit', self.on_actor_hit)
+
+    def bind_event(self, event, callback):
+        """Binds the `callback` method to the `event` if not already bound
+
+        The event is activated, the callback being called until the event is
+        unbound by unbind_events.
+
+        """
+        key = (event, callback.__name__)
+        if key not in self._bound_events:
+            def handler(*args):
+                if key in self._active_events:
+                    callback(*args)
+
+            self.actor.bind_event(event, handler)
+            self._bound_events.add(key)
+        self._active_events.add(key)
+
+    def unbind_events(self):
+        """Deactivates the events bound to the actor
+
+        UE keeps the events bound to the actor, they are ignored until bound
+        again by bind_event.
+
+        """
+        self._active_events.clear()
 
     def set_location(self, location):
         """Sets the location of the actor and raise a warning if failed"""
@@ -91,7 +130,29 @@ class BaseActor:
             message = '{} overlapping {}'.format(
                 self.actor.get_name(), other.get_name())
             ue.log(message)
-            self.is_valid = False
+            self.invalidate('overlap', other)
+
+    def invalidate(self, cause, other=None):
+        """Marks the actor as invalid because of `cause`
+
+        The first reason of the invalidity is kept in self.invalid_reason as
+        a dict (cause, actor, other) reported by the director when restarting
+        the scene.
+
+        Parameters
+        ----------
+        cause: str
+            The cause of the invalidity, e.g. 'overlap'
+        other: AActor, optional
+            The actor involved with the current one
+
+        """
+        self.is_valid = False
+        if self.invalid_reason is None:
+            self.invalid_reason = {
+                'cause': cause,
+                'actor': self.actor.get_name(),
+                'other': other.get_name() if other else None}
 
     def on_actor_hit(self, me, other, *args):
         """When an the actor is hitting another actor a message is printed.
@@ -136,12 +197,60 @@ class BaseActor:
             'rotation': as_dict(self.rotation)}
         return status
 
+    def get_frame_status(self, location, rotation, velocity, mass):
+        """Returns the status of the actor at the current frame
+
+        Only the location and rotation are updated from the given values (as
+        dicts collected for all the actors by Scene.get_status), the other
+        entries of the status are constant and cached on the first call.
+
+        """
+        if self._status is None:
+            self._status = self.get_status()
+
+        status = dict(self._status)
+        status['location'] = location
+        status['rotation'] = rotation
+        return status
+
     def reset(self, params):
         """Resets the actor with the parameters of parameters.py
 
         hidden is set at False.
 
         """
+        self._status = None
         self.set_location(params.location)
         self.set_rotation(params.rotation)
         self.set_hidden(False)
+
+    def park(self):
+        """Hides the actor and disables its collisions
+
+        Called when the actor is released to the pool (see tools.pool). The
+        events are unbound, a reused actor binds the ones required by its new
+        parameters.
+
+        """
+        self.unbind_events()
+        self.set_hidden(True)
+        self.actor.SetActorEnableCollision(False)
+
+    def unpark(self):
+        """Shows the actor and enables its collisions"""
+        self.is_valid = True
+        self.invalid_reason = None
+        self.actor.SetActorEnableCollision(True)
+        self.set_hidden(False)
+
+    def reuse(self, params):
+        """Reconfigures a parked actor with new parameters
+
+        The actor is configured as if freshly spawned with `params`, before
+        its collisions are enabled again.
+
+        """
+        self._status = None
+        self.get_parameters(params)
+        self.set_parameters()
+        self.unpark()
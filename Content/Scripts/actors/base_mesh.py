@@ -1,9 +1,11 @@
 # coding: utf-8
 
 import unreal_engine as ue
-from unreal_engine.classes import Material, StaticMesh, Friction
+from unreal_engine import FVector
+from unreal_engine.classes import Friction
 
 from actors.base_actor import BaseActor
+from tools import assets
 from tools.utils import as_dict
 
 
@@ -16,6 +18,10 @@ class BaseMesh(BaseActor):
     def __init__(self, actor):
         super().__init__(actor)
 
+        # the collision profile of the blueprint, restored when a reused
+        # actor is allowed to overlap
+        self._collision_profile = None
+
     def get_parameters(self, location, rotation,
                        scale, friction, restitution,
                        overlap, warning, mesh_str):
@@ -55,15 +61,21 @@ class BaseMesh(BaseActor):
         self.set_scale(self.scale)
         self.set_friction(self.friction)
         self.set_restitution(self.restitution)
+
+        if self._collision_profile is None:
+            self._collision_profile = self.mesh.GetCollisionProfileName()
         if self.overlap is False:
             self.mesh.call('SetCollisionProfileName BlockAll')
+        else:
+            self.mesh.call('SetCollisionProfileName {}'.format(
+                self._collision_profile))
 
     def set_mesh(self):
         """Sets the mesh and set the material"""
         self.mesh = self.actor.get_actor_component_by_type(
             ue.find_class('StaticMeshComponent'))
         # setup mesh and material
-        self.mesh.SetStaticMesh(ue.load_object(StaticMesh, self.mesh_str))
+        self.mesh.SetStaticMesh(assets.load_mesh(self.mesh_str))
         self.mesh.set_material(0, self.material)
 
     def get_mesh(self):
@@ -81,8 +93,9 @@ class BaseMesh(BaseActor):
         mesh_str: str
             Mesh that replaces the current one.
         """
+        self._status = None
         self.mesh_str = mesh_str
-        self.mesh.SetStaticMesh(ue.load_object(StaticMesh, self.mesh_str))
+        self.mesh.SetStaticMesh(assets.load_mesh(self.mesh_str))
 
     def set_material(self, material_str):
         """
@@ -94,21 +107,25 @@ class BaseMesh(BaseActor):
             Material to set
 
         """
-        self.material = ue.load_object(Material, material_str)
+        self._status = None
+        self.material = assets.load_material(material_str)
         self.mesh.set_material(0, self.material)
 
     def set_scale(self, scale):
         """ Sets the scale"""
+        self._status = None
         self.scale = scale
         self.actor.set_actor_scale(self.scale)
 
     def set_friction(self, friction):
         """ Sets the coefficient of friction"""
+        self._status = None
         self.friction = friction
         Friction.SetFriction(self.material, friction)
 
     def set_restitution(self, restitution):
         """ Sets the coefficient of restitution"""
+        self._status = None
         self.restitution = restitution
         Friction.SetRestitution(self.material, self.restitution)
 
@@ -120,6 +137,19 @@ class BaseMesh(BaseActor):
         status['restitution'] = self.restitution
         return status
 
+    def park(self):
+        """Hides the actor, disables its collisions and physics
+
+        The actor is stopped, so that it does not keep its velocity when
+        reused.
+
+        """
+        super().park()
+        mesh = self.get_mesh()
+        mesh.SetPhysicsLinearVelocity(FVector(0, 0, 0))
+        mesh.SetPhysicsAngularVelocityInDegrees(FVector(0, 0, 0))
+        mesh.set_simulate_physics(False)
+
     def reset(self, params):
         """Resets the actor with the parametres of parameters.py, hidden is
         set at False.
@@ -14,6 +14,7 @@ class Camera:
         self._actor.bind_event('OnActorBeginOverlap', self._on_overlap)
         self._component = self._actor.get_component_by_type(CameraComponent)
         self._is_valid = True
+        self.invalid_reason = None
 
         # Attach the viewport to the camera. This initialization was present
         # in the intphys-1.0 blueprint but seems to be useless in UE-4.17.
@@ -31,6 +32,11 @@ class Camera:
                 self._actor.get_name(), other.get_name())
             ue.log(message)
             self._is_valid = False
+            if self.invalid_reason is None:
+                self.invalid_reason = {
+                    'cause': 'camera_overlap',
+                    'actor': self._actor.get_name(),
+                    'other': other.get_name()}
 
     @property
     def actor(self):
@@ -89,6 +95,7 @@ class Camera:
         self.aspect_ratio = params.aspect_ratio
         self.projection_mode = params.projection_mode
         self._is_valid = True
+        self.invalid_reason = None
 
     def get_status(self):
         return {
@@ -1,9 +1,9 @@
 import unreal_engine as ue
 from unreal_engine import FVector, FRotator
-from unreal_engine.classes import Material
 
 from actors.base_mesh import BaseMesh
 from actors.parameters import FloorParams
+from tools import assets
 
 
 class Floor(BaseMesh):
@@ -22,7 +22,7 @@ class Floor(BaseMesh):
     """
     def __init__(self, world, params=FloorParams()):
         super().__init__(
-            world.actor_spawn(ue.load_class('/Game/Floor.Floor_C')))
+            world.actor_spawn(assets.load_class('/Game/Floor.Floor_C')))
         self.get_parameters(params)
         self.set_parameters()
 
@@ -40,7 +40,7 @@ class Floor(BaseMesh):
             params.friction, params.restitution, False, False,
             '/Game/Meshes/Floor_400x400')
 
-        self.material = ue.load_object(Material, params.material)
+        self.material = assets.load_material(params.material)
 
     def set_parameters(self):
         super().set_parameters()
@@ -6,6 +6,7 @@ from unreal_engine.classes import SkyLightComponent, DirectionalLightComponent
 
 from actors.base_actor import BaseActor
 from actors.parameters import LightParams
+from tools import assets
 
 
 class Light(BaseActor):
@@ -26,7 +27,7 @@ class Light(BaseActor):
             'PointLight': '/Game/PointLight.PointLight_C'
             }
         super().__init__(
-            world.actor_spawn(ue.load_class(types[params.type])))
+            world.actor_spawn(assets.load_class(types[params.type])))
 
         self.type = params.type
 
@@ -65,3 +66,12 @@ class Light(BaseActor):
             status = {}
         status['type'] = self.type
         return status
+
+    def park(self):
+        # a hidden light is still lighting the scene, switch it off
+        super().park()
+        self.actor.get_actor_root_component().SetVisibility(False, True)
+
+    def unpark(self):
+        self.actor.get_actor_root_component().SetVisibility(True, True)
+        super().unpark()
@@ -1,8 +1,9 @@
 import unreal_engine as ue
-from unreal_engine.classes import Material, Friction
+from unreal_engine.classes import Friction
 from unreal_engine import FVector
 from actors.base_mesh import BaseMesh
 from actors.parameters import ObjectParams
+from tools import assets
 from tools.utils import as_dict
 
 # Object is the python component for the main actors of the magic
@@ -38,7 +39,7 @@ class Object(BaseMesh):
     class_name = '/Game/Object.Object_C'
 
     def __init__(self, world, params=ObjectParams()):
-        super().__init__(world.actor_spawn(ue.load_class(self.class_name)))
+        super().__init__(world.actor_spawn(assets.load_class(self.class_name)))
         self.get_parameters(params)
         self.set_parameters()
 
@@ -58,7 +59,7 @@ class Object(BaseMesh):
             params.overlap,
             params.warning,
             self.shape[params.mesh])
-        self.material = ue.load_object(Material, params.material)
+        self.material = assets.load_material(params.material)
         self.mass = params.mass
         self.force = params.force
         self.initial_force = params.initial_force
@@ -122,7 +123,14 @@ class Object(BaseMesh):
         status['shape'] = self.mesh_str.split(".")[-1]
         return status
 
+    def get_frame_status(self, location, rotation, velocity, mass):
+        status = super().get_frame_status(location, rotation, velocity, mass)
+        status['mass'] = mass
+        status['velocity'] = velocity
+        return status
+
     def reset(self, params):
+        self._status = None
         location = FVector(
                 params.location.x,
                 params.location.y,
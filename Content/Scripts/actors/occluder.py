@@ -1,7 +1,7 @@
 import unreal_engine as ue
-from unreal_engine.classes import Material
 from actors.base_mesh import BaseMesh
 from actors.parameters import OccluderParams
+from tools import assets
 
 """A vertical plane that falls and gets up by itself.
 
@@ -18,9 +18,10 @@ down: it will rise again at the 50th frame
 
 class Occluder(BaseMesh):
     class_name = '/Game/Occluder.Occluder_C'
+    mesh_name = '/Game/Meshes/OccluderWall'
 
     def __init__(self, world, params=OccluderParams()):
-        super().__init__(world.actor_spawn(ue.load_class(self.class_name)))
+        super().__init__(world.actor_spawn(assets.load_class(self.class_name)))
         self.get_parameters(params)
         self.set_parameters()
 
@@ -33,9 +34,9 @@ class Occluder(BaseMesh):
             params.restitution,
             params.overlap,
             params.warning,
-            '/Game/Meshes/OccluderWall')
+            self.mesh_name)
 
-        self.material = ue.load_object(Material, params.material)
+        self.material = assets.load_material(params.material)
         self.speed = params.speed
 
         # array of numbers from 1 to 200
@@ -70,8 +71,7 @@ class Occluder(BaseMesh):
                     self.up = True
         elif self.moving is True:
             if self.warning and self.overlap:
-                self.actor.bind_event(
-                    'OnActorHit', self.moving_down_on_actor_hit)
+                self.bind_event('OnActorHit', self.moving_down_on_actor_hit)
             if self.up is True:
                 rotation.roll += self.speed
             else:
@@ -107,7 +107,7 @@ class Occluder(BaseMesh):
     def on_actor_hit(self, me, other, *args):
         super().on_actor_hit(me, other)
         if 'occluder' in other.get_name().lower():
-            self.is_valid = False
+            self.invalidate('occluder_hit', other)
 
     def moving_down_on_actor_hit(self, me, other, *args):
         super().on_actor_hit(me, other)
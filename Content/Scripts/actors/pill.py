@@ -2,8 +2,8 @@ from actors.object import Object
 from actors.base_mesh import BaseMesh
 from actors.parameters import ObjectParams
 from unreal_engine import FVector, FRotator, FLinearColor
-from unreal_engine.classes import Material
 import unreal_engine as ue
+from tools import assets
 
 
 """
@@ -25,7 +25,7 @@ class Pill(Object):
 
     def __init__(self, world, params=ObjectParams):
         BaseMesh.__init__(self,
-            world.actor_spawn(ue.load_class('/Game/Pill.Pill_C')))
+            world.actor_spawn(assets.load_class('/Game/Pill.Pill_C')))
         self.get_parameters(params)
         self.set_parameters()
 
@@ -40,7 +40,7 @@ class Pill(Object):
 			params.warning,
 			self.shape[params.mesh]
 		)
-        self.material = ue.load_object(Material, params.material)
+        self.material = assets.load_material(params.material)
         self.mass = params.mass
         self.force = params.force
         self.initial_force = params.initial_force
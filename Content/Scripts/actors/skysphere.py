@@ -1,9 +1,9 @@
 import unreal_engine as ue
 from unreal_engine import FVector, FRotator, UObject
-from unreal_engine.classes import Material
 
 from actors.base_mesh import BaseMesh
 from actors.parameters import SkysphereParams
+from tools import assets
 
 """
 It is the sky.
@@ -15,10 +15,10 @@ class Skysphere(BaseMesh):
     def __init__(self, world, params=SkysphereParams()):
         if isinstance(params, Skysphere):
             super().__init__(world.actor_spawn(
-                ue.load_class("/Game/Meshes/SkySphere/BP_Sky_Sphere1." +
+                assets.load_class("/Game/Meshes/SkySphere/BP_Sky_Sphere1." +
                               "BP_Sky_Sphere1_C")))
             self.mesh_str = '/Game/Meshes/SkySphere/SM_SkySphere'
-            self.material = ue.load_object(Material, params.material)
+            self.material = assets.load_material(params.material)
             self.set_mesh()
             self.rotation = params.rotation
         elif isinstance(params, UObject):
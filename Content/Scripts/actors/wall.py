@@ -2,8 +2,8 @@
 
 import unreal_engine as ue
 from unreal_engine import FVector, FRotator
-from unreal_engine.classes import Material
 from actors.base_mesh import BaseMesh
+from tools import assets
 
 """
 Wall is the vertical plane thing
@@ -47,7 +47,8 @@ class Wall(BaseMesh):
             'Left': self.left,
             'Right': self.right
         }
-        super().__init__(world.actor_spawn(ue.load_class('/Game/Wall.Wall_C')))
+        super().__init__(
+            world.actor_spawn(assets.load_class('/Game/Wall.Wall_C')))
         self.get_parameters(side, length, depth,
                             height, material, overlap, warning, z)
         self.set_parameters()
@@ -65,11 +66,18 @@ class Wall(BaseMesh):
             self.location, self.rotation, self.scale,
             0.5, 0.5, overlap, warning,
             '/Game/Meshes/Wall_400x400')
-        self.material = ue.load_object(Material, material)
+        self.material = assets.load_material(material)
 
     def set_parameters(self):
         super().set_parameters()
 
+    def reuse(self, length, depth, height, material, overlap, warning, z):
+        """Reconfigures a parked wall with new parameters, on the same side"""
+        self.get_parameters(self.side, length, depth,
+                            height, material, overlap, warning, z)
+        self.set_parameters()
+        self.unpark()
+
     def front(self):
         self.scale = FVector(self.length / 400, 1, self.height)
         self.rotation = FRotator(0, 0, 90)
@@ -32,6 +32,19 @@ class Walls():
         self.right.actor_destroy()
         self.left.actor_destroy()
 
+    def park(self):
+        self.front.park()
+        self.right.park()
+        self.left.park()
+
+    def reuse(self, params):
+        self.get_parameters(params)
+        for wall in (self.front, self.right, self.left):
+            wall.reuse(
+                self.length, self.depth, self.height,
+                self.material, self.overlap, self.warning, self.z)
+        self.is_valid = True
+
     def get_parameters(self, params):
         self.depth = params.depth
         self.length = params.length
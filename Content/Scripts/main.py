@@ -5,6 +5,7 @@ import unreal_engine as ue
 from unreal_engine.classes import KismetSystemLibrary
 from unreal_engine.enums import ETickingGroup
 
+from tools import assets
 from tools.director import Director
 from tools.utils import exit_ue
 
@@ -86,6 +87,37 @@ class Main:
         except KeyError:
             pause_duration = DEFAULT_PAUSE_DURATION
 
+        # end the pauses as soon as the textures are loaded, pause_duration
+        # being an upper bound
+        adaptive_pause = 'INTPHYS_ADAPTIVEPAUSE' in os.environ
+
+        # setup the compression of saved images (zlib level and PNG filter for
+        # scene, depth and masks) or the dump of raw uncompressed images
+        try:
+            png_compression = [
+                int(c) for c in os.environ['INTPHYS_PNGCOMPRESSION'].split(',')]
+        except KeyError:
+            png_compression = []
+
+        try:
+            png_filters = os.environ['INTPHYS_PNGFILTER'].split(',')
+        except KeyError:
+            png_filters = []
+
+        raw_dump = 'INTPHYS_RAWDUMP' in os.environ
+
+        # with a fixed timestep (the game being launched with -benchmark
+        # -fps=N) render the world only for the captured frames
+        render_captures_only = 'INTPHYS_FIXEDFPS' in os.environ
+
+        # simulate the train scenes without capture before rendering them, to
+        # restart the invalid ones without wasting captures
+        preroll = 'INTPHYS_PREROLL' in os.environ
+
+        # load the materials, meshes and classes of the actors once for all,
+        # the scenes are then spawned from the cache
+        assets.preload()
+
         # setup the director with the list of scenes to generate, 100
         # images per video at the game resolution
         size = (resolution[0], resolution[1], NUM_FRAMES_PER_SCENE)
@@ -95,7 +127,13 @@ class Main:
             size,
             output_dir,
             seed or random.randint(0, 1e9),
-            pause_duration=pause_duration)
+            pause_duration=pause_duration,
+            adaptive_pause=adaptive_pause,
+            png_compression=png_compression,
+            png_filters=png_filters,
+            raw_dump=raw_dump,
+            render_captures_only=render_captures_only,
+            preroll=preroll)
 
     def tick(self, dt):
         # let the director handle the tick
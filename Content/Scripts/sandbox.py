@@ -33,7 +33,9 @@ class Sandbox(Train):
         if self.is_over():
             return
 
-        self.generate_moving_actors_parameters()
+        # a pre-rolled run is replayed with the same parameters
+        if not self.is_prerolled:
+            self.generate_moving_actors_parameters()
         super().spawn_actors()
 
         # apply force on moving objects
@@ -1,29 +1,92 @@
 import os
 import importlib
 import unreal_engine as ue
+from unreal_engine.classes import ActorStatus
+
+from tools.pool import ActorPool
+from tools.profiler import profile
+
+
+# the actors moving at each tick and the ones having a status at each frame,
+# as substrings of the actors names
+MOVING_ACTORS = ('object', 'occluder', 'axiscylinder', 'pill')
+STATUS_ACTORS = ('object', 'occluder')
 
 
 class Scene:
-    def __init__(self, world, saver, category):
+    def __init__(self, world, saver, category, pool=None):
         self.world = world
         self.params = {}
         self.saver = saver
         self.category = category
 
+        # the actors are spawned from and released to this pool, it is shared
+        # by all the scenes to reuse actors between them
+        self.pool = ActorPool(world) if pool is None else pool
+
         self.generate_parameters()
 
         self.actors = None
+        self._clear_registries()
         self.run = 0
         self._is_valid = True
 
+        # the reason of the scene invalidity when not due to an actor, as a
+        # dict (cause, actor, other), see get_invalid_reason()
+        self.invalid_reason = None
+
+        # True once the scene has been simulated without capture, and is
+        # replayed from the same parameters (see Director)
+        self.is_prerolled = False
+
         # TODO move in test scene, useless here
         self.last_locations = []
 
+    def _clear_registries(self):
+        # the actors sorted at spawn time to avoid names matching at each
+        # tick: moving actors, and (name, lowered name, actor) for actors with
+        # a status at each frame or a constant status
+        self._moving_actors = []
+        self._status_actors = []
+        self._static_actors = []
+
+    def register_actor(self, name, actor):
+        """Adds the `actor` to the scene under `name`"""
+        self.actors[name] = actor
+
+        lower_name = name.lower()
+        if any(n in lower_name for n in MOVING_ACTORS):
+            self._moving_actors.append(actor)
+
+        if any(n in lower_name for n in STATUS_ACTORS):
+            self._status_actors.append((name, lower_name, actor))
+        else:
+            self._static_actors.append((name, lower_name, actor))
+
     def get_status(self):
-        """Return the current status of each MOVING actor in the scene"""
-        if self.actors is not None:
-            return {k.lower(): v.get_status() for k, v in self.actors.items()
-                    if 'object' in k or 'occluder' in k}
+        """Return the current status of each MOVING actor in the scene
+
+        The transforms, velocities and masses of all the actors are collected
+        in a single call to C++.
+
+        """
+        if self.actors is None:
+            return None
+
+        actors = [v.actor for _, _, v in self._status_actors]
+        done, locations, rotations, velocities, masses = (
+            ActorStatus.GetStatus(actors))
+        if not done:
+            return {k: v.get_status() for _, k, v in self._status_actors}
+
+        status = {}
+        for i, (_, k, v) in enumerate(self._status_actors):
+            status[k] = v.get_frame_status(
+                dict(zip(('x', 'y', 'z'), locations[3*i:3*i+3])),
+                dict(zip(('roll', 'pitch', 'yaw'), rotations[3*i:3*i+3])),
+                dict(zip(('x', 'y', 'z'), velocities[3*i:3*i+3])),
+                masses[i])
+        return status
 
     def get_status_header(self):
         """Return the status of each CONSTANT actor in the scene"""
@@ -32,9 +95,8 @@ class Scene:
             'block_type': (
                 'train' if 'Train' in type(self).__name__ else 'test'),
             'is_possible': self.is_possible()}
-        for k, v in self.actors.items():
-            if 'object' not in k and 'occluder' not in k:
-                header[k.lower()] = v.get_status()
+        for _, k, v in self._static_actors:
+            header[k] = v.get_status()
         return header
 
     def generate_parameters(self):
@@ -50,6 +112,21 @@ class Scene:
     def is_valid(self):
         return self._is_valid and all(a.is_valid for a in self.actors.values())
 
+    def get_invalid_reason(self):
+        """Return the reason why the scene is invalid, or None if valid
+
+        The reason is a dict with the cause of the invalidity and the involved
+        actors, reported by the director when restarting the scene.
+
+        """
+        if self.invalid_reason is not None:
+            return self.invalid_reason
+
+        for actor in (self.actors or {}).values():
+            if not actor.is_valid:
+                return actor.invalid_reason
+        return None
+
     def is_possible(self):
         """Return True if the current run is plausible, False otherwise"""
         # implementation delegated to Train and Test subclasses
@@ -62,6 +139,7 @@ class Scene:
 
     def spawn_actors(self):
         self.actors = {}
+        self._clear_registries()
         for actor, actor_params in self.params.items():
             if ('magic' in actor):
                 # the magic trick is managed by test classes
@@ -77,20 +155,25 @@ class Scene:
             module = importlib.import_module(module_path)
 
             try:
-                self.actors[actor] = getattr(module, class_name)(
-                    world=self.world, params=actor_params)
+                self.register_actor(actor, self.pool.spawn(
+                    getattr(module, class_name), actor_params))
             except RuntimeError:
+                # the scene cannot be rendered without one of its actors
                 ue.log('failed to spawn {}'.format(actor))
+                self._is_valid = False
+                self.invalid_reason = {
+                    'cause': 'spawn', 'actor': actor, 'other': None}
 
     def reset_actors(self):
-        for name, actor in self.actors.items():
-            if 'object' in name.lower() or 'occluder' in name.lower():
-                actor.reset(self.params[name])
+        for name, _, actor in self._status_actors:
+            actor.reset(self.params[name])
 
     def del_actors(self):
+        """Releases the actors to the pool, where they wait to be reused"""
         for actor in self.actors.values():
-            actor.actor_destroy()
+            self.pool.release(actor)
         self.actors = None
+        self._clear_registries()
 
     def get_nobjects(self):
         """Return the number of objetcs in the scene"""
@@ -124,13 +207,7 @@ class Scene:
 
         return out
 
+    @profile('Scene.tick')
     def tick(self):
-        if self.actors is not None:
-            for actor_name, actor in self.actors.items():
-                if (
-                        'object' in actor_name
-                        or 'occluder' in actor_name
-                        or 'axiscylinder' in actor_name
-                        or 'pill' in actor_name
-                ):
-                    actor.move()
+        for actor in self._moving_actors:
+            actor.move()
@@ -0,0 +1,69 @@
+"""Cache of the assets (materials, meshes and classes) used by the actors
+
+The actors load their assets through this module instead of calling
+ue.load_object and ue.load_class at each spawn. The assets are loaded once,
+kept in the cache and added to the UE root set so that they are never garbage
+collected. The assets known in advance are loaded by preload() at the
+beginning of the game.
+
+"""
+
+import unreal_engine as ue
+from unreal_engine.classes import Material, StaticMesh
+
+from tools import materials
+
+
+# the material categories in Content/Materials to preload
+MATERIALS_CATEGORIES = ['Floor', 'Object', 'Wall', 'AxisCylinder']
+
+# the cached assets, path -> loaded asset
+_materials = {}
+_meshes = {}
+_classes = {}
+
+
+def _load(cache, load, path):
+    try:
+        return cache[path]
+    except KeyError:
+        asset = load(path)
+        # keep a hard reference on the asset so it is not garbage collected
+        asset.add_to_root()
+        cache[path] = asset
+        return asset
+
+
+def load_material(path):
+    """Returns the material asset at `path`, loading it if not cached"""
+    return _load(_materials, lambda p: ue.load_object(Material, p), path)
+
+
+def load_mesh(path):
+    """Returns the static mesh asset at `path`, loading it if not cached"""
+    return _load(_meshes, lambda p: ue.load_object(StaticMesh, p), path)
+
+
+def load_class(path):
+    """Returns the class at `path`, loading it if not cached"""
+    return _load(_classes, ue.load_class, path)
+
+
+def preload():
+    """Loads the materials, meshes and classes of the actors in the cache"""
+    # imported here because the actors modules rely on this one
+    from actors.object import Object
+    from actors.occluder import Occluder
+
+    for category in MATERIALS_CATEGORIES:
+        for path in materials.get_materials(category):
+            load_material(path)
+
+    for path in list(Object.shape.values()) + [Occluder.mesh_name]:
+        load_mesh(path)
+
+    for path in (Object.class_name, Occluder.class_name):
+        load_class(path)
+
+    ue.log('Preloaded {} materials, {} meshes and {} classes'.format(
+        len(_materials), len(_meshes), len(_classes)))
@@ -1,3 +1,4 @@
+import collections
 import importlib
 import json
 import os
@@ -5,9 +6,13 @@ import random
 import shutil
 
 import unreal_engine as ue
-from unreal_engine.classes import GameplayStatics
+from unreal_engine.classes import GameplayStatics, Rendering, Streaming
 from actors.camera import Camera
-from tools.utils import exit_ue
+from tools import profiler
+from tools import spawn_stats
+from tools.profiler import profile
+from tools.utils import exit_ue, log_event
+from tools.pool import ActorPool
 from tools.saver import Saver
 from train import Train
 
@@ -19,13 +24,27 @@ class PauseManager:
     `duration` ticks. This is required to let the time for the textures to be
     fully loaded and rendered for the first capture of the scene.
 
+    In adaptive mode, the pause ends as soon as the texture streaming is done
+    (after at least `min_duration` ticks to let the streaming requests be
+    issued), `duration` being an upper bound. The number of ticks saved that
+    way is accumulated in `saved_ticks`.
+
     """
-    def __init__(self, world, duration):
+    def __init__(self, world, duration, adaptive=False, min_duration=5):
         self._world = world
         self._duration = duration
+        self._adaptive = adaptive
+        self._min_duration = min(min_duration, duration)
         self._remaining = 0
+        self.saved_ticks = 0
 
     def tick(self):
+        if (self._adaptive and self.is_paused()
+                and self._duration - self._remaining >= self._min_duration
+                and Streaming.IsTextureStreamingDone()):
+            self.saved_ticks += self._remaining
+            self._remaining = 0
+
         if self._remaining == 0:
             GameplayStatics.SetGamePaused(self._world, False)
 
@@ -45,22 +64,24 @@ class SceneFactory:
 
     Auxiliary class to Director. This class parses the scenes JSON file and
     instanciates the scenes definied in it. If an error occurs during the
-    parse, the program exits with an error message.
+    parse, the program exits with an error message. All the scenes share the
+    same pool of actors.
 
     """
     def __init__(self, world, saver):
         self._world = world
         self._saver = saver
         self._classes = {}
+        self.pool = ActorPool(world)
 
     def get_train(self):
         """Returns an instance of a train scene"""
-        return Train(self._world, self._saver)
+        return Train(self._world, self._saver, pool=self.pool)
 
     def get_sandbox(self):
         """Returns an instance of a sandbox scene"""
         train_class = self._import_class('sandbox', 'Sandbox')
-        return train_class(self._world, self._saver)
+        return train_class(self._world, self._saver, pool=self.pool)
 
     def get_test(self, category, scenario, is_occluded, movement):
         """Returns an instance of a test scene"""
@@ -72,7 +93,8 @@ class SceneFactory:
         else:
             cls = self._import_class(f'test.{scenario}', f'{scenario}Test')
 
-        return cls(self._world, self._saver, category, is_occluded, movement)
+        return cls(self._world, self._saver, category, is_occluded, movement,
+                   pool=self.pool)
 
     def parse(self, scenes_json):
         """Yields instance of Scene as defined in a JSON configuration file"""
@@ -133,6 +155,10 @@ class SceneFactory:
             scenes = self._parse_test(data, category)
 
         for scene in scenes:
+            # the path of the scene in the JSON, reported in the progress
+            # events (test scenes have it already)
+            if not hasattr(scene, 'json_key'):
+                scene.json_key = [category]
             yield scene
 
     def _parse_test(self, data, category):
@@ -144,8 +170,11 @@ class SceneFactory:
                     # must be static, dynamic_1 or dynamic_2
                     self._check_movement(movement)
                     for _ in range(num_scenes):
-                        yield self.get_test(
+                        scene = self.get_test(
                             category, scenario, is_occluded, movement)
+                        scene.json_key = [
+                            category, scenario, visibility, movement]
+                        yield scene
 
 
 class Director(object):
@@ -159,6 +188,21 @@ class Director(object):
     The scenes can be 'train', 'test' or 'dev' scenes. Each scene is rendered
     during `2 * size[2]` ticks and captured on even ticks.
 
+    When `preroll` is True, the train scenes are first simulated without
+    capture. If they are still valid at the end, they are rewound and
+    replayed from the same parameters with capture, else they are restarted
+    without having wasted any capture.
+
+    The reason of each restart (cause, involved actors, tick) is recorded and
+    saved in the file 'restarts.json' of the output directory, to be analyzed
+    with Tools/restart_causes.py.
+
+    When `render_captures_only` is True, the world is drawn only on the ticks
+    preceding a capture (and during the pauses, to load the textures). This
+    is intended to be used with a fixed timestep (see the --fixed-fps option
+    of intphys.py), so that the scenes are simulated as fast as possible
+    while the physics stays the same.
+
     The director owns the camera.
 
     Parameters
@@ -177,13 +221,36 @@ class Director(object):
     pause_duration : int, optional
         Duration of the pause at the beginning of each scene (in number of
         ticks).
+    adaptive_pause : bool, optional
+        When True, end the pauses as soon as the textures are loaded,
+        `pause_duration` being the maximal duration.
+    png_compression : list of int, optional
+        The zlib compression level of the scene, depth and masks images, see
+        Saver.
+    png_filters : list of str, optional
+        The PNG filters of the scene, depth and masks images, see Saver.
+    raw_dump : bool, optional
+        When True, save uncompressed raw images instead of PNG.
+    render_captures_only : bool, optional
+        When True, disable the world rendering on the ticks not followed by a
+        capture.
+    preroll : bool, optional
+        When True, simulate the train scenes without capture before rendering
+        them.
 
     """
     def __init__(self, world, scenes_json, size, output_dir,
-                 seed, pause_duration=30):
+                 seed, pause_duration=30, adaptive_pause=False,
+                 png_compression=None, png_filters=None, raw_dump=False,
+                 render_captures_only=False, preroll=False):
         # the world in which the scenes are rendered
         self.world = world
 
+        # when True the world is rendered only for the captures, the current
+        # state of the rendering is cached to avoid useless calls to UE
+        self.render_captures_only = render_captures_only
+        self._is_rendering = True
+
         # count the number of scenes rendered for each category 'train', 'test'
         # and 'dev', this is usefull to name the subdirectories where the
         # scenes are saved.
@@ -194,8 +261,21 @@ class Director(object):
             'dev': 0}
 
         # count the number of restarted scenes (i.e. the number of times a
-        # scene rendering failed)
+        # scene rendering failed), the reason of each restart is recorded in
+        # the restarts list
         self.num_restarted_scenes = 0
+        self.restarts = []
+        self.preroll = preroll
+
+        # the scenes stopped or restarted during the current tick, their
+        # timings are saved by tick() once all the stages of the tick are
+        # timed. The summary is logged after the last tick.
+        self._profiled_scenes = []
+        self._is_terminated = False
+
+        # the 'scene' event of the last rendered scene, emitted only once its
+        # images are written to disk (see _log_written_scene)
+        self._unwritten_scene = None
 
         # ticker is set at 0 when a scene starts and is incremented until it
         # reachs max_tick (meaning the scene is rendered)
@@ -203,13 +283,17 @@ class Director(object):
         self.ticker = 0
 
         # manage the pauses at the beginning of each scene
-        self.pauser = PauseManager(self.world, pause_duration)
+        self.pauser = PauseManager(
+            self.world, pause_duration, adaptive=adaptive_pause)
 
         # create the camera
         self.camera = Camera(self.world)
 
         # manage the scenes capture and saving to disk
-        self.saver = Saver(self.camera, size, seed, output_dir=output_dir)
+        self.saver = Saver(
+            self.camera, size, seed, output_dir=output_dir,
+            png_compression=png_compression, png_filters=png_filters,
+            raw_dump=raw_dump)
 
         self.scene_factory = SceneFactory(self.world, self.saver)
 
@@ -225,6 +309,8 @@ class Director(object):
                 'dry mode not supported for dev/test scenes, '
                 'please specify an output directory')
 
+        log_event('start', total=self.total_scenes)
+
     @property
     def current_scene_index(self):
         """The index of the scene being rendered"""
@@ -242,6 +328,21 @@ class Director(object):
 
     def tick(self, dt):
         """this method is called at each game tick by UE"""
+        self._timed_tick()
+
+        for record in self._profiled_scenes:
+            profiler.save_scene(self.saver.output_dir, **record)
+        self._profiled_scenes = []
+        if self._is_terminated:
+            profiler.log_summary()
+
+    @profile('Director.tick')
+    def _timed_tick(self):
+        self._tick()
+        if self.render_captures_only:
+            self._update_rendering()
+
+    def _tick(self):
         # if the renderer is paused, just wait the end of the pause
         self.pauser.tick()
         if self.pauser.is_paused():
@@ -259,9 +360,13 @@ class Director(object):
                 self._terminate()
                 exit_ue()
 
-        # we reach the end of a scene, stop it and prepare for the next one
+        # we reach the end of a scene, stop it and prepare for the next one,
+        # or replay it with capture if it was pre-rolled
         elif self.ticker > self.max_tick:
-            self._stop_scene()
+            if self._is_prerolling():
+                self.current_scene.rewind()
+            else:
+                self._stop_scene()
             self.ticker = 0
 
         # a scene is running, if it is valid, simply continue and capture
@@ -269,21 +374,47 @@ class Director(object):
         else:
             if self.current_scene.is_valid() and self.camera.is_valid:
                 self.current_scene.tick()
-                if self.ticker % 2 == 1:
+                if self.ticker % 2 == 1 and not self._is_prerolling():
                     self.current_scene.capture()
                 self.ticker += 1
             else:
                 # the scene is not valid, reschedule it with new parameters and
-                # prepare for the next scene
-                self.current_scene.stop_run(
-                    self.counter[self.current_scene.category],
-                    self.total_scenes)
-                self._regenerate_scene()
+                # prepare for the next scene. Nothing has been captured during
+                # a pre-roll, so there is nothing to save.
+                if not self.camera.is_valid:
+                    reason = self.camera.invalid_reason
+                else:
+                    reason = self.current_scene.get_invalid_reason()
+
+                if self._is_prerolling():
+                    self.current_scene.del_actors()
+                else:
+                    self.current_scene.stop_run(
+                        self.counter[self.current_scene.category],
+                        self.total_scenes)
+                self._regenerate_scene(reason)
                 self.ticker = 0
 
+    def _is_prerolling(self):
+        """True if the current scene is simulated without capture"""
+        return (self.preroll and not self.current_scene.is_test_scene()
+                and not self.current_scene.is_prerolled)
+
+    def _update_rendering(self):
+        # the screenshot taken at a tick is the frame drawn at the end of the
+        # previous tick, so the world is drawn when the next tick captures.
+        # It is drawn during the pauses as well to stream the textures in.
+        is_rendering = self.pauser.is_paused() or (
+            self.ticker % 2 == 1 and not self._is_prerolling())
+        if is_rendering != self._is_rendering:
+            Rendering.SetWorldRendering(self.world, is_rendering)
+            self._is_rendering = is_rendering
+
+    @profile('Director._start_scene')
     def _start_scene(self):
-        # log a brief description of the scene being started
-        if self.current_scene.run == 0:
+        # log a brief description of the scene being started (once if
+        # pre-rolled)
+        if self.current_scene.run == 0 and not self.current_scene.is_prerolled:
             if 'train' in self.current_scene.name:
                 ue.log('Scene {}/{}: Train scenario'.format(
                     self.current_scene_index + 1, self.total_scenes))
@@ -300,8 +431,9 @@ class Director(object):
         self.current_scene.play_run()
 
         # if the scene is not valid (because of overlapping actors for
-        # instance) it will be immediatly restarted, so the pause is useless
-        if self.current_scene.is_valid():
+        # instance) it will be immediatly restarted, so the pause is useless.
+        # It is useless as well during a pre-roll since nothing is captured.
+        if self.current_scene.is_valid() and not self._is_prerolling():
             self.pauser.pause()
 
         # # for train only, 'warmup' the scene to settle the physics simulation
@@ -309,18 +441,31 @@ class Director(object):
         #     for _ in range(1, 10):
         #         self.current_scene.tick()
 
+    @profile('Director._stop_scene')
     def _stop_scene(self):
         run_stopped = self.current_scene.stop_run(
             self.counter[self.current_scene.category],
             self.total_scenes)
 
+        # saving the run waited for the images of the previous scene
+        self._log_written_scene()
+
         # a test scene has been stopped before all the runs have been rendered,
         # we need to restart it
         if run_stopped is False:
-            self._regenerate_scene()
+            self._regenerate_scene({'cause': 'test_run'})
 
         # the scene has been completely rendered, just increment the counters
         elif self.current_scene.is_over():
+            self._profiled_scenes.append({
+                'scene': self.current_scene_index + 1,
+                'name': self.current_scene.name, 'restarted': False})
+            self._unwritten_scene = {
+                'index': self.current_scene_index + 1,
+                'category': self.current_scene.category,
+                'key': self.current_scene.json_key,
+                'subdir': self._get_scene_subdir()}
+
             if (self.current_scene.name !=
                 self.scenes[
                     (self.current_scene_index + 1) % self.total_scenes].name):
@@ -329,21 +474,44 @@ class Director(object):
                 self.counter[self.current_scene.category] += 1
             self.counter['total'] += 1
 
-    def _regenerate_scene(self):
-        """Generate new parameters for the current scene"""
-        ue.log('Restarting scene')
+    @profile('Director._regenerate_scene')
+    def _regenerate_scene(self, reason=None):
+        """Generate new parameters for the current scene
+
+        The `reason` of the restart is a dict with at least a 'cause' entry
+        (see BaseActor.invalidate), it is completed with the description of
+        the scene and recorded in self.restarts.
+
+        """
+        reason = dict(reason or {'cause': 'unknown'})
+        reason.update({
+            'scene': self.current_scene_index + 1,
+            'category': self.current_scene.category,
+            'name': self.current_scene.name,
+            'tick': self.ticker,
+            'preroll': self._is_prerolling()})
+        self.restarts.append(reason)
+
+        ue.log('Restarting scene ({})'.format(reason['cause']))
         self.num_restarted_scenes += 1
+        self._profiled_scenes.append({
+            'scene': self.current_scene_index + 1,
+            'name': self.current_scene.name, 'restarted': True})
+        log_event(
+            'restart', index=self.current_scene_index + 1,
+            category=self.current_scene.category, cause=reason['cause'])
 
         # clear the saver from any saved content and delete the output
-        # directory of the failed scene (if any)
+        # directory of the failed scene (if any), once its images are written
         self.saver.reset(True)
         if not self.saver.is_dry_mode:
-            output_dir = self.current_scene.get_scene_subdir(
-                self.counter[self.current_scene.category],
-                self.total_scenes)
-            if self.current_scene.is_test_scene():
-                output_dir = '/'.join(output_dir.split('/')[:-1])
-            shutil.rmtree(output_dir)
+            self.saver.flush()
+            output_dir = os.path.join(
+                self.saver.output_dir, self._get_scene_subdir())
+            # there is no directory if the scene failed during a pre-roll
+            if os.path.isdir(output_dir):
+                shutil.rmtree(output_dir)
+        self._log_written_scene()
 
         if self.current_scene.is_test_scene():
             # we are restarting a test scene
@@ -360,13 +528,65 @@ class Director(object):
             scene = self.scene_factory.get_train()
 
         # insert the new scene in the list and erase the current one
+        scene.json_key = self.current_scene.json_key
         self.scenes[self.current_scene_index] = scene
 
+    def _log_written_scene(self):
+        """Emits the 'scene' event of the last rendered scene
+
+        Must be called once the images of that scene are written to disk
+        (after a flush of the saver), so that a scene is reported as complete
+        only when its directory is. The failed writes are logged as errors
+        before the event.
+
+        """
+        if self._unwritten_scene is not None:
+            log_event('scene', **self._unwritten_scene)
+            self._unwritten_scene = None
+
+    def _get_scene_subdir(self):
+        """The output directory of the current scene, relative to output_dir
+
+        For test scenes this is the scene directory, parent of the runs
+        subdirectories. Returns None in dry mode.
+
+        """
+        if self.saver.is_dry_mode:
+            return None
+
+        subdir = self.current_scene.get_scene_subdir(
+            self.counter[self.current_scene.category],
+            self.total_scenes)
+        if self.current_scene.is_test_scene():
+            subdir = os.path.dirname(subdir)
+        return os.path.relpath(subdir, self.saver.output_dir)
+
+    def _save_restarts(self):
+        """Writes the restarts report in the output directory"""
+        if self.saver.is_dry_mode:
+            return
+
+        report = {
+            'total_scenes': self.total_scenes,
+            'restarted_scenes': self.num_restarted_scenes,
+            'causes': dict(collections.Counter(
+                r['cause'] for r in self.restarts)),
+            'restarts': self.restarts}
+
+        os.makedirs(self.saver.output_dir, exist_ok=True)
+        with open(os.path.join(
+                self.saver.output_dir, 'restarts.json'), 'w') as fout:
+            fout.write(json.dumps(report, indent=4) + '\n')
+
     def _terminate(self):
         """Conclude operations once all the scenes have been rendered
 
-        informs on the amount of restarted scenes and shuffle the
-        possible/impossible runs in test and dev scenes
+        informs on the amount of restarted scenes and their causes (saved in
+        restarts.json), the ticks saved by adaptive pauses and the spawn
+        acceptance rates (saved in spawn_stats.json), waits for the images to
+        be written and shuffle the possible/impossible runs in test and dev
+        scenes. The time spent in each stage (if profiling) is logged by
+        tick() once this last tick is timed.
 
         """
         if self.num_restarted_scenes:
@@ -375,5 +595,37 @@ class Director(object):
             ue.log("Generated {}% more scenes due to restarted scenes".
                    format(int(percent_restarted * 100)))
 
+        if self.restarts:
+            causes = collections.Counter(r['cause'] for r in self.restarts)
+            ue.log('Restart causes: {}'.format(', '.join(
+                '{} {}'.format(n, c) for c, n in causes.most_common())))
+            self._save_restarts()
+
+        if self.preroll:
+            ue.log('{} of the {} restarts occured during a pre-roll, '
+                   'without capture'.format(
+                       sum(r['preroll'] for r in self.restarts),
+                       self.num_restarted_scenes))
+
+        if self.pauser.saved_ticks:
+            ue.log('Adaptive pauses saved {} ticks ({} per scene)'.format(
+                self.pauser.saved_ticks,
+                round(self.pauser.saved_ticks / self.total_scenes, 1)))
+
+        ue.log('Spawned {} actors, reused {} from the pool'.format(
+            self.scene_factory.pool.num_spawned,
+            self.scene_factory.pool.num_reused))
+
+        # the time spent in each stage is logged at the end of the tick
+        self._is_terminated = True
+
+        spawn_stats.log_summary()
+        if not self.saver.is_dry_mode:
+            spawn_stats.save(self.saver.output_dir)
+
+        self.saver.flush()
+        self._log_written_scene()
         self.saver.shuffle_test_scenes(dataset='test')
         self.saver.shuffle_test_scenes(dataset='dev')
+
+        log_event('end', restarted=self.num_restarted_scenes)
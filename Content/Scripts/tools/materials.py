@@ -1,5 +1,6 @@
 """Python interface to load materials from Content/Materials"""
 
+import functools
 import os
 import random
 import unreal_engine as ue
@@ -31,7 +32,7 @@ def get_random_material(category, material=None):
     material: str
         The path to a material assset following the UE
         conventions. The material can them be loaded using
-        'ue.load_object(Material, material)'.
+        'tools.assets.load_material(material)'.
 
     Raises
     ------
@@ -44,20 +45,34 @@ def get_random_material(category, material=None):
         raise ValueError(
             f'category {category} unknown, must be in {valid_categories}')
 
-    # build the list of possible materials and shuffle it, return the
-    # 1st element in it
+    # the unauthorized combinations only depend on the floor material
+    if category == 'Pill' or material not in UNAUTHORIZED:
+        material = None
+
+    return random.choice(_get_available_materials(category, material))
+
+
+@functools.lru_cache(maxsize=None)
+def get_materials(category):
+    """Return the sorted materials available for the given category
+
+    `category` is the name of a subdirectory of 'Content/Materials'. The
+    directory is listed once, the result is cached.
+
+    """
+    return tuple(sorted(_load_materials('Materials/' + category)))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_available_materials(category, material):
+    """Return the materials of `category` authorized along with `material`"""
     if category == 'Pill':
-        available_materials = _load_materials('Materials/Object')
-        available_materials = list(
-            set(available_materials) - PILL_UNAUTHORIZED)
+        available_materials = set(get_materials('Object')) - PILL_UNAUTHORIZED
     else:
-        available_materials = _load_materials('Materials/' + category)
-        if material in UNAUTHORIZED.keys():
-            available_materials = list(
-                set(available_materials) - set(UNAUTHORIZED[material]))
+        available_materials = (
+            set(get_materials(category)) - set(UNAUTHORIZED.get(material, [])))
 
-    random.shuffle(available_materials)  # in-place list shuffling
-    return available_materials[0]
+    return tuple(sorted(available_materials))
 
 
 def _get_material_path(path):
@@ -0,0 +1,58 @@
+"""Reuse of the actors between scenes instead of spawning/destroying them"""
+
+import collections
+
+
+class ActorPool:
+    """A pool of actors keyed by class
+
+    Instead of being destroyed at the end of a scene, the actors are released
+    to the pool where they are parked (hidden, with collisions disabled). When
+    an actor of the same class is spawned later on, a parked one is
+    reconfigured with the new parameters through its `reuse` method, saving a
+    spawn in the world.
+
+    Lights are keyed by class and light type since a light cannot change its
+    type.
+
+    Parameters
+    ----------
+    world : ue.UWorld
+        The world in which the actors are spawned
+
+    """
+    def __init__(self, world):
+        self._world = world
+        self._parked = collections.defaultdict(list)
+
+        # the number of spawned and reused actors
+        self.num_spawned = 0
+        self.num_reused = 0
+
+    @staticmethod
+    def _key(actor_class, params):
+        return actor_class, getattr(params, 'type', None)
+
+    def spawn(self, actor_class, params):
+        """Returns an instance of `actor_class` configured with `params`
+
+        The instance is reused from the pool if any, or spawned in the world.
+
+        """
+        key = self._key(actor_class, params)
+        parked = self._parked[key]
+        if parked:
+            actor = parked.pop()
+            actor.reuse(params)
+            self.num_reused += 1
+        else:
+            actor = actor_class(world=self._world, params=params)
+            self.num_spawned += 1
+
+        actor.pool_key = key
+        return actor
+
+    def release(self, actor):
+        """Parks the `actor` in the pool for later reuse"""
+        actor.park()
+        self._parked[actor.pool_key].append(actor)
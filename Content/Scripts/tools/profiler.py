@@ -0,0 +1,101 @@
+"""Measures the wall time spent in the stages of the scenes rendering
+
+The profiler is enabled by defining the INTPHYS_PROFILE environment variable
+(see the --profile option of intphys.py). When disabled, the profile()
+decorator returns the decorated function unchanged so there is no overhead at
+all.
+
+The timings are accumulated per stage (a stage being a decorated function)
+and flushed once per scene as a JSON line in the file 'profile.jsonl' of the
+output directory. A summary over all the scenes is logged at exit.
+
+Note that the timings are inclusive: the time spent in Director.tick includes
+the time spent in the other stages it calls.
+
+"""
+
+import collections
+import functools
+import json
+import os
+import time
+
+import unreal_engine as ue
+
+
+ENABLED = 'INTPHYS_PROFILE' in os.environ
+
+# stage -> [total time (s), number of calls], for the current scene and for
+# all the scenes respectively
+_scene_timings = collections.defaultdict(lambda: [0.0, 0])
+_total_timings = collections.defaultdict(lambda: [0.0, 0])
+
+
+def profile(stage):
+    """Decorator accumulating the time spent in a function under `stage`"""
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing = _scene_timings[stage]
+                timing[0] += time.monotonic() - start
+                timing[1] += 1
+        return wrapper
+    return decorator
+
+
+def save_scene(output_dir, **record):
+    """Writes the timings of the current scene and resets them
+
+    The timings are appended as a JSON line to `output_dir`/profile.jsonl,
+    along with the entries in `record` (describing the scene). If `output_dir`
+    is None, the timings are only accumulated for the final summary.
+
+    """
+    if not ENABLED:
+        return
+
+    record['timings'] = {
+        stage: {'total': total, 'calls': calls}
+        for stage, (total, calls) in sorted(_scene_timings.items())}
+
+    for stage, (total, calls) in _scene_timings.items():
+        _total_timings[stage][0] += total
+        _total_timings[stage][1] += calls
+    _scene_timings.clear()
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, 'profile.jsonl'), 'a') as fout:
+            fout.write(json.dumps(record) + '\n')
+
+
+def log_summary():
+    """Logs the time spent in each stage over all the scenes
+
+    The stages timed since the last saved scene (at the end of the rendering)
+    are included.
+
+    """
+    if not ENABLED:
+        return
+
+    for stage, (total, calls) in _scene_timings.items():
+        _total_timings[stage][0] += total
+        _total_timings[stage][1] += calls
+    _scene_timings.clear()
+
+    if not _total_timings:
+        return
+
+    ue.log('Profiling summary (stage: total, calls, mean per call):')
+    for stage, (total, calls) in sorted(
+            _total_timings.items(), key=lambda t: t[1][0], reverse=True):
+        ue.log('  {}: {:.2f}s, {}, {:.2f}ms'.format(
+            stage, total, calls, 1000 * total / calls))
@@ -7,6 +7,8 @@ import shutil
 import unreal_engine as ue
 from unreal_engine.classes import ScreenshotManager
 import actors.parameters
+from tools.profiler import profile
+from tools.utils import exit_ue
 
 
 class Saver:
@@ -27,9 +29,20 @@ class Saver:
     output_dir : string, optional
         The directory where to save captured images, if None (default) does not
         save anything.
+    png_compression : list of int, optional
+        The zlib compression level of the scene, depth and masks images, from
+        0 (fastest) to 9 (smallest), -1 for zlib default. When None or empty
+        (default) use the default for all the images.
+    png_filters : list of str, optional
+        The PNG filters used for scene, depth and masks images, in 'none',
+        'sub', 'up', 'avg', 'paeth', 'all' or 'default'. When None or empty
+        (default) use the default for all the images.
+    raw_dump : bool, optional
+        When True, write uncompressed raw images instead of PNG.
 
     """
-    def __init__(self, camera, size, seed, output_dir=None):
+    def __init__(self, camera, size, seed, output_dir=None,
+                 png_compression=None, png_filters=None, raw_dump=False):
         self.size = size
         self.camera = camera
         self.is_dry_mode = True if output_dir is None else False
@@ -40,16 +53,20 @@ class Saver:
         self.status = []
 
         # initialize the capture.
+        png_compression = list(png_compression or [])
+        png_filters = list(png_filters or [])
         verbose = False
-        ScreenshotManager.Initialize(
-            int(self.size[0]), int(self.size[1]), int(self.size[2]),
-            self.camera.actor,
-            seed, verbose)
+        if not ScreenshotManager.Initialize(
+                int(self.size[0]), int(self.size[1]), int(self.size[2]),
+                self.camera.actor,
+                seed, png_compression, png_filters, raw_dump, verbose):
+            exit_ue('error: invalid PNG compression settings')
 
     def set_status_header(self, header):
         self.status_header = header
         self.status_header['camera'] = self.camera.get_status()
 
+    @profile('Saver.capture')
     def capture(self, ignored_actors, status):
         """Push the scene's current screenshot and status to memory"""
         if not self.is_dry_mode:
@@ -66,13 +83,20 @@ class Saver:
             self.status_header = {}
             self.status = []
 
+    @profile('Saver.save')
     def save(self, output_dir):
-        """Save the captured data to `output_dir`"""
+        """Save the captured data to `output_dir`
+
+        The images are written in background, call flush() to make sure they
+        are on disk.
+
+        """
         if self.is_dry_mode:
             return True
 
         # save the captured images as PNG
-        done, masks = ScreenshotManager.Save(output_dir)
+        (done, frames, actors, gray_levels, actor_names,
+         pixels, boxes, centroids) = ScreenshotManager.Save(output_dir)
         if not done:
             ue.log_warning('failed to save images to {}'.format(output_dir))
             return False
@@ -99,9 +123,12 @@ class Saver:
 
         # postprocess the masks to make it JSON compatible and save it to
         # status
-        masks = self.parse_masks(masks, names_map)
+        masks, visibility = self.build_masks(
+            frames, actors, gray_levels, actor_names, names_map,
+            pixels, boxes, centroids)
         for i in range(len(self.status)):
-            self.status[i].update({'masks': masks[i]})
+            self.status[i].update(
+                {'masks': masks[i], 'visibility': visibility[i]})
         status = {'header': self.status_header, 'frames': self.status}
 
         # save the status as JSON file
@@ -111,18 +138,60 @@ class Saver:
 
         return True
 
-    def parse_masks(self, masks, names_map):
-        parsed = [{} for _ in range(self.size[2])]
-        for mask in masks:
-            try:
-                frame, actor, gray_level = tuple(mask.split('__'))
-                frame = int(frame) - 1
-                actor = names_map[actor]
-                gray_level = int(gray_level)
-                parsed[frame].update({actor: gray_level})
-            except KeyError:  # this is the magic actor, it may disapear
+    def flush(self):
+        """Wait until all the saved images are written to disk"""
+        if self.is_dry_mode:
+            return True
+
+        done = ScreenshotManager.Flush()
+        if not done:
+            ue.log_warning('failed to write images')
+        return done
+
+    def build_masks(self, frames, actors, gray_levels, actor_names,
+                    names_map, pixels, boxes, centroids):
+        """Returns the masks and visibility of the actors in each frame
+
+        The masks are given as parallel arrays of frame indices, actor ids
+        and gray levels, as returned by ScreenshotManager.Save. The actor ids
+        are joined once on the intphys names, and the arrays are zipped in a
+        single pass (the boxes and centroids by 4 and 2 values) with no
+        indexing nor slicing.
+
+        Returns
+        -------
+        masks : list of dict
+            For each frame, the gray level of each actor as {actor:
+            gray_level}.
+        visibility : list of dict
+            For each frame, the number of pixels, bounding box (xmin, ymin,
+            xmax, ymax) and centroid (x, y) of each visible actor in the
+            masks, as {actor: {'pixels': int, 'bbox': list, 'centroid':
+            list}}.
+
+        """
+        # the magic actor may disapear, it has no name in names_map
+        names = [names_map.get(name) for name in actor_names]
+
+        boxes, centroids = iter(boxes), iter(centroids)
+        entries = zip(
+            frames, actors, gray_levels, pixels,
+            zip(boxes, boxes, boxes, boxes), zip(centroids, centroids))
+
+        masks = [{} for _ in range(self.size[2])]
+        visibility = [{} for _ in range(self.size[2])]
+        for frame, actor, gray_level, npixels, bbox, centroid in entries:
+            name = names[actor]
+            if name is None:
                 continue
-        return parsed
+
+            masks[frame][name] = gray_level
+            if npixels:
+                visibility[frame][name] = {
+                    'pixels': npixels,
+                    'bbox': list(bbox),
+                    'centroid': list(centroid)}
+        return masks, visibility
 
     def shuffle_test_scenes(self, dataset='test'):
         """Shuffle possible/impossible runs in test scenes
@@ -0,0 +1,100 @@
+"""Acceptance statistics of the actors spawned in train scenes
+
+The moving actors of a train scene (occluders and objects) are sampled until
+they do not overlap the actors already spawned (see
+Train.generate_spawn_moving_actors). This module counts, for each scenario
+and kind of actor, the number of sampling attempts and the number of actors
+finally accepted, as well as the number of layouts (the set of moving actors
+of a scene) resampled because an actor could not be placed.
+
+The statistics are accumulated over all the scenes, logged at exit and
+saved in the file 'spawn_stats.json' of the output directory. A low
+acceptance rate points to expensive scenario parameters.
+
+"""
+
+import collections
+import json
+import os
+
+import unreal_engine as ue
+
+
+# (scenario, kind) -> [attempts, accepted, rejected actors]
+_actors = collections.defaultdict(lambda: [0, 0, 0])
+
+# scenario -> [layouts, accepted layouts]
+_layouts = collections.defaultdict(lambda: [0, 0])
+
+
+def record_actor(scenario, kind, attempts, accepted):
+    """Counts the `attempts` made to spawn an actor of `kind`
+
+    `accepted` is True if the actor has been spawned at the last attempt,
+    False if it has been given up.
+
+    """
+    stats = _actors[(scenario, kind)]
+    stats[0] += attempts
+    stats[1 if accepted else 2] += 1
+
+
+def record_layout(scenario, accepted):
+    """Counts a layout of `scenario`, `accepted` if all its actors spawned"""
+    stats = _layouts[scenario]
+    stats[0] += 1
+    stats[1] += int(accepted)
+
+
+def reset():
+    """Clears the statistics"""
+    _actors.clear()
+    _layouts.clear()
+
+
+def get_statistics():
+    """Returns the statistics as a dict, with acceptance rates"""
+    actors = {}
+    for (scenario, kind), (attempts, accepted, rejected) in sorted(
+            _actors.items()):
+        actors.setdefault(scenario, {})[kind] = {
+            'attempts': attempts,
+            'accepted': accepted,
+            'rejected': rejected,
+            'acceptance_rate': accepted / attempts if attempts else 0.0}
+
+    layouts = {
+        scenario: {
+            'layouts': total,
+            'accepted': accepted,
+            'acceptance_rate': accepted / total if total else 0.0}
+        for scenario, (total, accepted) in sorted(_layouts.items())}
+
+    return {'actors': actors, 'layouts': layouts}
+
+
+def save(output_dir):
+    """Writes the statistics in `output_dir`/spawn_stats.json"""
+    if not _layouts:
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'spawn_stats.json'), 'w') as fout:
+        fout.write(json.dumps(get_statistics(), indent=4) + '\n')
+
+
+def log_summary():
+    """Logs the acceptance rates of the actors and layouts"""
+    if not _layouts:
+        return
+
+    stats = get_statistics()
+    ue.log('Spawn acceptance rates (accepted/attempts):')
+    for scenario, layout in stats['layouts'].items():
+        ue.log('  {} layouts: {}/{} ({:.1f}%)'.format(
+            scenario, layout['accepted'], layout['layouts'],
+            100 * layout['acceptance_rate']))
+        for kind, actor in stats['actors'].get(scenario, {}).items():
+            ue.log('    {}: {}/{} ({:.1f}%)'.format(
+                kind, actor['accepted'], actor['attempts'],
+                100 * actor['acceptance_rate']))
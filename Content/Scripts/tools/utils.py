@@ -1,5 +1,6 @@
 """Defines general utility functions used by intphys"""
 
+import json
 import os
 
 import unreal_engine as ue
@@ -34,6 +35,22 @@ def exit_ue(message=None):
     Exit.ExitEngine()
 
 
+# the tag prefixing progress events in the log, parsed by intphys.py
+EVENT_TAG = 'INTPHYS_EVENT'
+
+
+def log_event(event, **data):
+    """Log a machine-readable progress event
+
+    The event is logged as a single line 'INTPHYS_EVENT {json}' where the JSON
+    object has an 'event' entry and the entries in `data`. Those lines are
+    parsed by intphys.py to monitor the rendering.
+
+    """
+    data['event'] = event
+    ue.log('{} {}'.format(EVENT_TAG, json.dumps(data, sort_keys=True)))
+
+
 def intphys_root_directory():
     """Return the absolute path to the intphys root directory"""
     # guess it from the evironment variable first, or from the
@@ -5,6 +5,7 @@ import importlib
 import math
 import random
 
+import unreal_engine as ue
 from unreal_engine import FLinearColor, FRotator, FVector
 from unreal_engine.classes import SpawnManager
 
@@ -16,9 +17,20 @@ from actors.parameters import LightParams
 from actors.parameters import ObjectParams
 from actors.parameters import OccluderParams
 from actors.parameters import WallsParams
+from tools import spawn_stats
 from tools.materials import get_random_material
 
 
+# the maximal number of attempts to spawn a moving actor without overlap,
+# before resampling the whole layout of the moving actors, and the maximal
+# number of layouts before giving up the scene
+MAX_SPAWN_ATTEMPTS = 50
+MAX_LAYOUT_ATTEMPTS = 10
+
+# the moving actors of the layout, as actors names prefixes
+LAYOUT_ACTORS = ('walls', 'occluder', 'object')
+
+
 class Train(Scene):
     @property
     def name(self):
@@ -28,10 +40,14 @@ class Train(Scene):
     def description(self):
         return 'physically plausible train scene'
 
-    def __init__(self, world, saver):
-        super().__init__(world, saver, 'train')
+    def __init__(self, world, saver, pool=None):
+        super().__init__(world, saver, 'train', pool=pool)
         self._is_valid = True
 
+        # the scenario and collision point of the spawned layout
+        self.scenario = None
+        self.collision_point = None
+
     def is_valid(self):
         """Returns True if the scene and all the actors are valid"""
         return self._is_valid and super().is_valid()
@@ -80,21 +96,31 @@ class Train(Scene):
         if self.is_over():
             return
 
-        # spawn the static actors (lights, floor)
+        # spawn the static actors (lights, floor), and the moving ones as well
+        # when replaying a pre-rolled run, their parameters being known
         super().spawn_actors()
 
-        self.generate_spawn_moving_actors()
+        if not self.is_prerolled:
+            self.generate_spawn_moving_actors()
 
         # apply force on moving objects
         for name, actor in self.actors.items():
             if 'object' in name.lower():
                 actor.set_force(actor.initial_force)
 
+    def rewind(self):
+        """Ends a pre-roll of the scene, simulated without capture
+
+        The actors are deleted, the next call to play_run() respawns them
+        from the same parameters for the captured run.
+
+        """
+        self.del_actors()
+        self.is_prerolled = True
+
     def is_overlapping(self, actor):
         """Returns True if `actor` overlaps another actor in the scene"""
-        actors_to_check = [
-            actor.actor for name, actor in self.actors.items()
-            if 'object' in name.lower() or 'occluder' in name.lower()]
+        actors_to_check = [actor.actor for _, _, actor in self._status_actors]
 
         if 'walls' in self.actors:
             actors_to_check += [
@@ -111,11 +137,11 @@ class Train(Scene):
         """Spawns a new actor in the world
 
         This method dynamically import the actor's class based on its name,
-        instanciate it (ie spawn the actor), make sure the spawned actor does
-        not overlap another actor (if so the freshly spawned actor is
-        destryed). It finally updated the internal dictionnaries registering
-        the living actors and their parameters (needed to retrieve the status
-        and scene's validity).
+        instanciate it (ie spawn the actor or reuse one from the pool), make
+        sure the spawned actor does not overlap another actor (if so the
+        freshly spawned actor is released to the pool). It finally updated the
+        internal dictionnaries registering the living actors and their
+        parameters (needed to retrieve the status and scene's validity).
 
         Parameters
         ----------
@@ -139,17 +165,17 @@ class Train(Scene):
         module = importlib.import_module(module_path)
         actor_class = getattr(module, name.split('_')[0].title())
 
-        # instanciate the actor (spawn it in the world)
-        actor = actor_class(world=self.world, params=params)
+        # instanciate the actor (spawn it in the world or reuse a parked one)
+        actor = self.pool.spawn(actor_class, params)
 
         # make sure the new actor does not overlap any existing actor
         if check_overlap is True and self.is_overlapping(actor):
-            actor.actor_destroy()
+            self.pool.release(actor)
             return False
 
         # update the actros and parameters dictionnaries
         self.params[name] = params
-        self.actors[name] = actor
+        self.register_actor(name, actor)
         return True
 
     def generate_parameters(self):
@@ -190,10 +216,31 @@ class Train(Scene):
         scenario maximize the probability that actors jump above the background
         wall.
 
-        """
-        # choose the train scenario to render
-        scenario = random.choice(2 * ['random', 'collision'] + ['walls'])
+        Each actor is resampled until it does not overlap the others, at most
+        MAX_SPAWN_ATTEMPTS times. Past that, the whole layout is resampled
+        (with a new scenario), at most MAX_LAYOUT_ATTEMPTS times before the
+        scene is invalidated. The attempts are counted in tools.spawn_stats.
 
+        """
+        for _ in range(MAX_LAYOUT_ATTEMPTS):
+            # choose the train scenario to render
+            scenario = random.choice(2 * ['random', 'collision'] + ['walls'])
+
+            is_ok = self._spawn_layout(scenario)
+            spawn_stats.record_layout(scenario, is_ok)
+            if is_ok:
+                return
+            self._release_layout()
+
+        ue.log('failed to spawn the moving actors after {} layouts'.format(
+            MAX_LAYOUT_ATTEMPTS))
+        self._is_valid = False
+        self.invalid_reason = {
+            'cause': 'spawn', 'actor': 'layout', 'other': None}
+
+    def _spawn_layout(self, scenario):
+        """Spawns the moving actors of a `scenario`, False if one failed"""
+        self.scenario = scenario
         # generate the walls
         if scenario == 'walls' or random.uniform(0, 1) <= 0.3:
             params = self.generate_walls(scenario)
@@ -202,24 +249,57 @@ class Train(Scene):
         # generate the occluders
         noccluders = random.randint(0, 2)
         for n in range(noccluders):
-            is_ok = False
-            while is_ok is False:
-                params = self.generate_occluder()
-                is_ok = self.spawn(f'occluder_{n+1}', params)
+            if not self._spawn_until_ok(
+                    f'occluder_{n+1}', scenario, self.generate_occluder):
+                return False
 
         # generate the objects
         collision = self.generate_collision_point(scenario)
+        self.collision_point = collision
+        if scenario == 'random':
+            generate = self.generate_object_random
+        elif scenario == 'collision':
+            def generate():
+                return self.generate_object_collision(collision)
+        else:
+            def generate():
+                return self.generate_object_wall(collision)
+
         nobjects = self.generate_nobjects()
         for n in range(nobjects):
-            is_ok = False
-            while is_ok is False:
-                if scenario == 'random':
-                    params = self.generate_object_random()
-                elif scenario == 'collision':
-                    params = self.generate_object_collision(collision)
-                else:
-                    params = self.generate_object_wall(collision)
-                is_ok = self.spawn(f'object_{n+1}', params)
+            if not self._spawn_until_ok(f'object_{n+1}', scenario, generate):
+                return False
+        return True
+
+    def _spawn_until_ok(self, name, scenario, generate):
+        """Spawns the actor `name` with parameters from `generate()`
+
+        The parameters are resampled until the actor does not overlap another
+        one, at most MAX_SPAWN_ATTEMPTS times. Returns True if the actor has
+        been spawned, False otherwise.
+
+        """
+        kind = name.split('_')[0]
+        for attempt in range(1, MAX_SPAWN_ATTEMPTS + 1):
+            if self.spawn(name, generate()):
+                spawn_stats.record_actor(scenario, kind, attempt, True)
+                return True
+
+        spawn_stats.record_actor(scenario, kind, MAX_SPAWN_ATTEMPTS, False)
+        return False
+
+    def _release_layout(self):
+        """Releases the moving actors spawned so far and their parameters"""
+        actors = self.actors
+        self.actors = {}
+        self._clear_registries()
+
+        for name, actor in actors.items():
+            if name.lower().startswith(LAYOUT_ACTORS):
+                self.pool.release(actor)
+                del self.params[name]
+            else:
+                self.register_actor(name, actor)
 
     @staticmethod
     def generate_nobjects():
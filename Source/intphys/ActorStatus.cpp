@@ -0,0 +1,42 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+
+#include "ActorStatus.h"
+#include "Runtime/Engine/Classes/Components/StaticMeshComponent.h"
+
+
+bool UActorStatus::GetStatus(
+   const TArray<AActor*>& Actors,
+   TArray<float>& OutLocations,
+   TArray<float>& OutRotations,
+   TArray<float>& OutVelocities,
+   TArray<float>& OutMasses)
+{
+   OutLocations.Reset(3 * Actors.Num());
+   OutRotations.Reset(3 * Actors.Num());
+   OutVelocities.Reset(3 * Actors.Num());
+   OutMasses.Reset(Actors.Num());
+
+   for(const AActor* Actor : Actors)
+   {
+      if(Actor == nullptr)
+      {
+         UE_LOG(LogTemp, Error, TEXT("Cannot get the status of a null actor"));
+         return false;
+      }
+
+      const FVector Location = Actor->GetActorLocation();
+      OutLocations.Append({Location.X, Location.Y, Location.Z});
+
+      const FRotator Rotation = Actor->GetActorRotation();
+      OutRotations.Append({Rotation.Roll, Rotation.Pitch, Rotation.Yaw});
+
+      const FVector Velocity = Actor->GetVelocity();
+      OutVelocities.Append({Velocity.X, Velocity.Y, Velocity.Z});
+
+      const UStaticMeshComponent* Mesh = Actor->FindComponentByClass<UStaticMeshComponent>();
+      OutMasses.Add(Mesh ? Mesh->GetMass() : 0.0f);
+   }
+
+   return true;
+}
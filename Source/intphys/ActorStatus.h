@@ -0,0 +1,36 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+#pragma once
+
+#include "CoreMinimal.h"
+#include "Kismet/BlueprintFunctionLibrary.h"
+#include "ActorStatus.generated.h"
+
+/**
+ * Collects the status of several actors from Python code in a single call
+ */
+UCLASS()
+class INTPHYS_API UActorStatus : public UBlueprintFunctionLibrary
+{
+   GENERATED_BODY()
+
+public:
+   /**
+    * Returns the transform, velocity and mass of each actor in Actors
+    *
+    * The results are returned as flat arrays, the values of the i-th actor
+    * being OutLocations[3*i:3*i+3] as (x, y, z), OutRotations[3*i:3*i+3] as
+    * (roll, pitch, yaw), OutVelocities[3*i:3*i+3] as (x, y, z) and
+    * OutMasses[i]. The mass is the one of the actor's static mesh, 0 if it
+    * has no static mesh.
+    *
+    * @return false if an actor is null, true otherwise
+    */
+   UFUNCTION(BlueprintCallable, Category="IntPhys")
+   static bool GetStatus(
+      const TArray<AActor*>& Actors,
+      TArray<float>& OutLocations,
+      TArray<float>& OutRotations,
+      TArray<float>& OutVelocities,
+      TArray<float>& OutMasses);
+};
@@ -0,0 +1,50 @@
+#include "AsyncWriter.h"
+
+#include <exception>
+
+
+AsyncWriter::AsyncWriter()
+   : m_Pending()
+{}
+
+
+AsyncWriter::~AsyncWriter()
+{
+   Flush();
+}
+
+
+void AsyncWriter::Launch(TFunction<bool()> Task)
+{
+   // an exception thrown by the Task (a failed write in the PNG encoder) must
+   // not escape the pool thread, it is reported as a failure by Flush()
+   m_Pending.Add(Async<bool>(EAsyncExecution::ThreadPool, [Task = MoveTemp(Task)]()
+   {
+      try
+      {
+         return Task();
+      }
+      catch(const std::exception& Exception)
+      {
+         UE_LOG(LogTemp, Error, TEXT("Failed to write an image: %s"), UTF8_TO_TCHAR(Exception.what()));
+      }
+      catch(...)
+      {
+         UE_LOG(LogTemp, Error, TEXT("Failed to write an image"));
+      }
+      return false;
+   }));
+}
+
+
+bool AsyncWriter::Flush()
+{
+   bool bDone = true;
+   for(TFuture<bool>& Pending : m_Pending)
+   {
+      bDone = Pending.Get() and bDone;
+   }
+   m_Pending.Reset();
+
+   return bDone;
+}
@@ -0,0 +1,34 @@
+#pragma once
+
+#include "CoreMinimal.h"
+#include "Async/Async.h"
+
+
+/**
+ * Write captured images to disk from background threads
+ *
+ * For use in the SceneCapture, DepthCapture and MasksCapture classes. The
+ * writing tasks run on the engine thread pool so that the game thread can
+ * start to capture the next scene while the images of the previous one are
+ * encoded and written.
+ */
+class AsyncWriter
+{
+public:
+   AsyncWriter();
+
+   // Waits for the pending tasks to complete
+   ~AsyncWriter();
+
+   // Executes the Task in a background thread, the Task returns false on
+   // error. An exception thrown by the Task is caught and counts as an error.
+   void Launch(TFunction<bool()> Task);
+
+   // Waits for all the launched tasks to complete, returns false if at least
+   // one of them failed
+   bool Flush();
+
+private:
+   // The tasks launched since the last flush
+   TArray<TFuture<bool>> m_Pending;
+};
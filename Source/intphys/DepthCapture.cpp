@@ -7,30 +7,26 @@
 const float DepthCapture::MaxDepth = 6553.5;
 
 
-DepthCapture::DepthCapture(const FIntVector& Size)
-   : m_Size(Size)
+DepthCapture::DepthCapture(const FIntVector& Size, const PngWriter& Writer)
+   : m_Size(Size), m_NumImages(0), m_BackNumImages(0), m_PngWriter(Writer)
 {
-   m_Buffer.Init(png::image<png::gray_pixel_16>(m_Size.X, m_Size.Y), m_Size.Z);
+   m_Buffer.Init(0, m_Size.X * m_Size.Y * m_Size.Z);
+   m_BackBuffer.Init(0, m_Size.X * m_Size.Y * m_Size.Z);
 }
 
 
 DepthCapture::~DepthCapture()
-{}
+{
+   m_Writer.Flush();
+}
 
 
 void DepthCapture::Reset()
 {
-   // fill the images buffer with 0
-   for(uint32 z = 0; z < m_Size.Z; ++z)
-   {
-      for(uint32 y = 0; y < m_Size.Y; ++y)
-      {
-         for(uint32 x = 0; x < m_Size.X; ++x)
-         {
-            m_Buffer[z][y][x] = 0;
-         }
-      }
-   }
+   // fill the written images with 0, the others are still blank
+   FMemory::Memzero(
+      m_Buffer.GetData(), m_NumImages * m_Size.X * m_Size.Y * sizeof(uint16));
+   m_NumImages = 0;
 }
 
 
@@ -70,7 +66,8 @@ bool DepthCapture::Capture(
       Depth = MaxDepth;
    }
 
-   m_Buffer[ImageIndex][Y][X] = static_cast<png::gray_pixel_16>(65535 - 10 * Depth);
+   m_Buffer[(ImageIndex * m_Size.Y + Y) * m_Size.X + X] = static_cast<uint16>(65535 - 10 * Depth);
+   m_NumImages = FMath::Max(m_NumImages, ImageIndex + 1);
 
    return true;
 }
@@ -83,11 +80,36 @@ bool DepthCapture::Save(const FString& Directory)
       return false;
    }
 
+   // the back buffer is reused only once the previous scene is written
+   bool bDone = m_Writer.Flush();
+   Swap(m_Buffer, m_BackBuffer);
+   Swap(m_NumImages, m_BackNumImages);
+   Reset();
+
    for(uint32 z = 0; z < m_Size.Z; ++z)
    {
-      FString Filename = Utils::BuildFilename(Directory, "depth", z, m_Size.Z);
-      m_Buffer[z].write(TCHAR_TO_UTF8(*Filename));
+      const FString Filename = Utils::BuildFilename(
+         Directory, "depth", z, m_Size.Z, m_PngWriter.GetExtension());
+      const uint16* Image = m_BackBuffer.GetData() + z * m_Size.X * m_Size.Y;
+      const FIntVector Size = m_Size;
+      const PngWriter Writer = m_PngWriter;
+
+      m_Writer.Launch([Filename, Image, Size, Writer]()
+      {
+         return Writer.Write(
+            Filename, Size.X, Size.Y, PngPixel::Gray16,
+            [Image, Size](uint32 Row)
+            {
+               return reinterpret_cast<const uint8*>(Image + Row * Size.X);
+            });
+      });
    }
 
-   return true;
+   return bDone;
+}
+
+
+bool DepthCapture::Flush()
+{
+   return m_Writer.Flush();
 }
@@ -1,11 +1,8 @@
 #pragma once
 
 #include "CoreMinimal.h"
-
-THIRD_PARTY_INCLUDES_START
-#include "ThirdParty/libPNG/libPNG-1.5.27/png.h"
-#include <png++/png.hpp>
-THIRD_PARTY_INCLUDES_END
+#include "AsyncWriter.h"
+#include "PngWriter.h"
 
 
 /**
@@ -14,7 +11,7 @@ THIRD_PARTY_INCLUDES_END
 class DepthCapture
 {
 public:
-   DepthCapture(const FIntVector& Size);
+   DepthCapture(const FIntVector& Size, const PngWriter& Writer);
 
    ~DepthCapture();
 
@@ -26,6 +23,8 @@ public:
 
    bool Save(const FString& Directory);
 
+   bool Flush();
+
 private:
    // the maximal distance that can be encoded is (2^16 - 1) / 10 (in cm)
    static const float MaxDepth;
@@ -37,6 +36,20 @@ private:
    FVector m_OriginLocation;
    FVector m_OriginRotation;
 
-   // A buffer to store the captured depth field and save PNGs
-   TArray<png::image<png::gray_pixel_16>> m_Buffer;
+   // A buffer to store the captured depth fields, the images are stored
+   // contiguously as rows of 16 bits gray levels
+   TArray<uint16> m_Buffer;
+
+   // The number of images written in the buffer since the last reset
+   uint32 m_NumImages;
+
+   // The depth fields of the previous scene, being written to disk in background
+   TArray<uint16> m_BackBuffer;
+   uint32 m_BackNumImages;
+
+   // Encodes the depth fields to be written
+   PngWriter m_PngWriter;
+
+   // Writes the back buffer to disk
+   AsyncWriter m_Writer;
 };
@@ -2,35 +2,56 @@
 #include "Utils.h"
 
 
-MasksCapture::MasksCapture(const FIntVector& Size, const int32& Seed)
-   : m_Size(Size), m_Random(Seed)
+MasksCapture::MasksCapture(const FIntVector& Size, const int32& Seed, const PngWriter& Writer)
+   : m_Size(Size), m_LastActor(NAME_None), m_LastId(0), m_Random(Seed),
+     m_NumStatsImages(0), m_NumImages(0), m_BackNumImages(0), m_PngWriter(Writer)
 {
-   m_Buffer.Init(png::image<png::gray_pixel>(m_Size.X, m_Size.Y), m_Size.Z);
-   m_ActorsMap.Init(TBidirMap<FString, png::gray_pixel>(), m_Size.Z);
+   m_Buffer.Init(0, m_Size.X * m_Size.Y * m_Size.Z);
+   m_BackBuffer.Init(0, m_Size.X * m_Size.Y * m_Size.Z);
+   m_GrayLevels.Init(-1, 256 * m_Size.Z);
+   m_NumGrayLevels.Init(0, m_Size.Z);
+   m_Stats.AddZeroed(256 * m_Size.Z);
+
+   // start from the identity permutation, shuffled as gray levels are drawn
+   m_FreeGrayLevels.SetNumUninitialized(256 * m_Size.Z);
+   for(int32 i = 0; i < m_FreeGrayLevels.Num(); ++i)
+   {
+      m_FreeGrayLevels[i] = i % 256;
+   }
 }
 
 
 MasksCapture::~MasksCapture()
-{}
+{
+   m_Writer.Flush();
+}
 
 
 void MasksCapture::Reset(bool DeleteActors)
 {
-   // fill the images buffer with 0
-   for(uint32 z = 0; z < m_Size.Z; ++z)
+   // fill the written images with 0, the others are still blank
+   FMemory::Memzero(m_Buffer.GetData(), m_NumImages * m_Size.X * m_Size.Y);
+   FMemory::Memzero(m_Stats.GetData(), m_NumStatsImages * 256 * sizeof(ActorStats));
+   m_NumImages = 0;
+   m_NumStatsImages = 0;
+
+   if(DeleteActors)
    {
-      for(uint32 y = 0; y < m_Size.Y; ++y)
+      m_ActorIds.Empty();
+      m_NameIds.Empty();
+      m_ActorNames.Empty();
+      m_LastActor = NAME_None;
+
+      for(int32 i = 0; i < m_GrayLevels.Num(); ++i)
       {
-         for(uint32 x = 0; x < m_Size.X; ++x)
-         {
-            m_Buffer[z][y][x] = 0;
-         }
+         m_GrayLevels[i] = -1;
       }
-   }
 
-   if(DeleteActors)
-   {
-      m_ActorsMap.Init(TBidirMap<FString, png::gray_pixel>(), m_Size.Z);
+      // the permutations are kept as is, they are still permutations
+      for(int32 i = 0; i < m_NumGrayLevels.Num(); ++i)
+      {
+         m_NumGrayLevels[i] = 0;
+      }
    }
 }
 
@@ -54,92 +75,213 @@ FString MasksCapture::GetActorName(const AActor* Actor)
 }
 
 
+bool MasksCapture::GetNameId(const FString& Name, uint8& OutId)
+{
+   const uint8* Id = m_NameIds.Find(Name);
+   if(Id)
+   {
+      OutId = *Id;
+      return true;
+   }
+
+   if(m_ActorNames.Num() >= 256)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Too many actors: %d >= 256"), m_ActorNames.Num());
+      return false;
+   }
+
+   OutId = m_ActorNames.Add(Name);
+   m_NameIds.Add(Name, OutId);
+   return true;
+}
+
+
+bool MasksCapture::GetActorId(const AActor* Actor, uint8& OutId)
+{
+   const FName ActorName = Actor->GetFName();
+   if(ActorName == m_LastActor)
+   {
+      OutId = m_LastId;
+      return true;
+   }
+
+   const uint8* Id = m_ActorIds.Find(ActorName);
+   if(Id)
+   {
+      OutId = *Id;
+   }
+   else
+   {
+      // first time we see that actor, resolve its name once for all
+      if(not GetNameId(GetActorName(Actor), OutId))
+      {
+         return false;
+      }
+      m_ActorIds.Add(ActorName, OutId);
+   }
+
+   m_LastActor = ActorName;
+   m_LastId = OutId;
+   return true;
+}
+
+
 bool MasksCapture::Capture(
    const FHitResult& Hit, const uint32& FrameIndex, const uint32& X, const uint32& Y)
 {
-   return CaptureActor(GetActorName(Hit.GetActor()), FrameIndex, X, Y);
+   uint8 ActorId;
+   if(not GetActorId(Hit.GetActor(), ActorId))
+   {
+      return false;
+   }
+   return CaptureActor(ActorId, FrameIndex, X, Y);
 }
 
 
 bool MasksCapture::CaptureSky(const uint32& FrameIndex, const uint32& X, const uint32& Y)
 {
-   return CaptureActor(FString(TEXT("Sky")), FrameIndex, X, Y);
+   uint8 SkyId;
+   if(not GetNameId(FString(TEXT("Sky")), SkyId))
+   {
+      return false;
+   }
+   return CaptureActor(SkyId, FrameIndex, X, Y);
 }
 
 
 bool MasksCapture::CaptureActor(
-   const FString& Actor, const uint32& FrameIndex, const uint32& X, const uint32& Y)
+   const uint8& ActorId, const uint32& FrameIndex, const uint32& X, const uint32& Y)
 {
    // assign a gray level for this actor in that frame
-   TBidirMap<FString, png::gray_pixel>& FrameActorsMap = m_ActorsMap[FrameIndex];
-   png::gray_pixel GrayLevel;
+   int16& GrayLevel = m_GrayLevels[FrameIndex * 256 + ActorId];
 
-   if(FrameActorsMap.ContainsKey(Actor))
+   if(GrayLevel < 0)
    {
-      // the actor already has an indexed gray level, just pick it
-      GrayLevel = FrameActorsMap.GetValue(Actor);
-   }
-   else
-   {
-      // the actor is not yet registered for this frame, make sure we have room to
-      // store it and pick a random unique gray level
-      if(FrameActorsMap.Num() >= 256)
-      {
-         UE_LOG(LogTemp, Error, TEXT("Too many actors: %d >= 256"), m_ActorsMap.Num());
-         return false;
-      }
+      // the actor is not yet registered for this frame, pick a random unique
+      // gray level by drawing the next element of the frame's permutation
+      // (a step of Fisher-Yates shuffle)
+      uint16& NumGrayLevels = m_NumGrayLevels[FrameIndex];
+      uint8* FreeGrayLevels = m_FreeGrayLevels.GetData() + FrameIndex * 256;
 
-      // TODO very inefficient when the number of actors is large (but for
-      // intphys we have max 10 actors per frame)
-      GrayLevel = m_Random.RandRange(0, 255);
-      while(FrameActorsMap.ContainsValue(GrayLevel))
-      {
-         GrayLevel = m_Random.RandRange(0, 255);
-      }
-      FrameActorsMap.Add(Actor, GrayLevel);
+      const int32 Index = m_Random.RandRange(NumGrayLevels, 255);
+      Swap(FreeGrayLevels[NumGrayLevels], FreeGrayLevels[Index]);
+      GrayLevel = FreeGrayLevels[NumGrayLevels];
+      ++NumGrayLevels;
    }
 
    // finally fill the buffer with the right gray level
-   m_Buffer[FrameIndex][Y][X] = GrayLevel;
+   m_Buffer[(FrameIndex * m_Size.Y + Y) * m_Size.X + X] = GrayLevel;
+
+   // and update the actor's visibility statistics
+   ActorStats& Stats = m_Stats[FrameIndex * 256 + ActorId];
+   if(Stats.NumPixels == 0)
+   {
+      Stats.Min = FIntPoint(X, Y);
+      Stats.Max = FIntPoint(X, Y);
+   }
+   else
+   {
+      Stats.Min = Stats.Min.ComponentMin(FIntPoint(X, Y));
+      Stats.Max = Stats.Max.ComponentMax(FIntPoint(X, Y));
+   }
+   Stats.NumPixels++;
+   Stats.SumX += X;
+   Stats.SumY += Y;
+   m_NumImages = FMath::Max(m_NumImages, FrameIndex + 1);
+   m_NumStatsImages = FMath::Max(m_NumStatsImages, FrameIndex + 1);
 
    return true;
 }
 
 
-bool MasksCapture::Save(const FString& Directory, TArray<FString>& OutActorsMasks)
+bool MasksCapture::Save(
+   const FString& Directory,
+   TArray<int32>& OutFrames,
+   TArray<int32>& OutActorIds,
+   TArray<int32>& OutGrayLevels,
+   TArray<FString>& OutActorNames,
+   TArray<int32>& OutPixelCounts,
+   TArray<int32>& OutBoundingBoxes,
+   TArray<float>& OutCentroids)
 {
    if(not Utils::VerifyOrCreateDirectory(Directory))
    {
       return false;
    }
 
-   // clear the output masks array
-   OutActorsMasks.Empty();
+   // clear the output masks arrays
+   OutFrames.Reset();
+   OutActorIds.Reset();
+   OutGrayLevels.Reset();
+   OutActorNames = m_ActorNames;
+   OutPixelCounts.Reset();
+   OutBoundingBoxes.Reset();
+   OutCentroids.Reset();
+
+   // the back buffer is reused only once the previous scene is written
+   bool bDone = m_Writer.Flush();
+   Swap(m_Buffer, m_BackBuffer);
+   Swap(m_NumImages, m_BackNumImages);
 
    for(uint32 z = 0; z < m_Size.Z; ++z)
    {
-      // write the PNG image
-      FString Filename = Utils::BuildFilename(Directory, "masks", z, m_Size.Z);
-      m_Buffer[z].write(TCHAR_TO_UTF8(*Filename));
+      // write the PNG image in background
+      const FString Filename = Utils::BuildFilename(
+         Directory, "masks", z, m_Size.Z, m_PngWriter.GetExtension());
+      const uint8* Image = m_BackBuffer.GetData() + z * m_Size.X * m_Size.Y;
+      const FIntVector Size = m_Size;
+      const PngWriter Writer = m_PngWriter;
+      m_Writer.Launch([Filename, Image, Size, Writer]()
+      {
+         return Writer.Write(
+            Filename, Size.X, Size.Y, PngPixel::Gray8,
+            [Image, Size](uint32 Row)
+            {
+               return Image + Row * Size.X;
+            });
+      });
 
       // append the actors masks for that frame
-      TArray<FString> Masks;
-      for(auto It = m_ActorsMap[z].CreateConstIterator(); It; ++It)
+      for(int32 Id = 0; Id < m_ActorNames.Num(); ++Id)
       {
-         Masks.Add(
-            FString::FromInt(z + 1) + FString(TEXT("__"))
-            + It.Key() + FString(TEXT("__"))
-            + FString::FromInt(It.Value()));
+         const int16 GrayLevel = m_GrayLevels[z * 256 + Id];
+         if(GrayLevel >= 0)
+         {
+            OutFrames.Add(z);
+            OutActorIds.Add(Id);
+            OutGrayLevels.Add(GrayLevel);
+
+            // the statistics are meaningless when the actor is not visible
+            const ActorStats& Stats = m_Stats[z * 256 + Id];
+            const float NumPixels = FMath::Max(Stats.NumPixels, 1u);
+            OutPixelCounts.Add(Stats.NumPixels);
+            OutBoundingBoxes.Append({Stats.Min.X, Stats.Min.Y, Stats.Max.X, Stats.Max.Y});
+            OutCentroids.Append({Stats.SumX / NumPixels, Stats.SumY / NumPixels});
+         }
       }
-      Masks.Sort();
-      OutActorsMasks.Append(Masks);
    }
 
-   return true;
+   // clear the buffer for the next scene, keeping the actors index
+   Reset(false);
+
+   return bDone;
+}
+
+
+bool MasksCapture::Flush()
+{
+   return m_Writer.Flush();
 }
 
 
 bool MasksCapture::IsActorInFrame(const AActor* Actor, const uint32& FrameIndex) const
 {
-   return m_ActorsMap[FrameIndex].ContainsKey(GetActorName(Actor));
+   const uint8* Id = m_ActorIds.Find(Actor->GetFName());
+   if(not Id)
+   {
+      // the actor may share its name with others (as the walls do)
+      Id = m_NameIds.Find(GetActorName(Actor));
+   }
+
+   return Id and m_GrayLevels[FrameIndex * 256 + *Id] >= 0;
 }
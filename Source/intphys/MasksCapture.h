@@ -1,12 +1,8 @@
 #pragma once
 
 #include "CoreMinimal.h"
-#include "BidirMap.h"
-
-THIRD_PARTY_INCLUDES_START
-#include "ThirdParty/libPNG/libPNG-1.5.27/png.h"
-#include <png++/png.hpp>
-THIRD_PARTY_INCLUDES_END
+#include "AsyncWriter.h"
+#include "PngWriter.h"
 
 
 /**
@@ -15,7 +11,7 @@ THIRD_PARTY_INCLUDES_END
 class MasksCapture
 {
 public:
-   MasksCapture(const FIntVector& Size, const int32& Seed);
+   MasksCapture(const FIntVector& Size, const int32& Seed, const PngWriter& Writer);
 
    ~MasksCapture();
 
@@ -25,7 +21,17 @@ public:
 
    bool CaptureSky(const uint32& FrameIndex, const uint32& X, const uint32& Y);
 
-   bool Save(const FString& Directory, TArray<FString>& OutActorsMasks);
+   bool Save(
+      const FString& Directory,
+      TArray<int32>& OutFrames,
+      TArray<int32>& OutActorIds,
+      TArray<int32>& OutGrayLevels,
+      TArray<FString>& OutActorNames,
+      TArray<int32>& OutPixelCounts,
+      TArray<int32>& OutBoundingBoxes,
+      TArray<float>& OutCentroids);
+
+   bool Flush();
 
    bool IsActorInFrame(const AActor* Actor, const uint32& FrameIndex) const;
 
@@ -33,22 +39,78 @@ private:
    // A triplet (width, height, nimages) of captured images
    FIntVector m_Size;
 
-   // Actors present in each frame, mapped to their gray level
-   TArray<TBidirMap<FString, png::gray_pixel>> m_ActorsMap;
+   // Actors of the scene mapped to a small integer id, the names being
+   // resolved only once per actor
+   TMap<FName, uint8> m_ActorIds;
+
+   // Normalized actor names mapped to their id, and the reverse table
+   TMap<FString, uint8> m_NameIds;
+   TArray<FString> m_ActorNames;
+
+   // The last captured actor, consecutive pixels often hit the same one
+   FName m_LastActor;
+   uint8 m_LastId;
+
+   // The gray level of each actor id in each frame (indexed by frame * 256 +
+   // id), -1 when the actor is not in the frame
+   TArray<int16> m_GrayLevels;
+
+   // For each frame, a permutation of the 256 gray levels in which the first
+   // m_NumGrayLevels[frame] are already allocated
+   TArray<uint8> m_FreeGrayLevels;
+   TArray<uint16> m_NumGrayLevels;
+
+   // Visibility statistics of an actor in a frame, accumulated during capture
+   struct ActorStats
+   {
+      // number of pixels covered by the actor
+      uint32 NumPixels;
+
+      // the 2D bounding box of those pixels (inclusive)
+      FIntPoint Min;
+      FIntPoint Max;
+
+      // sums of the pixels coordinates, to compute the centroid
+      uint64 SumX;
+      uint64 SumY;
+   };
+
+   // The statistics of each actor id in each frame (indexed by frame * 256 +
+   // id), reset with the captured images. They are not double buffered, so
+   // they have their own number of written frames.
+   TArray<ActorStats> m_Stats;
+   uint32 m_NumStatsImages;
 
    // A random number generator
    FRandomStream m_Random;
 
-   // A buffer to store object masks and save PNGs
-   TArray<png::image<png::gray_pixel>> m_Buffer;
+   // A buffer to store object masks, the images are stored contiguously as
+   // rows of 8 bits gray levels
+   TArray<uint8> m_Buffer;
+
+   // The number of images written in the buffer since the last reset
+   uint32 m_NumImages;
+
+   // The masks of the previous scene, being written to disk in background
+   TArray<uint8> m_BackBuffer;
+   uint32 m_BackNumImages;
+
+   // Encodes the masks to be written
+   PngWriter m_PngWriter;
+
+   // Writes the back buffer to disk
+   AsyncWriter m_Writer;
 
    // returns the normalized name of the actor
    static FString GetActorName(const AActor* Actor);
 
-   // Returns the index of an actor in the actors map (add the actor if not
-   // already indexed)
-   uint8 GetActorIndex(const FString& Actor);
+   // Returns the id of an actor name (add the name if not already indexed),
+   // returns false if there is too much actors in the scene
+   bool GetNameId(const FString& Name, uint8& OutId);
+
+   // Returns the id of an actor (add the actor if not already indexed)
+   bool GetActorId(const AActor* Actor, uint8& OutId);
 
    bool CaptureActor(
-      const FString& Actor, const uint32& FrameIndex, const uint32& X, const uint32& Y);
+      const uint8& ActorId, const uint32& FrameIndex, const uint32& X, const uint32& Y);
 };
@@ -0,0 +1,81 @@
+#include "MasksCapture.h"
+#include "HAL/FileManager.h"
+#include "Misc/AutomationTest.h"
+#include "Misc/Paths.h"
+
+#if WITH_DEV_AUTOMATION_TESTS
+
+
+// The masks of a scene as returned by MasksCapture::Save
+struct SavedMasks
+{
+   TArray<int32> Frames;
+   TArray<int32> ActorIds;
+   TArray<int32> GrayLevels;
+   TArray<FString> ActorNames;
+   TArray<int32> PixelCounts;
+   TArray<int32> BoundingBoxes;
+   TArray<float> Centroids;
+
+   bool operator==(const SavedMasks& Other) const
+   {
+      return Frames == Other.Frames and ActorIds == Other.ActorIds
+         and GrayLevels == Other.GrayLevels and ActorNames == Other.ActorNames
+         and PixelCounts == Other.PixelCounts and BoundingBoxes == Other.BoundingBoxes
+         and Centroids == Other.Centroids;
+   }
+};
+
+
+// Captures the same sky pixels in each scene and returns the saved masks
+static bool CaptureScene(MasksCapture& Capture, const FString& Directory, SavedMasks& Out)
+{
+   for(uint32 z = 0; z < 2; ++z)
+   {
+      // the sky covers the top rows, more of them in the second frame
+      for(uint32 y = 0; y < 2 + z; ++y)
+      {
+         for(uint32 x = 0; x < 4; ++x)
+         {
+            if(not Capture.CaptureSky(z, x, y))
+            {
+               return false;
+            }
+         }
+      }
+   }
+
+   return Capture.Save(
+      Directory, Out.Frames, Out.ActorIds, Out.GrayLevels, Out.ActorNames,
+      Out.PixelCounts, Out.BoundingBoxes, Out.Centroids);
+}
+
+
+IMPLEMENT_SIMPLE_AUTOMATION_TEST(
+   FMasksCaptureStatsTest, "intphys.MasksCapture.Stats",
+   EAutomationTestFlags::ApplicationContextMask | EAutomationTestFlags::EngineFilter)
+
+
+// Two scenes in a row with the same input must give the same statistics,
+// they are reset between scenes even if the masks images are double buffered
+bool FMasksCaptureStatsTest::RunTest(const FString& Parameters)
+{
+   const FString Directory = FPaths::Combine(
+      FPaths::ProjectSavedDir(), TEXT("Automation"), TEXT("MasksCapture"));
+   MasksCapture Capture(FIntVector(4, 4, 2), 0, PngWriter(-1, TEXT("default"), true));
+
+   SavedMasks First, Second, Third;
+   TestTrue(TEXT("capture the first scene"), CaptureScene(Capture, Directory / TEXT("1"), First));
+   TestTrue(TEXT("capture the second scene"), CaptureScene(Capture, Directory / TEXT("2"), Second));
+   TestTrue(TEXT("capture the third scene"), CaptureScene(Capture, Directory / TEXT("3"), Third));
+   TestTrue(TEXT("flush the masks"), Capture.Flush());
+
+   TestTrue(TEXT("pixels counts of the first scene"), First.PixelCounts == TArray<int32>({8, 12}));
+   TestTrue(TEXT("same masks in the first and second scenes"), First == Second);
+   TestTrue(TEXT("same masks in the second and third scenes"), Second == Third);
+
+   IFileManager::Get().DeleteDirectory(*Directory, false, true);
+   return true;
+}
+
+#endif // WITH_DEV_AUTOMATION_TESTS
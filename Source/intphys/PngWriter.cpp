@@ -0,0 +1,201 @@
+#include "PngWriter.h"
+
+#include <cstdio>
+
+
+PngWriter::PngWriter(const int32& CompressionLevel, const FString& Filter, bool bRaw)
+   : m_CompressionLevel(CompressionLevel), m_Filter(ParseFilter(Filter)), m_bRaw(bRaw)
+{}
+
+
+PngWriter::~PngWriter()
+{}
+
+
+int32 PngWriter::ParseFilter(const FString& Filter)
+{
+   if(Filter == TEXT("default"))
+   {
+      return -1;
+   }
+   else if(Filter == TEXT("none"))
+   {
+      return PNG_FILTER_NONE;
+   }
+   else if(Filter == TEXT("sub"))
+   {
+      return PNG_FILTER_SUB;
+   }
+   else if(Filter == TEXT("up"))
+   {
+      return PNG_FILTER_UP;
+   }
+   else if(Filter == TEXT("avg"))
+   {
+      return PNG_FILTER_AVG;
+   }
+   else if(Filter == TEXT("paeth"))
+   {
+      return PNG_FILTER_PAETH;
+   }
+   else if(Filter == TEXT("all"))
+   {
+      return PNG_ALL_FILTERS;
+   }
+
+   UE_LOG(LogTemp, Error, TEXT("Unknown PNG filter %s"), *Filter);
+   return 0;
+}
+
+
+uint32 PngWriter::PixelSize(const PngPixel& Format)
+{
+   switch(Format)
+   {
+      case PngPixel::Bgra8:
+         return 4;
+      case PngPixel::Rgb8:
+         return 3;
+      case PngPixel::Gray16:
+         return 2;
+      default:
+         return 1;
+   }
+}
+
+
+bool PngWriter::IsValid() const
+{
+   return m_Filter != 0 and m_CompressionLevel >= -1 and m_CompressionLevel <= 9;
+}
+
+
+FString PngWriter::GetExtension() const
+{
+   return m_bRaw ? FString(TEXT("raw")) : FString(TEXT("png"));
+}
+
+
+bool PngWriter::Write(
+   const FString& Filename,
+   const uint32& Width, const uint32& Height,
+   const PngPixel& Format,
+   const TFunction<const uint8*(uint32)>& GetRow) const
+{
+   if(m_bRaw)
+   {
+      return WriteRaw(Filename, Width, Height, Format, GetRow);
+   }
+   return WritePng(Filename, Width, Height, Format, GetRow);
+}
+
+
+bool PngWriter::WriteRaw(
+   const FString& Filename,
+   const uint32& Width, const uint32& Height,
+   const PngPixel& Format,
+   const TFunction<const uint8*(uint32)>& GetRow) const
+{
+   FILE* File = fopen(TCHAR_TO_UTF8(*Filename), "wb");
+   if(File == nullptr)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Cannot open %s"), *Filename);
+      return false;
+   }
+
+   const uint32 RowSize = Width * PixelSize(Format);
+   bool bDone = true;
+   for(uint32 y = 0; y < Height and bDone; ++y)
+   {
+      bDone = fwrite(GetRow(y), 1, RowSize, File) == RowSize;
+   }
+
+   bDone = (fclose(File) == 0) and bDone;
+   if(not bDone)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Failed to write %s"), *Filename);
+   }
+   return bDone;
+}
+
+
+bool PngWriter::WritePng(
+   const FString& Filename,
+   const uint32& Width, const uint32& Height,
+   const PngPixel& Format,
+   const TFunction<const uint8*(uint32)>& GetRow) const
+{
+   FILE* File = fopen(TCHAR_TO_UTF8(*Filename), "wb");
+   if(File == nullptr)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Cannot open %s"), *Filename);
+      return false;
+   }
+
+   png_structp Png = png_create_write_struct(PNG_LIBPNG_VER_STRING, nullptr, nullptr, nullptr);
+   png_infop Info = (Png == nullptr) ? nullptr : png_create_info_struct(Png);
+   if(Info == nullptr)
+   {
+      png_destroy_write_struct(&Png, nullptr);
+      fclose(File);
+      UE_LOG(LogTemp, Error, TEXT("Cannot initialize libpng for %s"), *Filename);
+      return false;
+   }
+
+   // libpng jumps back here on error
+   if(setjmp(png_jmpbuf(Png)))
+   {
+      png_destroy_write_struct(&Png, &Info);
+      fclose(File);
+      UE_LOG(LogTemp, Error, TEXT("Failed to write %s"), *Filename);
+      return false;
+   }
+
+   png_init_io(Png, File);
+   const bool bColor = Format == PngPixel::Rgb8 or Format == PngPixel::Bgra8;
+   png_set_IHDR(
+      Png, Info, Width, Height,
+      Format == PngPixel::Gray16 ? 16 : 8,
+      bColor ? PNG_COLOR_TYPE_RGB : PNG_COLOR_TYPE_GRAY,
+      PNG_INTERLACE_NONE, PNG_COMPRESSION_TYPE_DEFAULT, PNG_FILTER_TYPE_DEFAULT);
+
+   if(m_CompressionLevel >= 0)
+   {
+      png_set_compression_level(Png, m_CompressionLevel);
+   }
+
+   if(m_Filter >= 0)
+   {
+      png_set_filter(Png, PNG_FILTER_TYPE_BASE, m_Filter);
+   }
+
+   png_write_info(Png, Info);
+
+   // PNG stores 16 bits samples in big endian
+   if(Format == PngPixel::Gray16 and PLATFORM_LITTLE_ENDIAN)
+   {
+      png_set_swap(Png);
+   }
+
+   // let libpng reorder BGRA rows to RGB while writing them
+   if(Format == PngPixel::Bgra8)
+   {
+      png_set_bgr(Png);
+      png_set_filler(Png, 0, PNG_FILLER_AFTER);
+   }
+
+   for(uint32 y = 0; y < Height; ++y)
+   {
+      png_write_row(Png, const_cast<png_bytep>(GetRow(y)));
+   }
+
+   png_write_end(Png, nullptr);
+   png_destroy_write_struct(&Png, &Info);
+
+   if(fclose(File) != 0)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Failed to write %s"), *Filename);
+      return false;
+   }
+   return true;
+}
@@ -0,0 +1,117 @@
+#pragma once
+
+#include "CoreMinimal.h"
+
+THIRD_PARTY_INCLUDES_START
+#include "ThirdParty/libPNG/libPNG-1.5.27/png.h"
+THIRD_PARTY_INCLUDES_END
+
+
+/**
+ * The pixel formats handled by PngWriter
+ */
+enum class PngPixel
+{
+   // 8 bits RGB color
+   Rgb8,
+
+   // 8 bits gray level
+   Gray8,
+
+   // 16 bits gray level, in native byte order
+   Gray16,
+
+   // 8 bits BGRA color as stored in FColor, written as RGB (the alpha
+   // channel is stripped)
+   Bgra8
+};
+
+
+/**
+ * Write images as PNG files with configurable compression
+ *
+ * The zlib compression level and the PNG filters are set at construction,
+ * allowing a fast encoding during data generation or a maximal compression
+ * for release. In raw mode the pixels are dumped uncompressed, as stored in
+ * memory, in a ".raw" file with no header.
+ */
+class PngWriter
+{
+public:
+   /**
+    * @param CompressionLevel
+    *     The zlib compression level, from 0 (no compression) to 9 (maximal
+    *     compression). Use -1 for the zlib default.
+    *
+    * @param Filter
+    *     The PNG filter to apply on rows before compression, must be "none",
+    *     "sub", "up", "avg", "paeth", "all" (adaptive choice among all the
+    *     filters) or "default" (let libpng choose).
+    *
+    * @param bRaw
+    *     When true, ignore the compression settings and write raw pixels.
+    */
+   PngWriter(
+      const int32& CompressionLevel = -1,
+      const FString& Filter = FString(TEXT("default")),
+      bool bRaw = false);
+
+   ~PngWriter();
+
+   // Returns true if the compression level and filter are valid
+   bool IsValid() const;
+
+   // Returns the extension of written files, "png" or "raw"
+   FString GetExtension() const;
+
+   /**
+    * Writes an image to disk
+    *
+    * @param Filename
+    *     The file to write, its extension must be GetExtension()
+    *
+    * @param Width, Height
+    *     The size of the image in pixels
+    *
+    * @param Format
+    *     The format of the pixels
+    *
+    * @param GetRow
+    *     Returns a pointer to the pixels of the row of the given index
+    *
+    * @return True on success, false otherwise
+    */
+   bool Write(
+      const FString& Filename,
+      const uint32& Width, const uint32& Height,
+      const PngPixel& Format,
+      const TFunction<const uint8*(uint32)>& GetRow) const;
+
+private:
+   // The zlib compression level in [0, 9] or -1 for default
+   int32 m_CompressionLevel;
+
+   // The PNG filters as a libpng flag, or -1 for default
+   int32 m_Filter;
+
+   // When true write raw pixels instead of PNG
+   bool m_bRaw;
+
+   // Returns the libpng flag corresponding to a filter name, 0 if unknown
+   static int32 ParseFilter(const FString& Filter);
+
+   // Returns the size of a pixel in bytes
+   static uint32 PixelSize(const PngPixel& Format);
+
+   bool WritePng(
+      const FString& Filename,
+      const uint32& Width, const uint32& Height,
+      const PngPixel& Format,
+      const TFunction<const uint8*(uint32)>& GetRow) const;
+
+   bool WriteRaw(
+      const FString& Filename,
+      const uint32& Width, const uint32& Height,
+      const PngPixel& Format,
+      const TFunction<const uint8*(uint32)>& GetRow) const;
+};
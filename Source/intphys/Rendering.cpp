@@ -0,0 +1,20 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+
+#include "Rendering.h"
+#include "Engine/GameViewportClient.h"
+#include "Engine/World.h"
+
+
+bool URendering::SetWorldRendering(UWorld* World, bool bEnabled)
+{
+   UGameViewportClient* Viewport = World ? World->GetGameViewport() : nullptr;
+   if(not Viewport)
+   {
+      UE_LOG(LogTemp, Warning, TEXT("Cannot set world rendering: no game viewport"));
+      return false;
+   }
+
+   Viewport->bDisableWorldRendering = not bEnabled;
+   return true;
+}
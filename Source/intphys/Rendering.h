@@ -0,0 +1,25 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+#pragma once
+
+#include "CoreMinimal.h"
+#include "Kismet/BlueprintFunctionLibrary.h"
+#include "Rendering.generated.h"
+
+/**
+ * Controls the rendering of the game viewport from Python code
+ */
+UCLASS()
+class INTPHYS_API URendering : public UBlueprintFunctionLibrary
+{
+   GENERATED_BODY()
+
+public:
+   /**
+    * Enables or disables the rendering of the world in the game viewport.
+    * When disabled, the game still ticks (and simulates the physics) but the
+    * scene is not drawn. Returns false if the world has no game viewport.
+    */
+   UFUNCTION(BlueprintCallable, Category="IntPhys")
+   static bool SetWorldRendering(UWorld* World, bool bEnabled);
+};
@@ -2,24 +2,27 @@
 #include "Utils.h"
 
 
-SceneCapture::SceneCapture(const FIntVector& Size)
-   : m_Size(Size), m_Buffer(), m_Png(Size.X, Size.Y)
+SceneCapture::SceneCapture(const FIntVector& Size, const PngWriter& Writer)
+   : m_Size(Size), m_Buffer(), m_Captured(false, Size.Z), m_BackBuffer(),
+     m_BackCaptured(false, Size.Z), m_BlackImage(), m_PngWriter(Writer), m_Writer()
 {
    m_Buffer.SetNum(m_Size.Z);
-   Reset();
+   m_BackBuffer.SetNum(m_Size.Z);
+   m_BlackImage.Init(FColor::Black, m_Size.X * m_Size.Y);
 }
 
 
 SceneCapture::~SceneCapture()
-{}
+{
+   m_Writer.Flush();
+}
 
 
 void SceneCapture::Reset()
 {
-   for(TArray<FColor>& Image : m_Buffer)
-   {
-      Image.Init(FColor(), m_Size.X * m_Size.Y);
-   }
+   // the captured images are overwritten by the next captures, the skipped
+   // ones are saved as black images
+   m_Captured.Init(false, m_Size.Z);
 }
 
 
@@ -34,6 +37,15 @@ bool SceneCapture::Capture(const uint32& Index)
          WindowPtr.ToSharedRef(), m_Buffer[Index], OutSize);
    }
 
+   if(bDone and m_Buffer[Index].Num() < m_Size.X * m_Size.Y)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Scene capture failed: screenshot smaller than expected"));
+      bDone = false;
+   }
+
+   // a failed capture may have overwritten the image of that frame
+   m_Captured[Index] = bDone;
+
    return bDone;
 }
 
@@ -45,26 +57,37 @@ bool SceneCapture::Save(const FString& Directory)
       return false;
    }
 
+   // the back buffer is reused only once the previous scene is written
+   bool bDone = m_Writer.Flush();
+   Swap(m_Buffer, m_BackBuffer);
+   Swap(m_Captured, m_BackCaptured);
+   Reset();
+
    for (uint32 z = 0; z < m_Size.Z; ++z)
    {
-      FString Filename = Utils::BuildFilename(Directory, "scene", z, m_Size.Z);
-
-      const TArray<FColor>& Image = m_Buffer[z];
-
-      uint32 Index = 0;
-      for(uint32 j = 0; j < m_Size.Y; ++j)
+      const FString Filename = Utils::BuildFilename(
+         Directory, "scene", z, m_Size.Z, m_PngWriter.GetExtension());
+      const TArray<FColor>* Image = m_BackCaptured[z] ? &m_BackBuffer[z] : &m_BlackImage;
+      const FIntVector Size = m_Size;
+      const PngWriter Writer = m_PngWriter;
+
+      // the rows are streamed to libpng directly from the FColor buffer
+      m_Writer.Launch([Filename, Image, Size, Writer]()
       {
-         for(uint32 i = 0; i < m_Size.X; ++i)
-         {
-            const FColor& Pixel = Image[Index];
-            m_Png[j][i] = png::rgb_pixel(Pixel.R, Pixel.G, Pixel.B);
-            ++Index;
-         }
-      }
-
-      // write the image
-      m_Png.write(TCHAR_TO_UTF8(*Filename));
+         return Writer.Write(
+            Filename, Size.X, Size.Y, PngPixel::Bgra8,
+            [Image, Size](uint32 Row)
+            {
+               return reinterpret_cast<const uint8*>(Image->GetData() + Row * Size.X);
+            });
+      });
    }
 
-   return true;
+   return bDone;
+}
+
+
+bool SceneCapture::Flush()
+{
+   return m_Writer.Flush();
 }
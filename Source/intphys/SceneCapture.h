@@ -1,11 +1,8 @@
 #pragma once
 
 #include "CoreMinimal.h"
-
-THIRD_PARTY_INCLUDES_START
-#include "ThirdParty/libPNG/libPNG-1.5.27/png.h"
-#include <png++/png.hpp>
-THIRD_PARTY_INCLUDES_END
+#include "AsyncWriter.h"
+#include "PngWriter.h"
 
 
 /**
@@ -14,7 +11,7 @@ THIRD_PARTY_INCLUDES_END
 class SceneCapture
 {
 public:
-   SceneCapture(const FIntVector& Size);
+   SceneCapture(const FIntVector& Size, const PngWriter& Writer);
 
    ~SceneCapture();
 
@@ -22,6 +19,8 @@ public:
 
    bool Save(const FString& Directory);
 
+   bool Flush();
+
    void Reset();
 
 private:
@@ -31,6 +30,20 @@ private:
    // A buffer to store captured images
    TArray<TArray<FColor>> m_Buffer;
 
-   // A buffer to build a RGB PNG image for saving
-   png::image<png::rgb_pixel> m_Png;
+   // Whether each image of the buffer has been captured since the last
+   // reset, the other ones are saved as black images
+   TBitArray<> m_Captured;
+
+   // The images of the previous scene, being written to disk in background
+   TArray<TArray<FColor>> m_BackBuffer;
+   TBitArray<> m_BackCaptured;
+
+   // A black image, saved in place of the images not captured
+   TArray<FColor> m_BlackImage;
+
+   // Encodes the images to be written
+   PngWriter m_PngWriter;
+
+   // Writes the back buffer to disk
+   AsyncWriter m_Writer;
 };
@@ -4,9 +4,14 @@
 
 
 FScreenshot::FScreenshot(
-   const FIntVector& Size, AActor* OriginActor, const int32& RandomSeed, bool Verbose)
+   const FIntVector& Size, AActor* OriginActor, const int32& RandomSeed,
+   const PngWriter& SceneWriter, const PngWriter& DepthWriter,
+   const PngWriter& MasksWriter, bool Verbose)
    : m_Size(Size), m_OriginActor(OriginActor), m_Verbose(Verbose),
-     m_FrameIndex(0), m_Scene(Size), m_Depth(Size), m_Masks(Size, RandomSeed)
+     m_FrameIndex(0),
+     m_Scene(Size, SceneWriter),
+     m_Depth(Size, DepthWriter),
+     m_Masks(Size, RandomSeed, MasksWriter)
 {}
 
 
@@ -50,11 +55,22 @@ bool FScreenshot::Capture(const TArray<AActor*>& IgnoredActors)
 }
 
 
-bool FScreenshot::Save(const FString& Directory, TArray<FString>& OutActorsMasks)
+bool FScreenshot::Save(
+   const FString& Directory,
+   TArray<int32>& OutFrames,
+   TArray<int32>& OutActorIds,
+   TArray<int32>& OutGrayLevels,
+   TArray<FString>& OutActorNames,
+   TArray<int32>& OutPixelCounts,
+   TArray<int32>& OutBoundingBoxes,
+   TArray<float>& OutCentroids)
 {
    bool bScene = m_Scene.Save(FPaths::Combine(Directory, FString("scene")));
    bool bDepth = m_Depth.Save(FPaths::Combine(Directory, FString("depth")));
-   bool bMasks = m_Masks.Save(FPaths::Combine(Directory, FString("masks")), OutActorsMasks);
+   bool bMasks = m_Masks.Save(
+      FPaths::Combine(Directory, FString("masks")),
+      OutFrames, OutActorIds, OutGrayLevels, OutActorNames,
+      OutPixelCounts, OutBoundingBoxes, OutCentroids);
 
    bool bDone = bScene and bDepth and bMasks;
    if(not bDone)
@@ -65,6 +81,21 @@ bool FScreenshot::Save(const FString& Directory, TArray<FString>& OutActorsMasks
 }
 
 
+bool FScreenshot::Flush()
+{
+   bool bScene = m_Scene.Flush();
+   bool bDepth = m_Depth.Flush();
+   bool bMasks = m_Masks.Flush();
+
+   bool bDone = bScene and bDepth and bMasks;
+   if(not bDone)
+   {
+      UE_LOG(LogTemp, Error, TEXT("Failed to write captured images"));
+   }
+   return bDone;
+}
+
+
 bool FScreenshot::IsActorInFrame(const AActor* Actor, const uint32& FrameIndex)
 {
    if(FrameIndex >= m_FrameIndex)
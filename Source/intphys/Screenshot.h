@@ -18,7 +18,8 @@ class FScreenshot
 public:
    FScreenshot(
       const FIntVector& Size, AActor* OriginActor, const int32& RandomSeed,
-      bool Verbose = false);
+      const PngWriter& SceneWriter, const PngWriter& DepthWriter,
+      const PngWriter& MasksWriter, bool Verbose = false);
 
    ~FScreenshot();
 
@@ -26,7 +27,17 @@ public:
 
    bool Capture(const TArray<AActor*>& IgnoredActors);
 
-   bool Save(const FString& Directory, TArray<FString>& OutActorsMasks);
+   bool Save(
+      const FString& Directory,
+      TArray<int32>& OutFrames,
+      TArray<int32>& OutActorIds,
+      TArray<int32>& OutGrayLevels,
+      TArray<FString>& OutActorNames,
+      TArray<int32>& OutPixelCounts,
+      TArray<int32>& OutBoundingBoxes,
+      TArray<float>& OutCentroids);
+
+   bool Flush();
 
    void Reset(bool DeleteActors);
 
@@ -8,11 +8,39 @@ bool UScreenshotManager::Initialize(
     int Width, int Height, int NumFrames,
     AActor* OriginActor,
     int32 RandomSeed,
+    const TArray<int32>& CompressionLevels,
+    const TArray<FString>& Filters,
+    bool RawDump,
     bool Verbose)
 {
+   if((CompressionLevels.Num() != 0 and CompressionLevels.Num() != 3) or
+      (Filters.Num() != 0 and Filters.Num() != 3))
+   {
+      UE_LOG(LogTemp, Error, TEXT("Compression settings must be given for scene, depth and masks"));
+      return false;
+   }
+
+   // one writer per captured stream: scene, depth and masks
+   TArray<PngWriter> Writers;
+   for(int32 i = 0; i < 3; ++i)
+   {
+      Writers.Emplace(
+         CompressionLevels.Num() ? CompressionLevels[i] : -1,
+         Filters.Num() ? Filters[i] : FString(TEXT("default")),
+         RawDump);
+
+      if(not Writers.Last().IsValid())
+      {
+         UE_LOG(LogTemp, Error, TEXT("Invalid PNG compression settings"));
+         return false;
+      }
+   }
+
    FIntVector Size(Width, Height, NumFrames);
    Screenshot = TSharedPtr<FScreenshot>(
-      new FScreenshot(Size, OriginActor, RandomSeed, Verbose));
+      new FScreenshot(
+         Size, OriginActor, RandomSeed,
+         Writers[0], Writers[1], Writers[2], Verbose));
    return true;
 }
 
@@ -22,9 +50,25 @@ bool UScreenshotManager::Capture(const TArray<AActor*>& IgnoredActors)
     return Screenshot->Capture(IgnoredActors);
 }
 
-bool UScreenshotManager::Save(const FString& Directory, TArray<FString>& OutActorsMasks)
+bool UScreenshotManager::Save(
+    const FString& Directory,
+    TArray<int32>& OutFrames,
+    TArray<int32>& OutActorIds,
+    TArray<int32>& OutGrayLevels,
+    TArray<FString>& OutActorNames,
+    TArray<int32>& OutPixelCounts,
+    TArray<int32>& OutBoundingBoxes,
+    TArray<float>& OutCentroids)
+{
+    return Screenshot->Save(
+        Directory, OutFrames, OutActorIds, OutGrayLevels, OutActorNames,
+        OutPixelCounts, OutBoundingBoxes, OutCentroids);
+}
+
+
+bool UScreenshotManager::Flush()
 {
-    return Screenshot->Save(Directory, OutActorsMasks);
+    return Screenshot->Flush();
 }
 
 
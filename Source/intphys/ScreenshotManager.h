@@ -43,14 +43,32 @@ public:
      *
      * @param RandomSeed - the seed to initialize a random number generator
      *
+     * @param CompressionLevels - the zlib compression levels of the scene,
+     * depth and masks PNG images respectively, from 0 (no compression) to 9
+     * (maximal compression), -1 for the zlib default. When empty use the
+     * default for all of them.
+     *
+     * @param Filters - the PNG filters used for the scene, depth and masks
+     * images respectively, must be "none", "sub", "up", "avg", "paeth", "all"
+     * or "default". When empty use the default for all of them.
+     *
+     * @param RawDump - when true, do not encode PNG images but dump the raw
+     * pixels as stored in memory (BGRA8 scene, native endian 16 bits depth
+     * and 8 bits masks) in ".raw" files. This is the fastest capture mode.
+     *
      * @param Verbose - when true, display log messages. When false, only
      * warnings and errors are reported.
+     *
+     * @return true on success, false if the compression settings are invalid
      */
     UFUNCTION(BlueprintCallable, Category="IntPhys")
     static bool Initialize(
         int Width, int Height, int NumFrames,
         AActor* OriginActor,
         int32 RandomSeed,
+        const TArray<int32>& CompressionLevels,
+        const TArray<FString>& Filters,
+        bool RawDump = false,
         bool Verbose = false);
 
     /**
@@ -71,18 +89,58 @@ public:
      * Creates 3 subdirectories "scene", "depth" and "masks" in Directory and
      * writes the captured images as PNG files in it.
      *
+     * The images are written in background threads while the next scene is
+     * captured. Writing errors are reported by the next call to Save or Flush.
+     *
      * @param Directory - the diectory where to write the captured images.
      *
-     * @param [output] OutActorsMasks - the gray level corresponding to each
-     * actor in the scene for each frame. A more natural format would be
-     * TArray<TMap<Actor, GrayLevel>> but blueprint functions do not support
-     * nested containers. This array is parsed in Python side to populate the
-     * status.json file.
+     * The gray level of each actor in each frame is returned as 3 parallel
+     * arrays (blueprint functions do not support nested containers), the
+     * i-th actor mask being the triplet (OutFrames[i], OutActorIds[i],
+     * OutGrayLevels[i]). They are joined on OutActorNames in Python side to
+     * populate the status.json file.
+     *
+     * @param [output] OutFrames - the frame index (from 0) of each mask
+     *
+     * @param [output] OutActorIds - the actor id of each mask, as indexed in
+     * OutActorNames
+     *
+     * @param [output] OutGrayLevels - the gray level of each mask
+     *
+     * @param [output] OutActorNames - the name of each actor id
+     *
+     * @param [output] OutPixelCounts - the number of pixels covered by the
+     * actor in the frame of each mask
+     *
+     * @param [output] OutBoundingBoxes - the 2D bounding box of the actor
+     * pixels in each mask, as 4 consecutive values (xmin, ymin, xmax, ymax)
+     *
+     * @param [output] OutCentroids - the centroid of the actor pixels in each
+     * mask, as 2 consecutive values (x, y)
      *
      * @return true on success, false otherwise
      */
     UFUNCTION(BlueprintCallable, Category="IntPhys")
-    static bool Save(const FString& Directory, TArray<FString>& OutActorsMasks);
+    static bool Save(
+        const FString& Directory,
+        TArray<int32>& OutFrames,
+        TArray<int32>& OutActorIds,
+        TArray<int32>& OutGrayLevels,
+        TArray<FString>& OutActorNames,
+        TArray<int32>& OutPixelCounts,
+        TArray<int32>& OutBoundingBoxes,
+        TArray<float>& OutCentroids);
+
+    /**
+     * Waits until all the saved images are written to disk.
+     *
+     * To be called before deleting or moving the saved directories, and before
+     * exiting the program.
+     *
+     * @return true on success, false if an image failed to be written
+     */
+    UFUNCTION(BlueprintCallable, Category="IntPhys")
+    static bool Flush();
 
     /**
      * Clears the buffers of captured images
@@ -0,0 +1,11 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+
+#include "Streaming.h"
+#include "ContentStreaming.h"
+
+
+bool UStreaming::IsTextureStreamingDone()
+{
+   return IStreamingManager::Get().GetNumWantingResources() == 0;
+}
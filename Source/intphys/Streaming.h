@@ -0,0 +1,24 @@
+// Fill out your copyright notice in the Description page of Project Settings.
+
+#pragma once
+
+#include "CoreMinimal.h"
+#include "Kismet/BlueprintFunctionLibrary.h"
+#include "Streaming.generated.h"
+
+/**
+ * Exposes the texture streaming state to Python code
+ */
+UCLASS()
+class INTPHYS_API UStreaming : public UBlueprintFunctionLibrary
+{
+   GENERATED_BODY()
+
+public:
+   /**
+    * Returns true when no resource is waiting to be streamed in, i.e. the
+    * textures of the scene are fully loaded and can be rendered.
+    */
+   UFUNCTION(BlueprintCallable, Category="IntPhys")
+   static bool IsTextureStreamingDone();
+};
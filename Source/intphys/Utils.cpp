@@ -14,12 +14,13 @@ FString Utils::ZeroPadding(const uint32& Index, const uint32& MaxIndex)
 
 FString Utils::BuildFilename(
    const FString& Directory, const FString& Prefix,
-   const uint32& Index, const uint32& MaxIndex)
+   const uint32& Index, const uint32& MaxIndex,
+   const FString& Extension)
 {
    FString FileIndex = Utils::ZeroPadding(Index + 1, MaxIndex);
    return FPaths::Combine(
       Directory,
-      FString::Printf(TEXT("%s_%s.png"), *Prefix, *FileIndex));
+      FString::Printf(TEXT("%s_%s.%s"), *Prefix, *FileIndex, *Extension));
 }
 
 
@@ -9,10 +9,11 @@ public:
    // Creates a directory if not already existing, returns false on failure
    static bool VerifyOrCreateDirectory(const FString& Directory);
 
-   // Build a filename in the form "Directory/Basename_Index.png"
+   // Build a filename in the form "Directory/Basename_Index.Extension"
    static FString BuildFilename(
       const FString& Directory, const FString& Prefix,
-      const uint32& Index, const uint32& MaxIndex);
+      const uint32& Index, const uint32& MaxIndex,
+      const FString& Extension = FString(TEXT("png")));
 
 private:
    // Converts an integer to a string prefixed with zeros : (13, 1000) -> "0013"
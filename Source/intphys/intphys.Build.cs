@@ -12,6 +12,9 @@ public class intphys : ModuleRules
 
 		PrivateDependencyModuleNames.AddRange(new string[] {  });
 
+		// the images writers catch the exceptions of the PNG encoding
+		bEnableExceptions = true;
+
 		// Uncomment if you are using Slate UI
 		// PrivateDependencyModuleNames.AddRange(new string[] { "Slate", "SlateCore" });
 		
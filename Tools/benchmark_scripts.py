@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Benchmarks the Python side of the train scenes rendering
+
+This script runs the intphys Director (Content/Scripts/tools/director.py) on
+train scenes, out of Unreal Engine, against the fake `unreal_engine` module
+(Tools/fake_unreal). The actors are spawned in a fake world with a crude
+physics and the ScreenshotManager writes synthetic images, so the measured
+times are the overhead of the Python scripts only: scenes generation, actors
+spawning and reuse, status collection, masks post-processing and status.json
+writing.
+
+The wall time of each call to Director.tick is measured and reported per
+tick and per scene (from the start of a scene to the start of the next one,
+restarts included). The fake world is ticked before the director, as the
+director ticks after the physics in UE.
+
+Exemple::
+
+    ./benchmark_scripts.py 20 --output-dir /tmp/bench --profile
+
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+INTPHYS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# the duration of a game tick, in seconds
+TICK_DURATION = 1 / 30
+
+
+def _setup_imports():
+    """Makes the fake unreal_engine and the intphys scripts importable"""
+    os.environ.setdefault('INTPHYS_ROOT', INTPHYS_ROOT)
+    for path in (os.path.join(INTPHYS_ROOT, 'Content', 'Scripts'),
+                 os.path.join(INTPHYS_ROOT, 'Tools', 'fake_unreal')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _percentile(values, q):
+    """Returns the `q` percentile of the sorted list `values`"""
+    return values[min(int(q / 100 * len(values)), len(values) - 1)]
+
+
+def _summary(values, unit, scale):
+    """Returns the statistics of `values` as a string in `unit`"""
+    values = sorted(values)
+    return ('n={} mean={:.1f}{unit} p50={:.1f}{unit} p95={:.1f}{unit} '
+            'max={:.1f}{unit}'.format(
+                len(values), scale * sum(values) / len(values),
+                scale * _percentile(values, 50),
+                scale * _percentile(values, 95),
+                scale * values[-1], unit=unit))
+
+
+def create_director(nscenes, size, output_dir, seed, pause_duration,
+                    preroll):
+    """Returns a fake world and a Director rendering `nscenes` train scenes
+
+    The scenes are rendered by ticking the world and then the director, until
+    unreal_engine.classes.Exit.requested is True.
+
+    """
+    import random
+    from unreal_engine.classes import Exit
+    from unreal_engine.world import UWorld
+    from tools import assets
+    from tools.director import Director
+
+    random.seed(seed)
+    Exit.requested = False
+    world = UWorld()
+    assets.preload()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json') as scenes_json:
+        scenes_json.write(json.dumps({'train': nscenes}))
+        scenes_json.flush()
+
+        director = Director(
+            world, scenes_json.name, size, output_dir, seed,
+            pause_duration=pause_duration, preroll=preroll)
+
+    return world, director
+
+
+def run(nscenes, size, output_dir, seed, pause_duration, preroll):
+    """Renders `nscenes` train scenes in the fake world
+
+    Returns the timings of the ticks and scenes (in seconds) and the number
+    of restarted scenes.
+
+    """
+    from unreal_engine.classes import Exit
+
+    world, director = create_director(
+        nscenes, size, output_dir, seed, pause_duration, preroll)
+
+    ticks, scenes = [], []
+    scene_start, scene_index = time.perf_counter(), 0
+    while not Exit.requested:
+        world.tick(TICK_DURATION)
+
+        start = time.perf_counter()
+        director.tick(TICK_DURATION)
+        end = time.perf_counter()
+        ticks.append(end - start)
+
+        if director.current_scene_index != scene_index:
+            scenes.append(end - scene_start)
+            scene_start, scene_index = end, director.current_scene_index
+
+    return ticks, scenes, director.num_restarted_scenes
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'nscenes', type=int, metavar='<int>',
+        help='number of train scenes to render')
+    parser.add_argument(
+        '-o', '--output-dir', metavar='<path>',
+        help='directory where to save the scenes, by default save them in a '
+        'temporary directory deleted at exit')
+    parser.add_argument(
+        '-d', '--dry', action='store_true',
+        help='do not capture nor save the scenes (dry mode)')
+    parser.add_argument(
+        '-r', '--resolution', default='288x288', metavar='<width>x<height>',
+        help='resolution of the images, default is %(default)s')
+    parser.add_argument(
+        '-f', '--frames', type=int, default=100, metavar='<int>',
+        help='number of frames per scene, default is %(default)s')
+    parser.add_argument(
+        '-p', '--pause-duration', type=int, default=50, metavar='<int>',
+        help='pause at the beginning of each scene, in number of ticks, '
+        'default is %(default)s')
+    parser.add_argument(
+        '-s', '--seed', type=int, default=0, metavar='<int>',
+        help='random seed, default is %(default)s')
+    parser.add_argument(
+        '--preroll', action='store_true',
+        help='simulate the scenes without capture before rendering them')
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='display the time spent in each stage (see tools.profiler)')
+    parser.add_argument(
+        '-v', '--verbose', action='store_true',
+        help='display the log messages of the scripts')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.profile:
+        # must be defined before tools.profiler is imported
+        os.environ['INTPHYS_PROFILE'] = '1'
+    _setup_imports()
+
+    logging.basicConfig(format='%(message)s')
+    if args.verbose or args.profile:
+        logger = logging.getLogger('unreal_engine')
+        logger.setLevel(logging.INFO)
+        if not args.verbose:
+            # keep only the profiling summary
+            logger.addFilter(lambda record: not record.getMessage().startswith(
+                ('Scene ', 'INTPHYS_EVENT', 'Preloaded')))
+
+    width, height = (int(r) for r in args.resolution.split('x'))
+    size = (width, height, args.frames)
+
+    output_dir = None
+    if not args.dry:
+        output_dir = args.output_dir or tempfile.mkdtemp()
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+
+    try:
+        start = time.perf_counter()
+        ticks, scenes, restarts = run(
+            args.nscenes, size, output_dir, args.seed,
+            args.pause_duration, args.preroll)
+        elapsed = time.perf_counter() - start
+    finally:
+        if output_dir and not args.output_dir:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    print('rendered {} scenes ({} restarts) in {:.1f}s, {:.1f} scenes/s'
+          .format(args.nscenes, restarts, elapsed, args.nscenes / elapsed))
+    print('per tick: ' + _summary(ticks, 'us', 1e6))
+    print('per scene: ' + _summary(scenes, 'ms', 1e3))
+
+
+if __name__ == '__main__':
+    main()
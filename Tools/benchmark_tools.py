@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Benchmarks the offline tools on synthetic datasets
+
+This script generates synthetic datasets with the layout of the datasets
+written by intphys (train/<scene>, test/<block>/<scene>/<run> and
+dev/<block>/<scene>/<run>, each with scene, depth and masks PNG images and a
+status.json file) and times the tools working on them:
+
+- split_json: splits a JSON of scenes in balanced parts (parallel/),
+- merge_datasets: merges two datasets by moving their scenes, then copies
+  the merged dataset (parallel/),
+- shuffle_test: shuffles the possible/impossible runs of the test scenes,
+- make_archives: builds the .tar.gz archives (requires numpy and
+  progressbar),
+- images2video: converts the images of each scene to a gif (requires GNU
+  parallel and imagemagick).
+
+The tools with missing dependencies are skipped. The images are valid PNG
+files whose sizes are approximately the ones of real 288x288 images (see
+IMAGE_SIZES), they are not realistic pictures. A fresh dataset is generated
+before each run of a tool, the generation is not timed.
+
+The throughputs are reported in scenes/s, and in MB/s for the tools reading
+or moving the images. They can be saved as a baseline JSON file and
+compared to a baseline in a later run: the script then exits with a non-zero
+status if a tool is slower than its baseline by more than the tolerance.
+
+Exemple::
+
+    ./benchmark_tools.py --train 200 --test 20 --save-baseline base.json
+    ./benchmark_tools.py --train 200 --test 20 --baseline base.json
+
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+
+INTPHYS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# the approximative size in bytes of the scene, depth and masks PNG images
+# written by intphys at 288x288
+IMAGE_SIZES = {'scene': 90000, 'depth': 30000, 'masks': 3000}
+
+# the number of objects and occluders in the synthetic status.json files
+STATUS_ACTORS = ('object_1', 'object_2', 'occluder_1')
+
+
+def _setup_imports():
+    """Makes the tools importable"""
+    for path in (os.path.join(INTPHYS_ROOT, 'Tools'),
+                 os.path.join(INTPHYS_ROOT, 'Tools', 'parallel')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _png(width, height, gray, size, rng):
+    """Returns a PNG image of about `size` bytes
+
+    The image is `gray` 8-bit or RGB, its first rows are noise (incompressible)
+    until the `size` is reached, the other ones are black.
+
+    """
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data)))
+
+    row_size = width * (1 if gray else 3)
+    noisy = min(height, size // row_size)
+    rows = b''.join(
+        b'\x00' + (rng.randbytes(row_size) if y < noisy
+                   else bytes(row_size))
+        for y in range(height))
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack(
+                '>IIBBBBB', width, height, 8, 0 if gray else 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows)) +
+            chunk(b'IEND', b''))
+
+
+def _status(nframes, is_possible, rng):
+    """Returns a synthetic status.json content with `nframes` frames"""
+    def vector(*keys):
+        return {k: rng.uniform(-500, 500) for k in keys}
+
+    header = {
+        'block_name': 'train',
+        'block_type': 'train',
+        'is_possible': is_possible,
+        'camera': {
+            'location': vector('x', 'y', 'z'),
+            'rotation': vector('roll', 'pitch', 'yaw'),
+            'field_of_view': 90, 'aspect_ratio': 1, 'projection_mode': 0}}
+    frames = []
+    for _ in range(nframes):
+        frame = {name: {
+            'location': vector('x', 'y', 'z'),
+            'rotation': vector('roll', 'pitch', 'yaw'),
+            'scale': vector('x', 'y', 'z'),
+            'material': 'M_Metal_Copper',
+            'mass': 100.0} for name in STATUS_ACTORS}
+        frame['masks'] = {
+            name: 50 * (i + 1) for i, name in enumerate(STATUS_ACTORS)}
+        frames.append(frame)
+    return json.dumps({'header': header, 'frames': frames}, indent=4)
+
+
+class DatasetGenerator:
+    """Writes synthetic datasets
+
+    The images and status are generated once and copied in each scene.
+
+    Parameters
+    ----------
+    ntrain : int
+        The number of train scenes.
+    ntest : int
+        The number of scenes in each test and dev block.
+    blocks : list of str
+        The test and dev blocks (e.g. O1, O2).
+    nframes : int
+        The number of images per scene.
+    resolution : tuple
+        The images (width, height) in pixels.
+    seed : int, optional
+        The seed of the random images and status.
+
+    """
+    def __init__(self, ntrain, ntest, blocks, nframes, resolution, seed=0):
+        self.ntrain = ntrain
+        self.ntest = ntest
+        self.blocks = blocks
+        self.nframes = nframes
+
+        rng = random.Random(seed)
+        scale = resolution[0] * resolution[1] / (288 * 288)
+        self._images = {
+            kind: _png(*resolution, kind != 'scene', int(size * scale), rng)
+            for kind, size in IMAGE_SIZES.items()}
+        self._status = {
+            possible: _status(nframes, possible, rng)
+            for possible in (True, False)}
+
+    @property
+    def nscenes(self):
+        """The number of scenes in a dataset"""
+        return self.ntrain + 2 * self.ntest * len(self.blocks)
+
+    def _write_run(self, directory, is_possible=True):
+        for kind, image in self._images.items():
+            os.makedirs(os.path.join(directory, kind))
+            for i in range(1, self.nframes + 1):
+                filename = os.path.join(directory, kind, '{}_{}.png'.format(
+                    kind, str(i).zfill(len(str(self.nframes)))))
+                with open(filename, 'wb') as fout:
+                    fout.write(image)
+
+        with open(os.path.join(directory, 'status.json'), 'w') as fout:
+            fout.write(self._status[is_possible])
+
+    def write(self, directory, ntrain=None):
+        """Writes a dataset in `directory`, returns its size in bytes
+
+        The number of train scenes can be overridden by `ntrain`.
+
+        """
+        ntrain = self.ntrain if ntrain is None else ntrain
+        for i in range(1, ntrain + 1):
+            self._write_run(os.path.join(
+                directory, 'train', str(i).zfill(len(str(ntrain)))))
+
+        for dataset in ('test', 'dev'):
+            for block in self.blocks:
+                for i in range(1, self.ntest + 1):
+                    scene = os.path.join(
+                        directory, dataset, block,
+                        str(i).zfill(len(str(self.ntest))))
+                    for run in range(1, 5):
+                        self._write_run(
+                            os.path.join(scene, str(run)), run <= 2)
+        return _size(directory)
+
+
+def _size(directory):
+    """Returns the size in bytes of the files in `directory`"""
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(directory) for f in files)
+
+
+def bench_split_json(generator, work_dir):
+    """Splits the JSON of the scenes in 8 parts, 100 times"""
+    import split_json
+
+    scenes = {'train': generator.ntrain}
+    for dataset in ('test', 'dev'):
+        scenes[dataset] = {
+            block: {visibility: {movement: generator.ntest
+                                 for movement in ('static', 'dynamic_1')}
+                    for visibility in ('visible', 'occluded')}
+            for block in generator.blocks}
+    nscenes = sum(split_json.unroll_dict(scenes)[1])
+
+    start = time.perf_counter()
+    for _ in range(100):
+        split_json.split_dict(scenes, 8)
+    return time.perf_counter() - start, 100 * nscenes, None
+
+
+def bench_merge_datasets(generator, work_dir):
+    """Merges two datasets by moving them, then copies the result"""
+    from merge_datasets import Dataset, merge
+
+    inputs = [os.path.join(work_dir, 'input_{}'.format(i)) for i in (1, 2)]
+    size = sum(generator.write(d) for d in inputs)
+    merged = os.path.join(work_dir, 'merged')
+    copied = os.path.join(work_dir, 'copied')
+
+    start = time.perf_counter()
+    merge([Dataset(d) for d in inputs], merged)
+    merge([Dataset(merged)], copied, mode='copy')
+    return time.perf_counter() - start, 4 * generator.nscenes, 2 * size
+
+
+def bench_shuffle_test(generator, work_dir):
+    """Shuffles the runs of the test and dev scenes (renames only)"""
+    from shuffle_test import shuffle_test_scenes
+
+    generator.write(work_dir, ntrain=0)
+    start = time.perf_counter()
+    shuffle_test_scenes(work_dir, dataset='test')
+    shuffle_test_scenes(work_dir, dataset='dev')
+    return (time.perf_counter() - start,
+            2 * generator.ntest * len(generator.blocks), None)
+
+
+def bench_make_archives(generator, work_dir):
+    """Builds the archives of the dev, train and test datasets"""
+    import make_archives
+    make_archives.log.setLevel(logging.WARNING)
+
+    data_dir = os.path.join(work_dir, 'data')
+    output_dir = os.path.join(work_dir, 'archives')
+    os.makedirs(output_dir)
+    size = generator.write(data_dir)
+
+    start = time.perf_counter()
+    make_archives.prepare_dev(data_dir, output_dir)
+    make_archives.prepare_train(data_dir, output_dir)
+    for block in generator.blocks:
+        make_archives.prepare_test(data_dir, output_dir, block)
+    return time.perf_counter() - start, generator.nscenes, size
+
+
+def bench_images2video(generator, work_dir):
+    """Converts the scene images of the train scenes to gifs"""
+    for program in ('parallel', 'convert'):
+        if shutil.which(program) is None:
+            raise ImportError('{} is not installed'.format(program))
+
+    data_dir = os.path.join(work_dir, 'data')
+    size = generator.write(data_dir)
+
+    start = time.perf_counter()
+    subprocess.run(
+        [os.path.join(INTPHYS_ROOT, 'Tools', 'images2video.sh'),
+         os.path.join(data_dir, 'train'), 'gif', '--scene'],
+        cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start, generator.ntrain, size
+
+
+BENCHMARKS = {
+    'split_json': bench_split_json,
+    'merge_datasets': bench_merge_datasets,
+    'shuffle_test': bench_shuffle_test,
+    'make_archives': bench_make_archives,
+    'images2video': bench_images2video}
+
+
+def run_benchmark(name, generator, repeat):
+    """Runs the benchmark `name` `repeat` times, keeps the fastest run
+
+    Returns a dict with the time (s) and the throughputs in scenes/s and
+    MB/s (None if the tool does not read the dataset), or None if the tool
+    cannot run here.
+
+    """
+    best = None
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp()
+        try:
+            elapsed, nscenes, size = BENCHMARKS[name](generator, work_dir)
+        except ImportError as err:
+            print('{}: skipped ({})'.format(name, err))
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if best is None or elapsed < best['time']:
+            best = {
+                'time': elapsed,
+                'scenes/s': nscenes / elapsed,
+                'MB/s': None if size is None else size / elapsed / 1e6}
+    return best
+
+
+def compare(results, baseline, tolerance):
+    """Prints the results against the baseline, returns the regressions"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+
+        ratio = result['scenes/s'] / reference['scenes/s']
+        is_regression = ratio < 1 - tolerance
+        print('{}: {:.2f}x baseline{}'.format(
+            name, ratio, ' REGRESSION' if is_regression else ''))
+        if is_regression:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.split('\n')[1:]))
+    parser.add_argument(
+        'tools', nargs='*', metavar='<tool>',
+        help='the tools to benchmark in {}, default is all'.format(
+            ', '.join(BENCHMARKS)))
+    parser.add_argument(
+        '--train', type=int, default=100, metavar='<int>',
+        help='number of train scenes, default is %(default)s')
+    parser.add_argument(
+        '--test', type=int, default=10, metavar='<int>',
+        help='number of scenes per test and dev block, default is '
+        '%(default)s')
+    parser.add_argument(
+        '--blocks', default='O1,O2,O3', metavar='<str>',
+        help='comma-separated test and dev blocks, default is %(default)s')
+    parser.add_argument(
+        '--frames', type=int, default=100, metavar='<int>',
+        help='number of images per scene, default is %(default)s')
+    parser.add_argument(
+        '--resolution', default='288x288', metavar='<width>x<height>',
+        help='resolution of the images, default is %(default)s')
+    parser.add_argument(
+        '--repeat', type=int, default=3, metavar='<int>',
+        help='number of runs of each tool, the fastest is kept, default is '
+        '%(default)s')
+    parser.add_argument(
+        '--save-baseline', metavar='<json>',
+        help='write the results to a baseline file')
+    parser.add_argument(
+        '--baseline', metavar='<json>',
+        help='compare the results to a baseline file')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2, metavar='<float>',
+        help='relative slowdown tolerated before reporting a regression, '
+        'default is %(default)s')
+
+    args = parser.parse_args()
+    for tool in args.tools:
+        if tool not in BENCHMARKS:
+            parser.error('unknown tool {}'.format(tool))
+    return args
+
+
+def main():
+    args = parse_args()
+    _setup_imports()
+
+    resolution = tuple(int(r) for r in args.resolution.split('x'))
+    config = {
+        'train': args.train, 'test': args.test,
+        'blocks': args.blocks.split(','), 'frames': args.frames,
+        'resolution': list(resolution)}
+    generator = DatasetGenerator(
+        args.train, args.test, config['blocks'], args.frames, resolution)
+
+    results = {}
+    for name in args.tools or BENCHMARKS:
+        result = run_benchmark(name, generator, args.repeat)
+        if result is not None:
+            results[name] = result
+            print('{}: {:.2f}s, {:.1f} scenes/s{}'.format(
+                name, result['time'], result['scenes/s'],
+                '' if result['MB/s'] is None
+                else ', {:.1f} MB/s'.format(result['MB/s'])))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as fout:
+            fout.write(json.dumps(
+                {'config': config, 'results': results}, indent=4) + '\n')
+
+    if args.baseline:
+        with open(args.baseline, 'r') as fin:
+            baseline = json.load(fin)
+        if baseline.get('config') != config:
+            print('warning: the baseline was computed with another '
+                  'configuration: {}'.format(baseline.get('config')))
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
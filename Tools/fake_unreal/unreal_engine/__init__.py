@@ -0,0 +1,145 @@
+"""A stub of the UnrealEnginePython `unreal_engine` module
+
+This package lets the intphys Python scripts (Content/Scripts) be imported
+and run outside of Unreal Engine, to study the scenes parameters offline (see
+Tools/simulate_scenarios.py) or to benchmark the Python side of the scenes
+rendering (see Tools/benchmark_scripts.py).
+
+The math types are functional. The actors are spawned in a fake world (see
+unreal_engine.world) which stores their transforms and integrates a crude
+physics. The UE classes used by the scripts (ScreenshotManager,
+GameplayStatics, ActorStatus, etc) have fakes working on that world, the
+other ones are inert stand-ins (see unreal_engine.classes). The log messages
+are sent to the Python logger 'unreal_engine'.
+
+To use it, put the Tools/fake_unreal directory in front of sys.path.
+
+"""
+
+import logging
+import math
+
+
+_logger = logging.getLogger('unreal_engine')
+
+
+class FVector:
+    """A 3D vector with x, y and z components"""
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __repr__(self):
+        return 'FVector({}, {}, {})'.format(self.x, self.y, self.z)
+
+    def __add__(self, other):
+        return FVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return FVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, value):
+        return FVector(self.x * value, self.y * value, self.z * value)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, value):
+        return FVector(self.x / value, self.y / value, self.z / value)
+
+    def __neg__(self):
+        return FVector(-self.x, -self.y, -self.z)
+
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+
+    def copy(self):
+        return FVector(self.x, self.y, self.z)
+
+
+class FRotator:
+    """A rotation as roll, pitch and yaw angles in degrees"""
+    def __init__(self, roll=0.0, pitch=0.0, yaw=0.0):
+        self.roll = roll
+        self.pitch = pitch
+        self.yaw = yaw
+
+    def __repr__(self):
+        return 'FRotator({}, {}, {})'.format(self.roll, self.pitch, self.yaw)
+
+    def __add__(self, other):
+        return FRotator(self.roll + other.roll, self.pitch + other.pitch,
+                        self.yaw + other.yaw)
+
+    def __sub__(self, other):
+        return FRotator(self.roll - other.roll, self.pitch - other.pitch,
+                        self.yaw - other.yaw)
+
+    def copy(self):
+        return FRotator(self.roll, self.pitch, self.yaw)
+
+
+class FLinearColor:
+    """A RGBA color with components in [0, 1]"""
+    def __init__(self, r=0.0, g=0.0, b=0.0, a=1.0):
+        self.r = r
+        self.g = g
+        self.b = b
+        self.a = a
+
+    def __repr__(self):
+        return 'FLinearColor({}, {}, {}, {})'.format(
+            self.r, self.g, self.b, self.a)
+
+
+class UObject:
+    """An inert UE object, any method call does nothing and returns None"""
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+class UAsset(UObject):
+    """A loaded asset (material, mesh), known by its path"""
+    def __init__(self, path):
+        self.path = path
+
+    def get_name(self):
+        # '/Game/Materials/Wood.Wood' -> 'Wood'
+        return self.path.split('.')[-1]
+
+
+class UClass(UAsset):
+    """A class loaded by path (blueprint) or found by name"""
+    def __init__(self, path):
+        super().__init__(path)
+        # '/Game/Object.Object_C' -> 'Object_C'
+        self.__name__ = self.get_name().split('/')[-1]
+
+
+def log(message):
+    _logger.info(message)
+
+
+def log_warning(message):
+    _logger.warning(message)
+
+
+def log_error(message):
+    _logger.error(message)
+
+
+def load_object(cls, path):
+    return UAsset(path)
+
+
+def load_class(path):
+    return UClass(path)
+
+
+def find_class(name):
+    return UClass(name)
@@ -0,0 +1,237 @@
+"""Stand-ins of the UE classes imported from `unreal_engine.classes`
+
+Any class name can be imported from this module. Most are inert classes whose
+methods (static or not) do nothing and return None. The C++ classes of the
+intphys module and the GameplayStatics have fakes working on the actors of
+the fake world (see unreal_engine.world):
+
+- SpawnManager tests the overlap of two actors from their axis-aligned
+  bounding boxes,
+- GameplayStatics pauses the world,
+- Rendering enables or disables the world rendering,
+- ActorStatus returns the transforms, velocities and masses of actors,
+- ScreenshotManager writes synthetic frames and returns masks built from the
+  actors visible at each capture,
+- Exit records the exit request in Exit.requested.
+
+"""
+
+import os
+import struct
+import zlib
+
+import unreal_engine
+
+
+class _InertMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+class _InertClass(unreal_engine.UObject, metaclass=_InertMeta):
+    pass
+
+
+class SpawnManager(_InertClass):
+    """Overlap test on actors having a `bounding_box` attribute
+
+    The bounding box of an actor is a pair of (x, y, z) tuples for its min
+    and max corners. Actors without a bounding box never overlap.
+
+    """
+    @staticmethod
+    def IsOverlapping(actor, other):
+        box = getattr(actor, 'bounding_box', None)
+        other_box = getattr(other, 'bounding_box', None)
+        if box is None or other_box is None:
+            return False
+
+        return all(
+            box[0][i] < other_box[1][i] and other_box[0][i] < box[1][i]
+            for i in range(3))
+
+
+class GameplayStatics(_InertClass):
+    @staticmethod
+    def SetGamePaused(world, paused):
+        world.is_paused = paused
+        return True
+
+    @staticmethod
+    def IsGamePaused(world):
+        return world.is_paused
+
+    @staticmethod
+    def GetPlayerController(world, index):
+        return unreal_engine.UObject()
+
+
+class Rendering(_InertClass):
+    @staticmethod
+    def SetWorldRendering(world, enabled):
+        world.is_rendering = enabled
+
+
+class Streaming(_InertClass):
+    @staticmethod
+    def IsTextureStreamingDone():
+        return True
+
+
+class Exit(_InertClass):
+    requested = False
+
+    @staticmethod
+    def ExitEngine(force=False):
+        Exit.requested = True
+
+
+class ActorStatus(_InertClass):
+    @staticmethod
+    def GetStatus(actors):
+        locations, rotations, velocities, masses = [], [], [], []
+        for actor in actors:
+            locations.extend(
+                (actor.location.x, actor.location.y, actor.location.z))
+            rotations.extend(
+                (actor.rotation.roll, actor.rotation.pitch,
+                 actor.rotation.yaw))
+            velocities.extend(
+                (actor.velocity.x, actor.velocity.y, actor.velocity.z))
+            masses.append(actor.get_mass())
+        return True, locations, rotations, velocities, masses
+
+
+def _png(width, height, bit_depth, color_type, pixel_size, level, pixel):
+    """Returns a PNG image as bytes, the pixel (x, y) being `pixel(x, y)`"""
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data)))
+
+    rows = b''.join(
+        b'\x00' + b''.join(pixel(x, y) for x in range(width))
+        for y in range(height))
+    assert len(rows) == height * (1 + width * pixel_size)
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack(
+                '>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows, level)) +
+            chunk(b'IEND', b''))
+
+
+class ScreenshotManager(_InertClass):
+    """Captures synthetic scene, depth and masks images
+
+    The images are gradients computed once at initialization and written as
+    PNG (or raw) files at the same paths than the real ScreenshotManager. At
+    each capture, the actors visible in the world (neither hidden nor
+    ignored) are recorded to build the masks returned by Save().
+
+    """
+    PNG_FILTERS = ('default', 'none', 'sub', 'up', 'avg', 'paeth', 'all')
+
+    _size = (0, 0, 0)
+    _origin = None
+    _raw_dump = False
+    _images = {}
+    _captures = []
+
+    @classmethod
+    def Initialize(cls, width, height, nimages, origin, seed,
+                   png_compression, png_filters, raw_dump, verbose):
+        if len(png_compression) not in (0, 3) or len(png_filters) not in (
+                0, 3):
+            return False
+        if not all(-1 <= c <= 9 for c in png_compression):
+            return False
+        if not all(f in cls.PNG_FILTERS for f in png_filters):
+            return False
+
+        cls._size = (width, height, nimages)
+        cls._origin = origin
+        cls._raw_dump = raw_dump
+        cls._captures = []
+
+        levels = png_compression or [-1, -1, -1]
+        if raw_dump:
+            cls._images = {
+                'scene': bytes(4 * width * height),
+                'depth': bytes(2 * width * height),
+                'masks': bytes(width * height)}
+        else:
+            cls._images = {
+                'scene': _png(
+                    width, height, 8, 2, 3, levels[0],
+                    lambda x, y: bytes((x % 256, y % 256, (x + y) % 256))),
+                'depth': _png(
+                    width, height, 16, 0, 2, levels[1],
+                    lambda x, y: struct.pack('>H', 100 * y % 65536)),
+                'masks': _png(
+                    width, height, 8, 0, 1, levels[2],
+                    lambda x, y: bytes((64 * (4 * x // width),)))}
+        return True
+
+    @classmethod
+    def Capture(cls, ignored_actors):
+        if len(cls._captures) >= cls._size[2]:
+            return False
+
+        ignored = set(ignored_actors) | {cls._origin}
+        cls._captures.append([
+            actor.get_name() for actor in cls._origin.get_world().actors
+            if not actor.is_hidden and actor not in ignored])
+        return True
+
+    @classmethod
+    def Reset(cls, reset_actors):
+        cls._captures = []
+
+    @classmethod
+    def Flush(cls):
+        return True
+
+    @classmethod
+    def Save(cls, directory):
+        extension = 'raw' if cls._raw_dump else 'png'
+        width, height, nimages = cls._size
+        for kind, image in cls._images.items():
+            os.makedirs(os.path.join(directory, kind), exist_ok=True)
+            for index in range(len(cls._captures)):
+                filename = os.path.join(directory, kind, '{}_{}.{}'.format(
+                    kind, str(index + 1).zfill(len(str(nimages))),
+                    extension))
+                with open(filename, 'wb') as fout:
+                    fout.write(image)
+
+        # the masks as parallel arrays, one entry per (frame, actor)
+        names = sorted({name for names in cls._captures for name in names})
+        ids = {name: index for index, name in enumerate(names)}
+        frames, actors, gray_levels, pixels, boxes, centroids = (
+            [], [], [], [], [], [])
+        for frame, visible in enumerate(cls._captures):
+            for name in visible:
+                frames.append(frame)
+                actors.append(ids[name])
+                gray_levels.append(255 * (ids[name] + 1) // (len(names) + 1))
+                pixels.append(width * height // (len(visible) + 1))
+                boxes.extend((0, 0, width - 1, height - 1))
+                centroids.extend((width / 2, height / 2))
+
+        return (True, frames, actors, gray_levels, names,
+                pixels, boxes, centroids)
+
+
+_classes = {}
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+
+    try:
+        return _classes[name]
+    except KeyError:
+        cls = _classes[name] = _InertMeta(name, (_InertClass,), {})
+        return cls
@@ -0,0 +1,22 @@
+"""Stand-ins of the UE enumerations imported from `unreal_engine.enums`
+
+Any enumeration can be imported from this module, its values are the
+strings '<enum>.<value>'.
+
+"""
+
+
+class _Enum:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, value):
+        if value.startswith('__'):
+            raise AttributeError(value)
+        return '{}.{}'.format(self._name, value)
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    return _Enum(name)
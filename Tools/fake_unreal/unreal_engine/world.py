@@ -0,0 +1,212 @@
+"""A fake UE world in which the intphys actors are spawned
+
+The world keeps the list of the spawned actors, its pause and rendering
+states. The actors store their transform, visibility, collision state, bound
+events and components. The components store the values given to their
+setters (e.g. SetFieldOfView(90) then FieldOfView is 90).
+
+The physics is crude: UWorld.tick() moves the actors simulating physics
+under the gravity and the forces added since the previous tick, and stops
+them on the floor (at z = 0). There is no collision between actors, so the
+hit and overlap events are never fired.
+
+An actor is a cube of ACTOR_EXTENT centered on its location and scaled by
+its scale, this gives the bounding box tested by SpawnManager.IsOverlapping.
+
+"""
+
+import collections
+
+from unreal_engine import FRotator, FVector, UObject
+
+
+# the gravity acceleration along z, in cm/s^2
+GRAVITY = -980.0
+
+# the size of an actor at scale 1, in cm
+ACTOR_EXTENT = 100.0
+
+# the class of the root component of the actors, holding the mass
+ROOT_COMPONENT = 'StaticMeshComponent'
+
+# the mass of an actor at mass scale 1, in kg
+ACTOR_MASS = 100.0
+
+
+class UActorComponent(UObject):
+    """A component of an actor, storing the values given to its setters"""
+    def __init__(self, owner):
+        self.owner = owner
+        self.properties = {'MassScale': 1.0}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        properties = self.__dict__['properties']
+        if name in properties:
+            return properties[name]
+
+        if name.startswith('Set'):
+            def setter(*args, **kwargs):
+                properties[name[3:]] = (
+                    args[0] if args else list(kwargs.values())[-1])
+            return setter
+
+        return super().__getattr__(name)
+
+    def SetMassScale(self, BoneName='', InMassScale=1.0):
+        self.properties['MassScale'] = InMassScale
+
+    def GetMassScale(self, BoneName=''):
+        return self.properties['MassScale']
+
+    def GetMass(self):
+        return ACTOR_MASS * self.properties['MassScale']
+
+    def set_simulate_physics(self, enabled=True):
+        self.owner.is_simulating = enabled
+        if not enabled:
+            self.owner.velocity = FVector()
+
+    def add_force(self, force):
+        self.owner.force += force
+
+
+class AActor(UObject):
+    """An actor spawned in a UWorld"""
+    def __init__(self, world, name):
+        self.world = world
+        self.name = name
+        self.location = FVector()
+        self.rotation = FRotator()
+        self.scale = FVector(1, 1, 1)
+        self.velocity = FVector()
+        self.force = FVector()
+        self.is_simulating = False
+        self.is_hidden = False
+        self.has_collision = True
+        self.events = collections.defaultdict(list)
+        self.components = {}
+
+    def __repr__(self):
+        return 'AActor({})'.format(self.name)
+
+    def get_name(self):
+        return self.name
+
+    def get_world(self):
+        return self.world
+
+    def get_actor_location(self):
+        return self.location.copy()
+
+    def set_actor_location(self, location, sweep=False):
+        self.location = location.copy()
+        return True
+
+    def get_actor_rotation(self):
+        return self.rotation.copy()
+
+    def set_actor_rotation(self, rotation, sweep=False):
+        self.rotation = rotation.copy()
+        return True
+
+    def get_actor_scale(self):
+        return self.scale.copy()
+
+    def set_actor_scale(self, scale):
+        self.scale = scale.copy()
+
+    def get_actor_velocity(self):
+        return self.velocity.copy()
+
+    def bind_event(self, event, callback):
+        self.events[event].append(callback)
+
+    def actor_destroy(self):
+        self.world.destroy(self)
+
+    def SetActorHiddenInGame(self, hidden):
+        self.is_hidden = hidden
+
+    def SetActorEnableCollision(self, enabled):
+        self.has_collision = enabled
+
+    def _get_component(self, name):
+        try:
+            return self.components[name]
+        except KeyError:
+            component = self.components[name] = UActorComponent(self)
+            return component
+
+    def get_component_by_type(self, cls):
+        return self._get_component(cls.__name__)
+
+    get_actor_component_by_type = get_component_by_type
+
+    def get_actor_root_component(self):
+        return self._get_component(ROOT_COMPONENT)
+
+    def get_mass(self):
+        return self._get_component(ROOT_COMPONENT).GetMass()
+
+    @property
+    def bounding_box(self):
+        half = self.scale * (ACTOR_EXTENT / 2)
+        return ((self.location.x - half.x,
+                 self.location.y - half.y,
+                 self.location.z - half.z),
+                (self.location.x + half.x,
+                 self.location.y + half.y,
+                 self.location.z + half.z))
+
+
+class UWorld(UObject):
+    """The world in which the actors are spawned and simulated"""
+    def __init__(self):
+        self.actors = []
+        self.is_paused = False
+        self.is_rendering = True
+        self.time = 0.0
+        self._counter = collections.Counter()
+
+    def get_world(self):
+        return self
+
+    def actor_spawn(self, cls, location=None, rotation=None):
+        """Spawns an actor of the class `cls`, named like in UE"""
+        self._counter[cls.__name__] += 1
+        actor = AActor(
+            self, '{}_{}'.format(cls.__name__, self._counter[cls.__name__]))
+        if location is not None:
+            actor.set_actor_location(location)
+        if rotation is not None:
+            actor.set_actor_rotation(rotation)
+        self.actors.append(actor)
+        return actor
+
+    def destroy(self, actor):
+        self.actors.remove(actor)
+
+    def tick(self, dt):
+        """Advances the physics simulation of `dt` seconds"""
+        if self.is_paused:
+            return
+
+        self.time += dt
+        for actor in self.actors:
+            if not actor.is_simulating:
+                continue
+
+            acceleration = actor.force / actor.get_mass()
+            acceleration.z += GRAVITY
+            actor.velocity += acceleration * dt
+            actor.location += actor.velocity * dt
+            actor.force = FVector()
+
+            # stop on the floor
+            bottom = actor.location.z - actor.scale.z * ACTOR_EXTENT / 2
+            if bottom < 0:
+                actor.location.z -= bottom
+                actor.velocity.z = 0
@@ -1,10 +1,32 @@
 #!/usr/bin/env python3
+"""Creates a new intphys dataset from several existing ones
+
+The scenes of each block (train, test/O1, dev/O2, etc) of the input datasets
+are numbered in the merged dataset in the order of the input datasets, and
+then of their names. The target of each scene is computed up front so that
+each scene is moved (a single rename), copied, symlinked or hardlinked once,
+by a pool of threads.
+
+The merge is recorded in a manifest file in the output directory, deleted
+once the merge is done. An interrupted merge can be undone with --undo: the
+moved scenes are renamed back, the copies and links are deleted, and so are
+the emptied blocks directories.
+
+"""
 
 import argparse
+import concurrent.futures
+import errno
+import json
 import os
-import random
 import shutil
-import string
+
+
+# the file recording the renames of an ongoing merge in the output directory
+MANIFEST = '.merge_manifest.json'
+
+# the ways to put a scene in the merged dataset
+MODES = ('move', 'copy', 'symlink', 'hardlink')
 
 
 class Dataset:
@@ -33,56 +55,154 @@ class Dataset:
                 for sub_dir in os.listdir(test_dir):
                     yield os.path.join(name, sub_dir)
 
-    def _scenes(self):
+    def scenes(self):
         """Yields scene directories relative to root_directory
 
         Scenes are root/train/001, root/test/O1/001, root/test/O1/002, etc...
 
         """
-        for block in self._blocks():
-            directory = os.path.join(self.root_directory, block)
-            for scene in os.listdir(directory):
+        for block, scenes in self.scenes_by_block().items():
+            for scene in scenes:
                 yield os.path.join(block, scene)
 
-    def _count(self, directory):
-        """Returns the number of elements in `root_directory/directory`"""
-        return len(os.listdir(os.path.join(self.root_directory, directory)))
+    def scenes_by_block(self):
+        """Returns the sorted scene names of each block as a dict"""
+        return {
+            block: sorted(os.listdir(
+                os.path.join(self.root_directory, block)))
+            for block in self._blocks()}
 
     def nscenes(self):
         """Returns the number of scenes contained in the dataset"""
-        return len(list(self._scenes()))
-
-    def merge_into(self, directory, copy=False):
-        for scene in self._scenes():
-            src = os.path.join(self.root_directory, scene)
-
-            # use a unique directory name
-            suffix = '_' + ''.join(random.choices(string.digits, k=10))
-            dest = os.path.join(directory, scene) + suffix
-            while os.path.exists(dest):
-                suffix = '_' + ''.join(random.choices(string.digits, k=10))
-                dest = os.path.join(directory, scene) + suffix
-
-            if copy is True:
-                shutil.copytree(src, dest)
-            else:
-                shutil.move(src, dest)
-
-    def normalize(self):
-        """Rename all the scenes directory with increasing zfilled numbers"""
-        for block in self._blocks():
-            nscenes = self._count(block)
-            zlen = int(len(str(nscenes)))
-            directory = os.path.join(self.root_directory, block)
-            for n, scene in enumerate(os.listdir(directory)):
-                src = os.path.join(directory, scene)
-                dest = os.path.join(directory, str(n+1).zfill(zlen))
-                shutil.move(src, dest)
+        return len(list(self.scenes()))
+
+
+def plan_merge(datasets, directory):
+    """Returns the list of (source, target) scenes to merge into `directory`
+
+    The scenes of a block are numbered from 1 in the order of the
+    `datasets`, zero-padded to the number of scenes in the block.
+
+    """
+    blocks = {}
+    for dataset in datasets:
+        for block, scenes in dataset.scenes_by_block().items():
+            blocks.setdefault(block, []).extend(
+                os.path.join(dataset.root_directory, block, scene)
+                for scene in scenes)
+
+    plan = []
+    for block, sources in blocks.items():
+        zlen = len(str(len(sources)))
+        plan.extend(
+            (source, os.path.join(directory, block, str(n).zfill(zlen)))
+            for n, source in enumerate(sources, start=1))
+    return plan
+
+
+def _rename(source, target):
+    try:
+        os.rename(source, target)
+    except OSError as err:
+        # source and target on different filesystems
+        if err.errno != errno.EXDEV:
+            raise
+        shutil.move(source, target)
+
+
+def _put_scene(mode, source, target):
+    if mode == 'move':
+        _rename(source, target)
+    elif mode == 'copy':
+        shutil.copytree(source, target)
+    elif mode == 'symlink':
+        os.symlink(source, target)
+    else:
+        shutil.copytree(source, target, copy_function=os.link)
+
+
+def _remove_scene(mode, source, target):
+    if not os.path.lexists(target):
+        return
+
+    if mode == 'move':
+        _rename(target, source)
+    elif mode == 'symlink':
+        os.unlink(target)
+    else:
+        shutil.rmtree(target)
+
+
+def _remove_empty_block(block, directory):
+    """Removes `block` and its parents up to `directory` while empty"""
+    while (block != directory and os.path.isdir(block)
+           and not os.listdir(block)):
+        os.rmdir(block)
+        block = os.path.dirname(block)
+
+
+def _run(function, mode, plan, njobs):
+    with concurrent.futures.ThreadPoolExecutor(njobs) as executor:
+        # list() to raise the exceptions of the threads
+        list(executor.map(
+            lambda scene: function(mode, *scene), plan))
+
+
+def merge(datasets, directory, mode='move', njobs=8):
+    """Merges the `datasets` into `directory`, in `njobs` threads
+
+    `mode` is 'move', 'copy', 'symlink' or 'hardlink'. The merged dataset must
+    not contain any scene. The moved scenes leave empty blocks in the input
+    datasets.
+
+    """
+    if mode not in MODES:
+        raise ValueError(f'mode must be in {", ".join(MODES)}, it is {mode}')
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest):
+        raise ValueError(
+            f'{directory} has an interrupted merge, please undo it first')
+    if Dataset(directory).nscenes() != 0:
+        raise ValueError(f'{directory} is not an empty dataset')
+
+    plan = plan_merge(datasets, os.path.abspath(directory))
+    with open(manifest + '.tmp', 'w') as fout:
+        fout.write(json.dumps({'mode': mode, 'scenes': plan}) + '\n')
+    os.replace(manifest + '.tmp', manifest)
+
+    for block in {os.path.dirname(target) for _, target in plan}:
+        os.makedirs(block, exist_ok=True)
+    _run(_put_scene, mode, plan, njobs)
+
+    os.remove(manifest)
+
+
+def undo(directory, njobs=8):
+    """Undoes an interrupted merge into `directory` from its manifest
+
+    The blocks directories created by the merge are removed once empty.
+
+    """
+    directory = os.path.abspath(directory)
+    manifest = os.path.join(directory, MANIFEST)
+    if not os.path.isfile(manifest):
+        raise ValueError(f'{directory} has no merge to undo')
+
+    with open(manifest, 'r') as fin:
+        data = json.load(fin)
+    _run(_remove_scene, data['mode'], data['scenes'], njobs)
+
+    for block in {os.path.dirname(target) for _, target in data['scenes']}:
+        _remove_empty_block(block, directory)
+
+    os.remove(manifest)
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
-        description='Creates a new intphys dataset from several existing ones')
+        description=__doc__.split('\n')[0])
 
     parser.add_argument(
         'output_dataset', metavar='<output-dataset>',
@@ -90,38 +210,57 @@ def parse_args():
         'not contain an existing dataset)')
 
     parser.add_argument(
-        'input_datasets', nargs='+', metavar='<input-dataset>',
+        'input_datasets', nargs='*', metavar='<input-dataset>',
         help='directory with a dataset to move into <output-dataset>')
 
-    parser.add_argument(
-        '-c', '--copy', action='store_true',
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        '-c', '--copy', action='store_const', dest='mode', const='copy',
         help='copy the input datasets to the output (default is to move them)')
+    group.add_argument(
+        '-s', '--symlink', action='store_const', dest='mode', const='symlink',
+        help='symlink the scenes of the input datasets in the output')
+    group.add_argument(
+        '-l', '--hardlink', action='store_const', dest='mode',
+        const='hardlink',
+        help='hardlink the files of the input datasets in the output (the '
+        'datasets must be on the same filesystem)')
+    group.add_argument(
+        '-u', '--undo', action='store_true',
+        help='undo an interrupted merge into <output-dataset>')
+
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=8, metavar='<int>',
+        help='number of threads, default is %(default)s')
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.undo and not args.input_datasets:
+        parser.error('no input dataset to merge')
+    return args
 
 
 def main():
     args = parse_args()
 
     output = os.path.abspath(args.output_dataset)
+    if args.undo:
+        print('undoing the merge into {} ...'.format(output))
+        undo(output, njobs=args.jobs)
+        return
+
     print('merging {} datasets into {} ...'.format(
         len(args.input_datasets), output))
 
-    if os.path.exists(output):
-        if not os.path.isdir(output):
-            raise ValueError(f'{output} exists but is not a directory')
-        if Dataset(output).nscenes() != 0:
-            raise ValueError(f'{output} is not an empty dataset')
-    else:
-        os.makedirs(output)
+    if os.path.exists(output) and not os.path.isdir(output):
+        raise ValueError(f'{output} exists but is not a directory')
 
+    mode = args.mode or 'move'
     datasets = [Dataset(d) for d in args.input_datasets]
-    for dataset in datasets:
-        dataset.merge_into(output, copy=args.copy)
-        if not args.copy:
-            shutil.rmtree(dataset.root_directory)
+    merge(datasets, output, mode=mode, njobs=args.jobs)
 
-    Dataset(output).normalize()
+    if mode == 'move':
+        for dataset in datasets:
+            shutil.rmtree(dataset.root_directory)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Shows the top causes of the scenes restarts across several runs
+
+Each run of intphys writes a 'restarts.json' report in its output directory
+(or 'restarts_<instance>.json' reports when run with --jobs) detailing the
+reason of each restarted scene. This script aggregates the reports found in
+the given files or directories and displays the most frequent causes, to know
+which generator parameters waste rendering time.
+
+Exemple::
+
+    ./restart_causes.py data1 data2 --by actors --top 5
+
+"""
+
+import argparse
+import collections
+import glob
+import json
+import os
+import re
+
+
+# the keys on which the restarts can be grouped
+GROUPS = {
+    'cause': lambda r: (r['cause'],),
+    'actors': lambda r: (
+        r['cause'], _actor_class(r.get('actor')),
+        _actor_class(r.get('other'))),
+    'scene': lambda r: (r['cause'], r['category'], r['name']),
+    'preroll': lambda r: (
+        r['cause'], 'preroll' if r.get('preroll') else 'capture')}
+
+
+def _actor_class(name):
+    """Strips the instance number from an actor name
+
+    'Object_C_3' -> 'object_c', returns '-' if there is no actor.
+
+    """
+    if not name:
+        return '-'
+    return re.sub(r'_\d+$', '', name).lower()
+
+
+def find_reports(paths):
+    """Returns the list of restarts reports found in `paths`
+
+    `paths` are reports files or directories searched recursively.
+
+    """
+    reports = []
+    for path in paths:
+        if os.path.isfile(path):
+            reports.append(path)
+        elif os.path.isdir(path):
+            reports += sorted(glob.glob(
+                os.path.join(path, '**', 'restarts*.json'), recursive=True))
+        else:
+            raise ValueError(f'{path} is not an existing file or directory')
+    return reports
+
+
+def aggregate(reports, by='cause'):
+    """Returns the number of scenes and the restarts counted by group
+
+    Parameters
+    ----------
+    reports : list of str
+        The restarts reports to aggregate
+    by : str
+        The grouping of the restarts, must be in GROUPS
+
+    Returns
+    -------
+    total_scenes : int
+        The number of scenes rendered in all the reports
+    counts : collections.Counter
+        The number of restarts for each group
+
+    """
+    total_scenes = 0
+    counts = collections.Counter()
+    for report in reports:
+        data = json.load(open(report, 'r'))
+        total_scenes += data['total_scenes']
+        counts.update(GROUPS[by](r) for r in data['restarts'])
+    return total_scenes, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'paths', nargs='+', metavar='<path>',
+        help='a restarts report or a directory to search reports in')
+    parser.add_argument(
+        '-b', '--by', choices=sorted(GROUPS.keys()), default='cause',
+        help='group the restarts by cause only, by cause and involved '
+        'actors, by cause and scene, or by cause and pre-roll/capture pass, '
+        'default is %(default)s')
+    parser.add_argument(
+        '-t', '--top', type=int, default=10, metavar='<int>',
+        help='number of groups to display, default is %(default)s')
+    args = parser.parse_args()
+
+    reports = find_reports(args.paths)
+    if not reports:
+        print('no restarts report found')
+        return
+
+    total_scenes, counts = aggregate(reports, by=args.by)
+    total_restarts = sum(counts.values())
+    print('{} restarts for {} scenes ({:.1f}%) in {} reports'.format(
+        total_restarts, total_scenes,
+        100 * total_restarts / total_scenes if total_scenes else 0,
+        len(reports)))
+
+    for group, count in counts.most_common(args.top):
+        print('{:>8} {:>6.1f}%  {}'.format(
+            count, 100 * count / total_restarts, ' / '.join(group)))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,7 @@ import random
 import shutil
 
 
-def shuffle_test_scenes(data_directory):
+def shuffle_test_scenes(data_directory, dataset='test'):
     """Shuffle possible/impossible runs in test scenes
 
     The test scenes are saved in 4 subdirectories 1, 2, 3 and 4, where 1
@@ -20,7 +20,6 @@ def shuffle_test_scenes(data_directory):
     dataset respectively.
 
     """
-    dataset = 'test'
     test_dir = os.path.join(data_directory, dataset)
     if not os.path.isdir(test_dir):
         # no test scene, nothing to do
@@ -60,9 +59,12 @@ def shuffle_test_scenes(data_directory):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('data_directory')
+    parser.add_argument(
+        '--dataset', choices=['test', 'dev'], default='test',
+        help='the dataset to shuffle, default is %(default)s')
 
     args = parser.parse_args()
-    shuffle_test_scenes(args.data_directory)
+    shuffle_test_scenes(args.data_directory, dataset=args.dataset)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Samples train scenes parameters offline and reports their distributions
+
+This script imports the train scenes generator (Content/Scripts/train.py)
+against a stub of the `unreal_engine` module (Tools/fake_unreal), so that the
+scenes parameters can be sampled without Unreal Engine and without any
+physics. The actors are not spawned in a world: the overlaps between the
+occluders, objects and walls are tested on their axis-aligned bounding boxes,
+estimated from the meshes extents in MESH_EXTENTS.
+
+The scenes are sampled in parallel on all the cores and the distributions of
+the number of objects and occluders, the objects scales, the initial forces
+magnitudes and the collision points are reported, along with the spawn
+acceptance rates (see Content/Scripts/tools/spawn_stats.py). This is useful
+to tune the Train.generate_* methods without rendering any scene.
+
+Exemple::
+
+    ./simulate_scenarios.py 1000000 --jobs 8 --seed 0
+
+"""
+
+import argparse
+import collections
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+
+INTPHYS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# the extents of the meshes (length, width, height) at scale 1, in cm. The
+# objects are centered on their location, the occluders and walls start from
+# their location (bottom corner).
+MESH_EXTENTS = {
+    'Object': (100, 100, 100),
+    'Occluder': (400, 20, 200),
+    'Wall': (400, 10, 400)}
+
+# the number of scenes sampled by a worker in a single task
+CHUNK_SIZE = 5000
+
+
+def _setup_imports():
+    """Makes the fake unreal_engine and the intphys scripts importable"""
+    os.environ.setdefault('INTPHYS_ROOT', INTPHYS_ROOT)
+    for path in (os.path.join(INTPHYS_ROOT, 'Content', 'Scripts'),
+                 os.path.join(INTPHYS_ROOT, 'Tools', 'fake_unreal')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+class Distribution:
+    """Streaming histogram of values in [low, high] with moments
+
+    The values out of [low, high] are counted in the first or last bin.
+    Distributions computed in parallel are combined with merge().
+
+    """
+    def __init__(self, low, high, nbins=50):
+        self.low = low
+        self.high = high
+        self.bins = [0] * nbins
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        index = int((value - self.low) / (self.high - self.low)
+                    * len(self.bins))
+        self.bins[min(max(index, 0), len(self.bins) - 1)] += 1
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+    @property
+    def std(self):
+        return math.sqrt(max(self.squares / self.count - self.mean ** 2, 0))
+
+    def percentile(self, q):
+        """Returns the lower edge of the bin containing the `q` percentile"""
+        threshold = q / 100 * self.count
+        cumulated = 0
+        for index, count in enumerate(self.bins):
+            cumulated += count
+            if cumulated >= threshold:
+                break
+        return self.low + index * (self.high - self.low) / len(self.bins)
+
+    def summary(self):
+        if not self.count:
+            return 'no value'
+        return (
+            'n={} mean={:.3g} std={:.3g} min={:.3g} p5={:.3g} p50={:.3g} '
+            'p95={:.3g} max={:.3g}'.format(
+                self.count, self.mean, self.std, self.min,
+                self.percentile(5), self.percentile(50),
+                self.percentile(95), self.max))
+
+    def histogram(self, width=40):
+        """Returns the histogram as text lines"""
+        peak = max(self.bins) or 1
+        step = (self.high - self.low) / len(self.bins)
+        return ['{:>10.3g} {:>9} {}'.format(
+            self.low + i * step, count, '#' * int(width * count / peak))
+            for i, count in enumerate(self.bins) if count]
+
+
+def new_distributions():
+    """Returns the distributions reported by the simulation"""
+    return {
+        'objects per scene': Distribution(0, 4, 4),
+        'occluders per scene': Distribution(0, 3, 3),
+        'object scale': Distribution(0.5, 3),
+        'occluder height scale': Distribution(0, 3.5),
+        'log10 object force': Distribution(0, 6),
+        'collision point x': Distribution(0, 1100),
+        'collision point y': Distribution(-400, 400)}
+
+
+class _FakeActor:
+    """An actor reduced to its bounding box"""
+    def __init__(self, bounding_box=None):
+        self.actor = self
+        self.bounding_box = bounding_box
+
+    def park(self):
+        pass
+
+
+class _FakeWalls:
+    """The front, left and right walls reduced to their bounding boxes"""
+    def __init__(self, params):
+        _, width, height = MESH_EXTENTS['Wall']
+        top = params.z + height * params.height
+        half = params.length / 2
+        self.front = _FakeActor((
+            (params.depth - width, -half, params.z),
+            (params.depth, half, top)))
+        self.left = _FakeActor((
+            (0, -half - width, params.z), (params.depth, -half, top)))
+        self.right = _FakeActor((
+            (0, half, params.z), (params.depth, half + width, top)))
+        self.actor = self
+
+    def park(self):
+        pass
+
+
+def _bounding_box(kind, params):
+    """Returns the bounding box of an object or occluder from its params"""
+    extents = MESH_EXTENTS[kind]
+    sx = extents[0] * params.scale.x
+    sy = extents[1] * params.scale.y
+    sz = extents[2] * params.scale.z
+
+    # the footprint of the mesh rotated by the yaw angle
+    yaw = math.radians(params.rotation.yaw)
+    dx = abs(math.cos(yaw)) * sx + abs(math.sin(yaw)) * sy
+    dy = abs(math.sin(yaw)) * sx + abs(math.cos(yaw)) * sy
+
+    loc = params.location
+    if kind == 'Object':
+        return ((loc.x - dx / 2, loc.y - dy / 2, loc.z - sz / 2),
+                (loc.x + dx / 2, loc.y + dy / 2, loc.z + sz / 2))
+    return ((loc.x - dx / 2, loc.y - dy / 2, loc.z),
+            (loc.x + dx / 2, loc.y + dy / 2, loc.z + sz))
+
+
+class FakePool:
+    """Replaces tools.pool.ActorPool, spawning fake actors"""
+    def spawn(self, actor_class, params):
+        kind = actor_class.__name__
+        if kind == 'Walls':
+            actor = _FakeWalls(params)
+        elif kind in MESH_EXTENTS:
+            actor = _FakeActor(_bounding_box(kind, params))
+        else:
+            actor = _FakeActor()
+        actor.is_valid = True
+        return actor
+
+    def release(self, actor):
+        pass
+
+
+def simulate(task):
+    """Samples `nscenes` train scenes from `seed`, returns their statistics"""
+    seed, nscenes = task
+    _setup_imports()
+
+    import random
+    from train import Train
+    from tools import spawn_stats
+
+    random.seed(seed)
+    spawn_stats.reset()
+    pool = FakePool()
+    distributions = new_distributions()
+    scenarios = collections.Counter()
+    failed = 0
+
+    for _ in range(nscenes):
+        scene = Train(None, None, pool=pool)
+        scene.spawn_actors()
+        scene.generate_spawn_moving_actors()
+        if not scene.is_valid():
+            failed += 1
+            continue
+
+        scenarios[scene.scenario] += 1
+        objects = [p for k, p in scene.params.items() if 'object' in k]
+        occluders = [p for k, p in scene.params.items() if 'occluder' in k]
+
+        distributions['objects per scene'].add(len(objects))
+        distributions['occluders per scene'].add(len(occluders))
+        for params in objects:
+            distributions['object scale'].add(params.scale.x)
+            force = params.initial_force
+            magnitude = math.sqrt(force.x ** 2 + force.y ** 2 + force.z ** 2)
+            if magnitude:
+                distributions['log10 object force'].add(math.log10(magnitude))
+        for params in occluders:
+            distributions['occluder height scale'].add(params.scale.z)
+        distributions['collision point x'].add(scene.collision_point.x)
+        distributions['collision point y'].add(scene.collision_point.y)
+
+    return distributions, scenarios, failed, spawn_stats.get_statistics()
+
+
+def merge_spawn_statistics(total, stats):
+    """Adds the spawn statistics `stats` to `total`"""
+    for scenario, kinds in stats['actors'].items():
+        for kind, actor in kinds.items():
+            entry = total['actors'].setdefault(scenario, {}).setdefault(
+                kind, collections.Counter())
+            entry.update({k: actor[k] for k in (
+                'attempts', 'accepted', 'rejected')})
+    for scenario, layout in stats['layouts'].items():
+        total['layouts'].setdefault(scenario, collections.Counter()).update(
+            {k: layout[k] for k in ('layouts', 'accepted')})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'nscenes', type=int, metavar='<int>',
+        help='number of train scenes to sample')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count(), metavar='<int>',
+        help='number of parallel workers, default is %(default)s')
+    parser.add_argument(
+        '-s', '--seed', type=int, default=0, metavar='<int>',
+        help='random seed, default is %(default)s')
+    parser.add_argument(
+        '--histograms', action='store_true',
+        help='display the histograms of the distributions')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    tasks = [(args.seed + i, min(CHUNK_SIZE, args.nscenes - start))
+             for i, start in enumerate(range(0, args.nscenes, CHUNK_SIZE))]
+
+    start_time = time.time()
+    distributions = new_distributions()
+    scenarios = collections.Counter()
+    failed = 0
+    spawn = {'actors': {}, 'layouts': {}}
+    with multiprocessing.Pool(args.jobs) as pool:
+        for dists, scen, fail, stats in pool.imap_unordered(simulate, tasks):
+            for name, dist in dists.items():
+                distributions[name].merge(dist)
+            scenarios.update(scen)
+            failed += fail
+            merge_spawn_statistics(spawn, stats)
+    elapsed = time.time() - start_time
+
+    print('sampled {} scenes in {:.1f}s ({:.0f} scenes/min on {} workers), '
+          '{} failed to spawn'.format(
+              args.nscenes, elapsed, 60 * args.nscenes / elapsed, args.jobs,
+              failed))
+
+    print('scenarios: {}'.format(', '.join(
+        '{} {:.1f}%'.format(s, 100 * n / sum(scenarios.values()))
+        for s, n in scenarios.most_common())))
+
+    for name, dist in distributions.items():
+        print('{}: {}'.format(name, dist.summary()))
+        if args.histograms:
+            print('\n'.join(dist.histogram()))
+
+    print('spawn acceptance (accepted/attempts):')
+    for scenario, layout in sorted(spawn['layouts'].items()):
+        print('  {} layouts: {}/{}'.format(
+            scenario, layout['accepted'], layout['layouts']))
+        for kind, actor in sorted(spawn['actors'].get(scenario, {}).items()):
+            print('    {}: {}/{} ({:.1f}%)'.format(
+                kind, actor['accepted'], actor['attempts'],
+                100 * actor['accepted'] / actor['attempts']))
+
+
+if __name__ == '__main__':
+    main()
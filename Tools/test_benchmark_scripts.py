@@ -0,0 +1,93 @@
+"""Benchmarks of the Python side of the scenes rendering, with pytest-benchmark
+
+The Director renders train scenes in the fake world of Tools/fake_unreal (see
+benchmark_scripts.py). The benchmarks measure the overhead of a tick, of a
+full scene and of Saver.save, the smoke test checks that scenes complete.
+
+Run it with ``pytest Tools/test_benchmark_scripts.py``, the benchmarks
+require the pytest-benchmark plugin and are skipped without it.
+
+"""
+
+import copy
+import importlib.util
+
+import pytest
+
+import benchmark_scripts
+
+
+benchmark_scripts._setup_imports()
+
+requires_benchmark = pytest.mark.skipif(
+    importlib.util.find_spec('pytest_benchmark') is None,
+    reason='pytest-benchmark is not installed')
+
+# the scenes rendered by the benchmarks, at the default resolution and
+# number of frames of intphys.py
+SIZE = (288, 288, 100)
+PAUSE_DURATION = 2
+
+
+def _step(world, director):
+    """Ticks the fake world and then the director, as UE does"""
+    world.tick(benchmark_scripts.TICK_DURATION)
+    director.tick(benchmark_scripts.TICK_DURATION)
+
+
+def _render_scene(world, director):
+    """Ticks until the current scene is rendered (restarts included)"""
+    index = director.current_scene_index
+    while director.current_scene_index == index:
+        _step(world, director)
+
+
+def test_run_dry():
+    ticks, scenes, restarts = benchmark_scripts.run(
+        2, (32, 32, 10), None, seed=0, pause_duration=2, preroll=False)
+
+    assert len(scenes) == 2
+    assert restarts == 0
+    assert ticks and all(tick >= 0 for tick in ticks)
+
+
+@requires_benchmark
+def test_director_tick(benchmark):
+    # about 10 scenes are rendered in 2000 ticks, starts and stops included
+    world, director = benchmark_scripts.create_director(
+        50, SIZE, None, 0, PAUSE_DURATION, False)
+    benchmark.pedantic(
+        _step, args=(world, director), rounds=2000, iterations=1)
+
+
+@requires_benchmark
+def test_scene(benchmark, tmp_path):
+    world, director = benchmark_scripts.create_director(
+        10, SIZE, str(tmp_path), 0, PAUSE_DURATION, False)
+
+    # the first scene spawns the actors, the next ones reuse them
+    _render_scene(world, director)
+    benchmark.pedantic(
+        _render_scene, args=(world, director), rounds=8, iterations=1)
+
+
+@requires_benchmark
+def test_saver_save(benchmark, tmp_path):
+    world, director = benchmark_scripts.create_director(
+        1, SIZE, str(tmp_path / 'dataset'), 0, PAUSE_DURATION, False)
+
+    # capture a whole scene, stopping before it is saved
+    while director.ticker <= director.max_tick:
+        _step(world, director)
+    saver = director.saver
+    saver.set_status_header(director.current_scene.get_status_header())
+
+    # the status is post-processed in place, save a fresh copy each round
+    header, status = saver.status_header, saver.status
+
+    def setup():
+        saver.status_header = copy.deepcopy(header)
+        saver.status = copy.deepcopy(status)
+
+    benchmark.pedantic(
+        saver.save, args=(str(tmp_path / 'scene'),), setup=setup, rounds=20)
@@ -16,15 +16,19 @@ To see command-line arguments, have a::
 
 import argparse
 import copy
+import datetime
 import json
 import logging
+import logging.handlers
 import os
 import re
 import shlex
 import shutil
 import subprocess
 import sys
+import tempfile
 import threading
+import time
 
 # absolute path to the directory containing this script
 INTPHYS_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -40,6 +44,29 @@ except KeyError:
 # the default screen resolution (in pixels)
 DEFAULT_RESOLUTION = '288x288'
 
+# the filters that can be applied on PNG images before compression
+PNG_FILTERS = ('default', 'none', 'sub', 'up', 'avg', 'paeth', 'all')
+
+# the tag of progress events in the log (see Content/Scripts/tools/utils.py)
+EVENT_TAG = 'INTPHYS_EVENT '
+
+# patterns used to classify the Unreal log lines at bytes level, before any
+# decoding. The lines with one of the KEPT patterns are displayed, excepted
+# those with one of the INHIBITED patterns (see IsRelevantLine)
+_EVENT_TAG_BYTES = EVENT_TAG.encode()
+_KEPT_PATTERNS = (b'LogPython', b'Error')
+_INHIBITED_PATTERNS = (
+    b'Using binned.',
+    b'per-process limit of core file size to infinity.',
+    b'depot+UE4-Releases')
+
+# maximal size of the raw log file (in bytes) and number of rotated files
+RAW_LOG_MAX_BYTES = 100 * 1024 * 1024
+RAW_LOG_BACKUP_COUNT = 5
+
+# maximal number of times a crashed instance is restarted in --jobs mode
+MAX_RESTARTS = 3
+
 
 def intphys_binaries():
     """Returns the list of packaged intphys programs as absolute paths"""
@@ -65,11 +92,11 @@ class LogUnrealFormatter(LogStripFormatter):
     def format(self, record):
         # remove all content before and including the second ':' (this
         # strip off the date and id from Unreal log messages)
-        try:
-            record.msg = record.msg[
-                [m.start() for m in re.finditer(':', record.msg)][1]+1:]
-        except IndexError:
-            pass
+        index = record.msg.find(':')
+        if index != -1:
+            index = record.msg.find(':', index + 1)
+            if index != -1:
+                record.msg = record.msg[index + 1:]
 
         return super(LogUnrealFormatter, self).format(record)
 
@@ -80,41 +107,44 @@ class LogNoEmptyMessageFilter(logging.Filter):
         return len(record.getMessage().strip())
 
 
-class LogNoStartupMessagesFilter(logging.Filter):
-    """Removes luatorch import messages and unreal startup messages"""
-    def filter(self, record):
-        msg = record.getMessage()
-        return not (
-            'Using binned.' in msg or
-            'per-process limit of core file size to infinity.' in msg or
-            'depot+UE4-Releases' in msg)
+def IsRelevantLine(line):
+    """Returns True if the Unreal log `line` (as bytes) must be displayed
 
+    The lines with 'Error', 'LogPython' or 'LogTemp' are kept, excepted the
+    Unreal startup messages. The lines are classified by _Run before being
+    decoded and logged, so the loggers do not filter them again.
 
-class LogInhibitUnrealFilter(logging.Filter):
-    """Inhibits some unrelevant Unreal log messages
+    """
+    if not (any(p in line for p in _KEPT_PATTERNS) or (
+            b'LogTemp' in line and b'Display: Loaded TP' not in line)):
+        return False
 
-    Messages containing 'Error' or 'LogPython' are kept, other are
-    removed from the Unreal Engine log (messages like
-    "[data][id]message")
+    return not any(p in line for p in _INHIBITED_PATTERNS)
 
-    """
-    def filter(self, record):
-        msg = record.getMessage()
 
-        # filter out empty messages
-        if not msg.strip():
-            return False
+def GetRawLogger(filename):
+    """Returns a logger writing raw messages in the rotating file `filename`"""
+    log = logging.getLogger('intphys.raw.' + os.path.abspath(filename))
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+
+    # the logger may have been configured already by a previous run
+    if not log.handlers:
+        handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=RAW_LOG_MAX_BYTES,
+            backupCount=RAW_LOG_BACKUP_COUNT)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
 
-        # keep only messages with Error, logPython and LogTemp
-        return 'LogPython' in msg or 'Error' in msg or (
-            'LogTemp' in msg and 'Display: Loaded TP' not in msg)
+    return log
 
 
 def GetLogger(verbose=False, name=None):
     """Returns a logger configured to filter Unreal log messages
 
-    If `verbose` is True, do not filter any message, if `verbose` is
-    False (default), keep only relevant messages).
+    If `verbose` is True, keep the messages as is, if `verbose` is False
+    (default), strip the date and id of the Unreal messages. The irrelevant
+    Unreal messages are discarded upstream by _Run (see IsRelevantLine).
 
     If `name` is not None, prefix all messages with it.
 
@@ -126,8 +156,6 @@ def GetLogger(verbose=False, name=None):
     log.addFilter(LogNoEmptyMessageFilter())
 
     if not verbose:
-        log.addFilter(LogInhibitUnrealFilter())
-        log.addFilter(LogNoStartupMessagesFilter())
         formatter = LogUnrealFormatter(msg)
     else:
         formatter = LogStripFormatter(msg)
@@ -141,6 +169,181 @@ def GetLogger(verbose=False, name=None):
     return log
 
 
+class RunMetrics:
+    """Monitors the rendering from the progress events in the log
+
+    The events are emitted by the Director as 'INTPHYS_EVENT {json}' log
+    lines. They are counted to report the number of rendered and restarted
+    scenes, the throughput and the estimated remaining time. The reports are
+    printed on stdout (they are not Unreal messages and would be filtered out
+    by the logger).
+
+    If `metrics_file` is not None, the metrics are written in it in the
+    Prometheus text format at each event (to be exported by a node exporter
+    textfile collector).
+
+    If `name` is not None, the reports are prefixed with it and the metrics
+    are labelled with instance="`name`" (this is used by the --jobs mode).
+
+    The completed scenes events are kept in `completed`. The Director emits
+    them once the images of the scene are written, the events following an
+    error are ignored as the instance is killed (see _Run).
+
+    """
+    def __init__(self, metrics_file=None, name=None):
+        self.metrics_file = metrics_file
+        self.name = name
+        # a monotonic clock, the durations do not jump when the wall clock
+        # is adjusted
+        self.start_time = time.monotonic()
+        self.total = 0
+        self.done = 0
+        self.restarted = 0
+        self.restart_causes = {}
+        self.categories = {}
+        self.completed = []
+
+    def parse(self, line):
+        """Updates the metrics from a log line
+
+        Returns True if the line is an event, False otherwise (including
+        malformed events, truncated or interleaved with other messages).
+
+        """
+        index = line.find(EVENT_TAG)
+        if index == -1:
+            return False
+
+        try:
+            event = json.loads(line[index + len(EVENT_TAG):])
+            kind = event.get('event')
+            if kind == 'start':
+                # when restarted on the remaining scenes, the scenes already
+                # done are not part of the total
+                total = self.done + event['total']
+            elif kind == 'scene':
+                category = event['category']
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+        if kind == 'start':
+            self.total = total
+        elif kind == 'scene':
+            self.done += 1
+            self.completed.append(event)
+            self.categories[category] = self.categories.get(category, 0) + 1
+            self._print('progress: {}'.format(self.summary()))
+        elif kind == 'restart':
+            self.restarted += 1
+            cause = event.get('cause', 'unknown')
+            self.restart_causes[cause] = self.restart_causes.get(cause, 0) + 1
+
+        if self.metrics_file:
+            self.write_metrics()
+        return True
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.start_time
+
+    @property
+    def scenes_per_hour(self):
+        return 3600 * self.done / self.elapsed if self.done else 0.0
+
+    @property
+    def restart_ratio(self):
+        attempts = self.done + self.restarted
+        return self.restarted / attempts if attempts else 0.0
+
+    @property
+    def eta(self):
+        if not self.done:
+            return None
+        return (self.total - self.done) * self.elapsed / self.done
+
+    def summary(self):
+        eta = self.eta
+        return (
+            '{}/{} scenes, {:.1f} scenes/h, {:.1f}% restarted, ETA {}'.format(
+                self.done, self.total, self.scenes_per_hour,
+                100 * self.restart_ratio,
+                'unknown' if eta is None else
+                datetime.timedelta(seconds=int(eta))))
+
+    def _print(self, message):
+        print('{}: {}'.format(self.name, message) if self.name else message)
+
+    def _metric(self, metric, value, **labels):
+        if self.name:
+            labels['instance'] = self.name
+        if labels:
+            metric += '{{{}}}'.format(','.join(
+                '{}="{}"'.format(k, v) for k, v in sorted(labels.items())))
+        return '{} {}'.format(metric, value)
+
+    def write_metrics(self):
+        lines = [
+            '# TYPE intphys_scenes_total gauge',
+            self._metric('intphys_scenes_total', self.total),
+            '# TYPE intphys_scenes_done counter',
+            self._metric('intphys_scenes_done', self.done)]
+        lines += ['# TYPE intphys_category_scenes_done counter']
+        lines += [
+            self._metric('intphys_category_scenes_done', n, category=c)
+            for c, n in sorted(self.categories.items())]
+        lines += [
+            '# TYPE intphys_scenes_restarted counter',
+            self._metric('intphys_scenes_restarted', self.restarted)]
+        lines += ['# TYPE intphys_cause_scenes_restarted counter']
+        lines += [
+            self._metric('intphys_cause_scenes_restarted', n, cause=c)
+            for c, n in sorted(self.restart_causes.items())]
+        lines += [
+            '# TYPE intphys_scenes_per_hour gauge',
+            self._metric('intphys_scenes_per_hour', self.scenes_per_hour),
+            '# TYPE intphys_restart_ratio gauge',
+            self._metric('intphys_restart_ratio', self.restart_ratio),
+            '# TYPE intphys_elapsed_seconds gauge',
+            self._metric('intphys_elapsed_seconds', self.elapsed)]
+        if self.eta is not None:
+            lines += [
+                '# TYPE intphys_eta_seconds gauge',
+                self._metric('intphys_eta_seconds', self.eta)]
+
+        # write in a temp file and rename it, so that the collector never
+        # reads a partial file
+        tmp_file = self.metrics_file + '.tmp'
+        with open(tmp_file, 'w') as fout:
+            fout.write('\n'.join(lines) + '\n')
+        os.replace(tmp_file, self.metrics_file)
+
+    def report(self):
+        """Logs a final report of the run"""
+        self._print('rendered {} scenes in {} ({})'.format(
+            self.done, datetime.timedelta(seconds=int(self.elapsed)),
+            self.summary()))
+        for category, count in sorted(self.categories.items()):
+            self._print('  {}: {} scenes'.format(category, count))
+        for cause, count in sorted(
+                self.restart_causes.items(), key=lambda c: -c[1]):
+            self._print('  restarted on {}: {} scenes'.format(cause, count))
+
+
+def _PngSettings(name, values):
+    """Returns a new list of the 3 PNG settings given by `values`
+
+    A single value is used for the scene, depth and masks images.
+
+    """
+    if len(values) == 1:
+        return values * 3
+    if len(values) != 3:
+        raise ValueError(
+            'PNG {} must have 1 or 3 values: {}'.format(
+                name, ','.join(values)))
+    return list(values)
+
+
 def ParseArgs():
     """Defines a commndline argument parser and returns the parsed arguments"""
 
@@ -179,6 +382,71 @@ def ParseArgs():
         help=('duration of the pause at the beginning of each run '
               '(in number of ticks), default is %(default)s'))
 
+    parser.add_argument(
+        '--adaptive-pause', action='store_true', help=(
+            'end the pause at the beginning of each run as soon as the '
+            'textures are loaded, --pause-duration being an upper bound'))
+
+    parser.add_argument(
+        '--png-compression', default='-1',
+        metavar='<level>[,<level>,<level>]', help=(
+            'zlib compression level of the saved PNG images, from 0 '
+            '(fastest) to 9 (smallest), -1 for zlib default. Give one level '
+            'for all the images or three levels for scene, depth and masks '
+            'respectively, default is %(default)s'))
+
+    parser.add_argument(
+        '--png-filter', default='default',
+        metavar='<filter>[,<filter>,<filter>]', help=(
+            'filter applied on the saved PNG images before compression, '
+            'must be in {}. Give one filter for all the images or three '
+            'filters for scene, depth and masks respectively, default is '
+            '%(default)s'.format(', '.join(PNG_FILTERS))))
+
+    parser.add_argument(
+        '--fixed-fps', default=None, metavar='<int>', type=int, help=(
+            'simulate the scenes with a fixed timestep of 1/<int> seconds '
+            'as fast as possible (instead of real time), the world being '
+            'rendered only for the captured frames. Not supported with '
+            '--editor'))
+
+    parser.add_argument(
+        '--preroll', action='store_true', help=(
+            'simulate each train scene without capture before rendering it, '
+            'so that the scenes becoming invalid are restarted without '
+            'wasting captures'))
+
+    parser.add_argument(
+        '--raw-dump', action='store_true', help=(
+            'save uncompressed raw images instead of PNG, this is the '
+            'fastest capture mode'))
+
+    parser.add_argument(
+        '--profile', action='store_true', help=(
+            'measure the time spent in each stage of the rendering, the '
+            'timings are saved in <output-dir>/profile.jsonl and summarized '
+            'at exit'))
+
+    parser.add_argument(
+        '--metrics-file', metavar='<file>', default=None, help=(
+            'write the progress metrics (rendered and restarted scenes, '
+            'throughput, ETA) in <file> in the Prometheus text format, '
+            'updated along the run'))
+
+    parser.add_argument(
+        '--log-file', metavar='<file>', default=None, help=(
+            'write the complete Unreal log in <file>, rotated every {} MB, '
+            'the console displays only the relevant messages'.format(
+                RAW_LOG_MAX_BYTES // (1024 * 1024))))
+
+    parser.add_argument(
+        '-j', '--jobs', default=1, metavar='<int>', type=int, help=(
+            'run <int> instances of the packaged game in parallel, each one '
+            'pinned to its own CPUs, and merge their datasets in '
+            '<output-dir>. A crashed instance is restarted on its remaining '
+            'scenes. The --metrics-file and --log-file are suffixed by the '
+            'instance number, default is %(default)s'))
+
     parser.add_argument(
         '-f', '--force', action='store_true',
         help='overwrite <output-dir>, any existing content is erased')
@@ -207,16 +475,85 @@ def ParseArgs():
             'resolution is not in <width>x<height> format'
             '(e.g. "800x600"): {}'.format(args.resolution))
 
+    # one compression setting for each of scene, depth and masks images
+    args.png_compression = _PngSettings(
+        'compression', args.png_compression.split(','))
+    args.png_filter = _PngSettings('filter', args.png_filter.split(','))
+
+    for level in args.png_compression:
+        if level not in [str(n) for n in range(-1, 10)]:
+            raise ValueError(
+                'PNG compression must be in [-1, 9]: {}'.format(level))
+
+    for png_filter in args.png_filter:
+        if png_filter not in PNG_FILTERS:
+            raise ValueError(
+                'PNG filter must be in {}: {}'.format(
+                    ', '.join(PNG_FILTERS), png_filter))
+
+    if args.fixed_fps is not None and args.fixed_fps < 1:
+        raise ValueError('fixed fps must be a positive integer: {}'.format(
+            args.fixed_fps))
+
+    if args.fixed_fps and args.editor:
+        raise ValueError(
+            '--fixed-fps is only supported for a game, not with --editor')
+
+    if args.jobs < 1:
+        raise ValueError('jobs must be a positive integer: {}'.format(
+            args.jobs))
+
+    if args.jobs > 1 and (args.editor or args.standalone_game):
+        raise ValueError(
+            '--jobs is only supported for the packaged game, not with '
+            '--editor or --standalone-game')
+
     return args
 
 
+def CaptureEnvironment(args):
+    """Returns the environment variables configuring the rendering"""
+    environ = {
+        'INTPHYS_PNGCOMPRESSION': ','.join(args.png_compression),
+        'INTPHYS_PNGFILTER': ','.join(args.png_filter)}
+
+    if args.raw_dump:
+        environ['INTPHYS_RAWDUMP'] = '1'
+
+    if args.profile:
+        environ['INTPHYS_PROFILE'] = '1'
+
+    if args.adaptive_pause:
+        environ['INTPHYS_ADAPTIVEPAUSE'] = '1'
+
+    if args.fixed_fps:
+        environ['INTPHYS_FIXEDFPS'] = str(args.fixed_fps)
+
+    if args.preroll:
+        environ['INTPHYS_PREROLL'] = '1'
+
+    return environ
+
+
 def _Run(command, log, scenes_file, output_dir, cwd=None, seed=None,
          pause_duration=50, resolution=DEFAULT_RESOLUTION, headless=False,
-         debug=False):
+         debug=False, extra_environ=None, metrics_file=None, verbose=False,
+         log_file=None, metrics=None, cpus=None, exit_on_error=True):
     """Run `command` as a subprocess
 
-    The `command` stdout and stderr are forwarded to `log`. The
-    `command` runs with the following environment variables, in top of
+    The `command` stdout and stderr are forwarded to `log` (only the relevant
+    lines if `verbose` is False), excepted the progress events which are
+    parsed by `metrics` (a new RunMetrics instance writing them to
+    `metrics_file` if not specified) and reported at exit. If `log_file` is
+    specified, all the raw lines are written to it as well.
+
+    If `cpus` is a list of CPU ids, the `command` is pinned to them, with
+    memory allocated on their NUMA node when numactl is available.
+
+    When the `command` fails, exits with its return code if `exit_on_error`
+    is True, else returns it.
+
+    The `command` runs with the following environment variables, in top of
     the current environment:
 
     INTPHYS_SCENES is the absolute path to `SCENES_file`.
@@ -228,6 +565,9 @@ def _Run(command, log, scenes_file, output_dir, cwd=None, seed=None,
 
     INTPHYS_RESOLUTION is `resolution`
 
+    The variables in `extra_environ` (as returned by CaptureEnvironment)
+    are added as well.
+
     """
     # setup the environment variables used in python scripts
     environ = copy.deepcopy(os.environ)
@@ -235,6 +575,7 @@ def _Run(command, log, scenes_file, output_dir, cwd=None, seed=None,
     environ['INTPHYS_SCENES'] = os.path.abspath(scenes_file)
     environ['INTPHYS_RESOLUTION'] = resolution
     environ['INTPHYS_PAUSEDURATION'] = str(pause_duration)
+    environ.update(extra_environ or {})
 
     if headless is True:
         del environ['DISPLAY']
@@ -250,6 +591,17 @@ def _Run(command, log, scenes_file, output_dir, cwd=None, seed=None,
     if seed is not None:
         environ['INTPHYS_SEED'] = str(seed)
 
+    # pin the command to the cpus, with numactl if available (allocating the
+    # memory on the local NUMA node), or with the process affinity
+    preexec_fn = None
+    if cpus:
+        if shutil.which('numactl'):
+            command = 'numactl --physcpubind={} --localalloc {}'.format(
+                ','.join(str(c) for c in cpus), command)
+        else:
+            def preexec_fn():
+                os.sched_setaffinity(0, cpus)
+
     # run the command as a subprocess
     job = subprocess.Popen(
         shlex.split(command),
@@ -257,36 +609,73 @@ def _Run(command, log, scenes_file, output_dir, cwd=None, seed=None,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         cwd=cwd,
-        env=environ)
+        env=environ,
+        preexec_fn=preexec_fn)
+
+    if metrics is None:
+        metrics = RunMetrics(metrics_file=metrics_file)
+    raw_log = GetRawLogger(log_file) if log_file else None
 
     # join the command output to log (from
-    # https://stackoverflow.com/questions/35488927)
+    # https://stackoverflow.com/questions/35488927). The lines are classified
+    # as bytes and decoded only when needed. Once the job is killed on an
+    # error, the events still in the pipe are discarded: a scene reported
+    # after a failed write would be wrongly considered complete.
     def ConsumeLines(pipe, consume):
+        killed = False
         with pipe:
             # NOTE: workaround read-ahead bug
             for line in iter(pipe.readline, b''):
-                line = line.decode('utf8')
-                consume(line)
+                if raw_log:
+                    raw_log.info(line.decode('utf8', 'replace').rstrip())
+
+                if _EVENT_TAG_BYTES in line and (
+                        killed or metrics.parse(
+                            line.decode('utf8', 'replace'))):
+                    continue
+
+                if verbose or IsRelevantLine(line):
+                    consume(line.decode('utf8', 'replace'))
+
                 # exit the UE subprocess on the first encountered error
-                if 'Error:' in line and debug is False:
+                if b'Error:' in line and debug is False:
                     job.kill()
+                    killed = True
             consume('\n')
 
-    threading.Thread(
+    consumer = threading.Thread(
         target=ConsumeLines,
-        args=[job.stdout, lambda line: log.info(line)]).start()
+        args=[job.stdout, lambda line: log.info(line)])
+    consumer.start()
 
     # wait the job is finished, forwarding any error
     job.wait()
+    consumer.join()
+    metrics.report()
     if job.returncode:
         log.error('command "%s" returned with %s', command, job.returncode)
-        sys.exit(job.returncode)
+        if exit_on_error:
+            sys.exit(job.returncode)
+    return job.returncode
 
 
-def RunBinary(output_dir, scenes_file, seed=None,
-              resolution=DEFAULT_RESOLUTION, headless=False,
-              pause_duration=50, verbose=False, debug=False):
-    """Run the intphys packaged binary as a subprocess"""
+def _GameOptions(resolution, fixed_fps=None):
+    """Returns the command-line options of the game
+
+    The game runs in a window of the given `resolution`. If `fixed_fps` is
+    specified, the game runs in benchmark mode with a fixed timestep of
+    1/`fixed_fps` seconds, as fast as possible.
+
+    """
+    res = resolution.split('x')
+    options = ' -windowed ResX={} ResY={}'.format(res[0], res[1])
+    if fixed_fps:
+        options += ' -benchmark -fps={}'.format(fixed_fps)
+    return options
+
+
+def _BinaryCommand(resolution, fixed_fps=None):
+    """Returns the command running the packaged binary and its directory"""
     # overload binary if defined in the environment
     if 'INTPHYS_BINARY' in os.environ:
         intphys_binary = os.environ['INTPHYS_BINARY']
@@ -296,9 +685,6 @@ def RunBinary(output_dir, scenes_file, seed=None,
     if not os.path.isfile(intphys_binary):
         raise IOError('No such file: {}'.format(intphys_binary))
 
-    if not os.path.isfile(scenes_file):
-        raise IOError('Json file not found: {}'.format(scenes_file))
-
     print('running {}'.format(intphys_binary))
 
     # on packaged game, UnrealEnginePython expect the script to be in
@@ -306,17 +692,31 @@ def RunBinary(output_dir, scenes_file, seed=None,
     # where that relative path works.
     cwd = os.path.join(INTPHYS_ROOT, 'Package/LinuxNoEditor')
 
-    res = resolution.split('x')
-    _Run(intphys_binary + ' -windowed ResX={} ResY={}'.format(res[0], res[1]),
-         GetLogger(verbose=verbose),
+    return intphys_binary + _GameOptions(resolution, fixed_fps), cwd
+
+
+def RunBinary(output_dir, scenes_file, seed=None,
+              resolution=DEFAULT_RESOLUTION, headless=False,
+              pause_duration=50, verbose=False, debug=False,
+              extra_environ=None, metrics_file=None, log_file=None,
+              fixed_fps=None):
+    """Run the intphys packaged binary as a subprocess"""
+    if not os.path.isfile(scenes_file):
+        raise IOError('Json file not found: {}'.format(scenes_file))
+
+    command, cwd = _BinaryCommand(resolution, fixed_fps)
+    _Run(command, GetLogger(verbose=verbose),
          scenes_file, output_dir, seed=seed,
          pause_duration=pause_duration,
-         resolution=resolution, cwd=cwd, headless=headless, debug=debug)
+         resolution=resolution, cwd=cwd, headless=headless, debug=debug,
+         extra_environ=extra_environ, metrics_file=metrics_file,
+         verbose=verbose, log_file=log_file)
 
 
 def RunEditor(output_dir, scenes_file, seed=None,
               resolution=DEFAULT_RESOLUTION, verbose=False,
-              pause_duration=50, standalone_game=False):
+              pause_duration=50, standalone_game=False, extra_environ=None,
+              metrics_file=None, log_file=None, fixed_fps=None):
     """Run the intphys project within the UnrealEngine editor"""
     log = GetLogger(verbose=verbose)
 
@@ -332,11 +732,196 @@ def RunEditor(output_dir, scenes_file, seed=None,
 
     command = './UE4Editor ' + project
     if standalone_game:
-        res = resolution.split('x')
-        command += ' -game -windowed ResX={} ResY={}'.format(res[0], res[1])
+        command += ' -game' + _GameOptions(resolution, fixed_fps)
 
     _Run(command, log, scenes_file, output_dir, seed=seed,
-         pause_duration=pause_duration, resolution=resolution, cwd=editor_dir)
+         pause_duration=pause_duration, resolution=resolution, cwd=editor_dir,
+         extra_environ=extra_environ, metrics_file=metrics_file,
+         verbose=verbose, log_file=log_file)
+
+
+def _InstanceFile(filename, index):
+    """Returns `filename` suffixed by `index`, 'log.txt' -> 'log_1.txt'"""
+    if not filename:
+        return None
+    root, ext = os.path.splitext(filename)
+    return '{}_{}{}'.format(root, index, ext)
+
+
+def _SplitCpus(njobs):
+    """Returns `njobs` lists of CPU ids to pin the instances on
+
+    The CPUs available to the process are split in chunks of contiguous ids,
+    the CPUs left by the division are not used. If there are more jobs than
+    CPUs, the CPUs are shared.
+
+    """
+    cpus = sorted(os.sched_getaffinity(0))
+    if njobs >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(njobs)]
+
+    size = len(cpus) // njobs
+    return [cpus[i * size:(i + 1) * size] for i in range(njobs)]
+
+
+def _RemainingScenes(scenes, completed):
+    """Returns the `scenes` JSON dict minus the `completed` scenes events"""
+    remaining = copy.deepcopy(scenes)
+    for event in completed:
+        # the key is the path to the scene in the JSON, ['train'] or
+        # ['test', 'O1', 'occluded', 'dynamic_1'] for instance
+        *path, last = event['key']
+        data = remaining
+        for key in path:
+            data = data[key]
+        data[last] -= 1
+    return remaining
+
+
+def _CleanCrashedDataset(directory, completed):
+    """Keeps only the `completed` scenes in the dataset `directory`
+
+    The scenes being rendered or written when an instance crashed are
+    removed (a scene is completed only once its images are written) and, as
+    the instance did not reach its end, the runs of the test scenes are
+    shuffled here.
+
+    """
+    from merge_datasets import Dataset
+    from shuffle_test import shuffle_test_scenes
+
+    subdirs = {event['subdir'] for event in completed}
+    for scene in list(Dataset(directory).scenes()):
+        if scene not in subdirs:
+            shutil.rmtree(os.path.join(directory, scene))
+
+    for dataset in ('test', 'dev'):
+        shuffle_test_scenes(directory, dataset=dataset)
+
+
+def RunParallel(output_dir, scenes_file, njobs, seed=None,
+                resolution=DEFAULT_RESOLUTION, headless=False,
+                pause_duration=50, verbose=False, debug=False,
+                extra_environ=None, metrics_file=None, log_file=None,
+                fixed_fps=None):
+    """Run `njobs` instances of the packaged binary in parallel
+
+    The scenes in `scenes_file` are split in balanced parts, each one
+    rendered by an instance pinned to its own CPUs (see _SplitCpus), in
+    `output_dir`/parallel/<instance>_<attempt>. The log messages of the
+    instances are prefixed by 'job <instance>'.
+
+    When an instance crashes, it is restarted on its remaining scenes (at most
+    MAX_RESTARTS times). The scenes rendered by all the attempts are finally
+    merged into `output_dir`.
+
+    """
+    sys.path.insert(0, os.path.join(INTPHYS_ROOT, 'Tools'))
+    sys.path.insert(0, os.path.join(INTPHYS_ROOT, 'Tools', 'parallel'))
+    from merge_datasets import Dataset, merge
+    from split_json import split_dict, unroll_dict
+
+    if not os.path.isfile(scenes_file):
+        raise IOError('Json file not found: {}'.format(scenes_file))
+
+    command, cwd = _BinaryCommand(resolution, fixed_fps)
+    parts = split_dict(json.load(open(scenes_file, 'r')), njobs)
+    cpus = _SplitCpus(len(parts))
+    tmpdir = tempfile.mkdtemp()
+    failed = []
+
+    def RunInstance(index):
+        # instances are numbered from 1 in logs and files
+        name = 'job {}'.format(index + 1)
+        log = GetLogger(verbose=verbose, name=name)
+        metrics = RunMetrics(
+            metrics_file=_InstanceFile(metrics_file, index + 1), name=name)
+        # the supervision messages are printed since the logger would filter
+        # them out (as RunMetrics does)
+        print('{}: running on cpus {}'.format(
+            name, ','.join(str(c) for c in cpus[index])))
+
+        scenes = parts[index]
+        for attempt in range(MAX_RESTARTS + 1):
+            instance_json = os.path.join(
+                tmpdir, '{}_{}.json'.format(index + 1, attempt))
+            with open(instance_json, 'w') as fout:
+                fout.write(json.dumps(scenes, indent=4) + '\n')
+
+            instance_dir = None
+            if output_dir:
+                instance_dir = os.path.join(
+                    output_dir, 'parallel',
+                    '{}_{}'.format(index + 1, attempt))
+
+            metrics.completed = []
+            returncode = _Run(
+                command, log, instance_json, instance_dir, cwd=cwd,
+                seed=(None if seed is None
+                      else seed + index + attempt * len(parts)),
+                pause_duration=pause_duration, resolution=resolution,
+                headless=headless, debug=debug, extra_environ=extra_environ,
+                verbose=verbose, log_file=_InstanceFile(log_file, index + 1),
+                metrics=metrics, cpus=cpus[index], exit_on_error=False)
+            if not returncode:
+                return
+
+            if instance_dir and os.path.isdir(instance_dir):
+                _CleanCrashedDataset(instance_dir, metrics.completed)
+
+            scenes = _RemainingScenes(scenes, metrics.completed)
+            if not any(unroll_dict(scenes)[1]):
+                return
+            if attempt < MAX_RESTARTS:
+                print('{}: crashed, restarting on the remaining scenes'
+                      .format(name))
+
+        print('{}: crashed {} times, giving up'.format(
+            name, MAX_RESTARTS + 1))
+        failed.append(name)
+
+    def SuperviseInstance(index):
+        # an exception in a thread would be lost, report it as a failure
+        try:
+            RunInstance(index)
+        except Exception as err:
+            print('job {}: fatal error: {}'.format(index + 1, err))
+            failed.append('job {}'.format(index + 1))
+
+    try:
+        jobs = [threading.Thread(target=SuperviseInstance, args=[index])
+                for index in range(len(parts))]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+    finally:
+        shutil.rmtree(tmpdir)
+
+    # merge the datasets rendered by the instances
+    parallel_dir = os.path.join(output_dir or '', 'parallel')
+    if output_dir and os.path.isdir(parallel_dir):
+        # the scenes are numbered in the order of the instances and attempts
+        directories = [os.path.join(parallel_dir, d) for d in sorted(
+            os.listdir(parallel_dir),
+            key=lambda d: tuple(int(n) for n in d.split('_')))]
+        merge([Dataset(d) for d in directories], output_dir)
+
+        for directory in directories:
+            # keep the reports of the instance (see Tools/restart_causes.py)
+            # as <report>_<instance>_<attempt>
+            for report in ('restarts.json', 'spawn_stats.json',
+                           'profile.jsonl'):
+                src = os.path.join(directory, report)
+                if os.path.isfile(src):
+                    shutil.move(src, _InstanceFile(
+                        os.path.join(output_dir, report),
+                        os.path.basename(directory)))
+        shutil.rmtree(parallel_dir)
+
+    if failed:
+        raise IOError('failed to render all the scenes: {}'.format(
+            ', '.join(failed)))
 
 
 def FindDuplicates(directory):
@@ -406,23 +991,38 @@ def Main():
 
     # run the simulation either in the editor or as a standalone
     # program
+    extra_environ = CaptureEnvironment(args)
     if args.editor:
         RunEditor(
             output_dir, args.scenes_file,
             seed=args.seed, resolution=args.resolution,
-            pause_duration=args.pause_duration, verbose=args.verbose)
+            pause_duration=args.pause_duration, verbose=args.verbose,
+            extra_environ=extra_environ, metrics_file=args.metrics_file,
+            log_file=args.log_file)
     elif args.standalone_game:
         RunEditor(
             output_dir, args.scenes_file,
             seed=args.seed, resolution=args.resolution,
             pause_duration=args.pause_duration, verbose=args.verbose,
-            standalone_game=True)
+            standalone_game=True, extra_environ=extra_environ,
+            metrics_file=args.metrics_file,
+            log_file=args.log_file, fixed_fps=args.fixed_fps)
+    elif args.jobs > 1:
+        RunParallel(
+            output_dir, args.scenes_file, args.jobs, seed=args.seed,
+            resolution=args.resolution, headless=args.headless,
+            pause_duration=args.pause_duration, verbose=args.verbose,
+            debug=args.debug, extra_environ=extra_environ,
+            metrics_file=args.metrics_file,
+            log_file=args.log_file, fixed_fps=args.fixed_fps)
     else:
         RunBinary(
             output_dir, args.scenes_file, seed=args.seed,
             resolution=args.resolution, headless=args.headless,
             pause_duration=args.pause_duration, verbose=args.verbose,
-            debug=args.debug)
+            debug=args.debug, extra_environ=extra_environ,
+            metrics_file=args.metrics_file,
+            log_file=args.log_file, fixed_fps=args.fixed_fps)
 
     if output_dir:
         # check for duplicated scenes and warn if founded